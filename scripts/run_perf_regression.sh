@@ -0,0 +1,53 @@
+#!/bin/bash
+
+echo "========================================"
+echo " Running Performance Regression Suite"
+echo "========================================"
+
+# The baseline is measured on this machine from the base commit, right
+# before this commit, so runner-to-runner speed differences cancel out.
+#
+# Usage: bash scripts/run_perf_regression.sh [BASE_REF]
+#   BASE_REF       commit to compare against (default: $BASE_REF or HEAD~1)
+#   PERF_THRESHOLD allowed relative slowdown (default: 0.5)
+#   PERF_STAT      statistic compared (default: min, the least noisy on
+#                  shared runners)
+
+# Exit immediately if any command fails
+set -e
+
+# Activate virtual environment if exists
+if [ -d ".venv" ]; then
+    echo "Activating virtual environment"
+    source .venv/bin/activate
+fi
+
+BASE_REF="${1:-${BASE_REF:-HEAD~1}}"
+THRESHOLD="${PERF_THRESHOLD:-0.5}"
+STAT="${PERF_STAT:-min}"
+
+# New branches report an all-zero "before" commit
+if ! git rev-parse --quiet --verify "${BASE_REF}^{commit}" > /dev/null; then
+    echo "Base commit ${BASE_REF} not available, using HEAD~1"
+    BASE_REF="HEAD~1"
+fi
+
+BASE_DIR="$(mktemp -d)/perf-base"
+trap 'git worktree remove --force "$BASE_DIR" > /dev/null 2>&1 || true' EXIT
+
+if git worktree add --quiet --detach "$BASE_DIR" "$BASE_REF" 2> /dev/null \
+        && [ -d "$BASE_DIR/tests/perf" ]; then
+    echo "Measuring baseline at $(git rev-parse --short "$BASE_REF")"
+    (cd "$BASE_DIR" && pytest tests/perf --perf -q \
+        --perf-save "$OLDPWD/perf-base.json")
+
+    echo "Measuring $(git rev-parse --short HEAD)"
+    pytest tests/perf --perf -q --perf-save perf.json \
+        --perf-compare perf-base.json --perf-threshold "$THRESHOLD" \
+        --perf-stat "$STAT"
+else
+    echo "No perf suite at ${BASE_REF}, recording results without comparison"
+    pytest tests/perf --perf -q --perf-save perf.json
+fi
+
+echo "Performance regression suite completed successfully ✅"
@@ -5,12 +5,21 @@ Usage:
     python data/raw/download_data.py
 
 The file will be saved in data/raw/
+
+The additional UCI sites (Cleveland, Hungarian, Switzerland, VA) listed
+under ``data.raw.sources`` in config.json are fetched concurrently into
+``data.raw.sources_path``. Partial downloads are resumed with HTTP Range
+requests and every file is verified against its configured sha256.
 """
 
 import os
 import ssl
+import time
+import hashlib
+import urllib.error
 import urllib.request
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from src.utils.config_loader import load_config
 
 # =====================
@@ -25,6 +34,10 @@ RAW_FILE_PATH = Path(config["data"]["raw"]["file_path"])
 OUTPUT_FILENAME = config["data"]["raw"]["file_name"]
 COLUMNS = config["schema"]["columns"]
 
+SOURCES = config["data"]["raw"]["sources"]
+SOURCES_PATH = Path(config["data"]["raw"]["sources_path"] or RAW_BASE_PATH)
+DOWNLOAD_SETTINGS = config["data"]["raw"]["download"]
+
 OUTPUT_DIR = os.path.dirname(__file__)
 OUTPUT_PATH = os.path.join(OUTPUT_DIR, OUTPUT_FILENAME)
 
@@ -48,16 +61,168 @@ def download_data():
 
     print("\n[INFO] Downloading dataset...")
 
-    # Handle SSL certificate issues (common in some environments)
-    ssl._create_default_https_context = ssl._create_unverified_context
-
+    # Certificate checks follow data.raw.download.verify_ssl
     try:
-        urllib.request.urlretrieve(DATA_URL, OUTPUT_PATH)
+        download_file(DATA_URL, OUTPUT_PATH, **_download_settings())
         print(f"\n[SUCCESS] Dataset downloaded to {OUTPUT_PATH}")
     except Exception as e:
         print(f"\n[ERROR] Failed to download dataset: {e}")
         raise
 
 
+# =====================
+# Multi-source download
+# =====================
+
+
+def sha256_file(path, chunk_size: int = 65536) -> str:
+    """
+    Return the hex sha256 digest of a file.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _download_settings() -> dict:
+    return {
+        key: DOWNLOAD_SETTINGS[key]
+        for key in ("retries", "timeout", "chunk_size", "verify_ssl")
+        if key in DOWNLOAD_SETTINGS
+    }
+
+
+def _ssl_context(verify_ssl: bool):
+    if verify_ssl:
+        return ssl.create_default_context()
+    return ssl._create_unverified_context()
+
+
+def _fetch_to_part(url, part_path, timeout, chunk_size, context):
+    """
+    Stream ``url`` into ``part_path``, resuming from the bytes already
+    present with an HTTP Range request.
+    """
+    offset = part_path.stat().st_size if part_path.exists() else 0
+
+    request = urllib.request.Request(url)
+    if offset:
+        request.add_header("Range", f"bytes={offset}-")
+
+    try:
+        response = urllib.request.urlopen(
+            request, timeout=timeout, context=context
+        )
+    except urllib.error.HTTPError as e:
+        # Range starts at/after EOF: the partial file is already complete
+        if e.code == 416 and offset:
+            return
+        raise
+
+    with response:
+        # Server ignored the Range header: restart from scratch
+        mode = "ab" if offset and response.status == 206 else "wb"
+        with open(part_path, mode) as f:
+            for chunk in iter(lambda: response.read(chunk_size), b""):
+                f.write(chunk)
+
+
+def download_file(
+    url: str,
+    dest_path,
+    sha256: str = None,
+    retries: int = 3,
+    timeout: float = 30,
+    chunk_size: int = 65536,
+    verify_ssl: bool = True,
+    backoff: float = 1.0,
+) -> str:
+    """
+    Download ``url`` to ``dest_path`` with retry, resume and checksum.
+
+    Returns "cached" when ``dest_path`` already matches ``sha256`` (or
+    exists and no checksum is configured), otherwise "downloaded".
+    """
+    dest_path = Path(dest_path)
+    dest_path.parent.mkdir(parents=True, exist_ok=True)
+
+    if dest_path.exists():
+        if sha256 is None or sha256_file(dest_path) == sha256:
+            return "cached"
+        dest_path.unlink()
+
+    part_path = dest_path.with_name(dest_path.name + ".part")
+    context = _ssl_context(verify_ssl)
+
+    for attempt in range(1, retries + 1):
+        try:
+            _fetch_to_part(url, part_path, timeout, chunk_size, context)
+
+            if sha256 is not None:
+                actual = sha256_file(part_path)
+                if actual != sha256:
+                    part_path.unlink()
+                    raise ValueError(
+                        f"Checksum mismatch for {url}: "
+                        f"expected {sha256}, got {actual}"
+                    )
+
+            os.replace(part_path, dest_path)
+            return "downloaded"
+        except (OSError, ValueError) as e:
+            print(f"[WARN] Attempt {attempt}/{retries} failed for {url}: {e}")
+            if attempt == retries:
+                raise
+            time.sleep(backoff * 2 ** (attempt - 1))
+
+
+def download_sources(
+    sources: list = None,
+    dest_dir=None,
+    max_workers: int = None,
+    **download_kwargs,
+) -> dict:
+    """
+    Download every configured source concurrently.
+
+    Returns a mapping of source name to "cached" or "downloaded". All
+    sources are attempted; failures are raised together at the end.
+    """
+    sources = SOURCES if sources is None else sources
+    dest_dir = Path(dest_dir or SOURCES_PATH)
+
+    settings = _download_settings()
+    settings.update(download_kwargs)
+    max_workers = max_workers or DOWNLOAD_SETTINGS.get("max_workers", 4)
+
+    def fetch(source):
+        if source.get("sha256") is None:
+            print(f"[WARN] No sha256 configured for {source['name']}")
+        return download_file(
+            source["url"],
+            dest_dir / source["file_name"],
+            sha256=source.get("sha256"),
+            **settings,
+        )
+
+    results, errors = {}, {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {s["name"]: pool.submit(fetch, s) for s in sources}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+                print(f"[INFO] {name}: {results[name]}")
+            except Exception as e:
+                errors[name] = e
+
+    if errors:
+        raise RuntimeError(f"Failed to download sources: {errors}")
+
+    return results
+
+
 if __name__ == "__main__":
     download_data()
+    download_sources()
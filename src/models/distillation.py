@@ -0,0 +1,285 @@
+"""
+Random forest distillation stage.
+
+The 200-tree random forest (teacher) is distilled into a much smaller
+regression forest or a single shallow regression tree (student) fitted on
+the teacher's positive-class probabilities (soft labels). Both models are
+scored out of fold with the same cross-validation split. Serving decides
+on calibrated probabilities, so each model's out-of-fold scores are
+calibrated on held-out folds (as in the calibration stage) and the
+accuracy / ROC AUC difference is measured on those calibrated
+probabilities, with decisions at the serving threshold. The serving cost
+of both is measured on the NumPy forest engine.
+
+The student is exported as ``models/distilled_forest.npz`` (same node
+array layout as the random forest in ``engine_params.npz``), together
+with its own calibration table in ``models/distilled_calibration.json``,
+only when its metric loss stays within the configured tolerance;
+otherwise any previous artifacts are removed so serving cannot pick up
+a stale model. An accepted student is also quantized for
+``SERVING_ENGINE=quantized`` (``models/distilled_forest_quantized.npz``,
+validated like the quantized engines). Serving switches to it with
+``RANDOM_FOREST_VARIANT=distilled``.
+
+Usage:
+    python -m src.models.distillation
+"""
+
+import json
+import pickle
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import accuracy_score, brier_score_loss, roc_auc_score
+from sklearn.model_selection import StratifiedKFold
+from sklearn.tree import DecisionTreeRegressor
+
+from src.models.calibration import (
+    calibrate_scores,
+    held_out_calibrated,
+    save_calibration,
+)
+from src.models.quantization import quantize_student
+from src.serving.calibration import artifact_version
+from src.serving.engines import (
+    engine_nbytes,
+    export_forest_params,
+    forest_arrays,
+    forest_engine,
+)
+from src.utils.config_loader import get_settings
+
+
+def make_student(kind: str = "forest", n_estimators: int = 10,
+                 max_depth: int = 5, random_state: int = 42):
+    if kind == "tree":
+        return DecisionTreeRegressor(max_depth=max_depth,
+                                     random_state=random_state)
+    if kind == "forest":
+        return RandomForestRegressor(n_estimators=n_estimators,
+                                     max_depth=max_depth,
+                                     random_state=random_state)
+    raise ValueError(
+        f"Unknown student {kind!r}; expected 'tree' or 'forest'"
+    )
+
+
+def soft_labels(teacher, X):
+    return teacher.predict_proba(X)[:, 1]
+
+
+def fit_student(teacher, X, **student_params):
+    """
+    Fit a student on the soft labels of an already fitted teacher.
+    """
+    return make_student(**student_params).fit(X, soft_labels(teacher, X))
+
+
+def out_of_fold_probabilities(teacher, X, y, cv: int = 5,
+                              **student_params) -> dict:
+    """
+    Out-of-fold positive-class probabilities of the teacher and of a
+    student distilled from the teacher fitted on the same training folds.
+    """
+    X, y = np.asarray(X), np.asarray(y)
+    folds = StratifiedKFold(n_splits=cv, shuffle=True, random_state=42)
+    p_teacher = np.empty(len(y))
+    p_student = np.empty(len(y))
+
+    for train, test in folds.split(X, y):
+        fold_teacher = clone(teacher).fit(X[train], y[train])
+        student = fit_student(fold_teacher, X[train], **student_params)
+        p_teacher[test] = soft_labels(fold_teacher, X[test])
+        p_student[test] = np.clip(student.predict(X[test]), 0.0, 1.0)
+
+    return {"teacher": p_teacher, "student": p_student}
+
+
+def decision_metrics(p, y, threshold: float = 0.5) -> dict:
+    return {
+        "accuracy": float(accuracy_score(y, p >= threshold)),
+        "roc_auc": float(roc_auc_score(y, p)),
+        "brier": float(brier_score_loss(y, p)),
+    }
+
+
+def _latency_us(engine, X, repeats: int) -> float:
+    engine.predict_proba(X)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        engine.predict_proba(X)
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def serving_cost(model, X, classes=None, batch_size: int = 256,
+                 repeats: int = 200) -> dict:
+    """
+    NumPy engine latency (single row and batch) and memory for a model.
+    """
+    engine = forest_engine(forest_arrays(model, classes=classes))
+    batch = np.resize(np.asarray(X), (batch_size, np.asarray(X).shape[1]))
+    return {
+        "nodes": int(engine.left.size),
+        "engine_bytes": engine_nbytes(engine),
+        "pickle_bytes": len(pickle.dumps(model)),
+        "single_row_us": round(_latency_us(engine, batch[:1], repeats), 2),
+        f"batch_{batch_size}_us": round(
+            _latency_us(engine, batch, repeats), 2
+        ),
+    }
+
+
+def distill(teacher, X, y, student: str = "forest", n_estimators: int = 10,
+            max_depth: int = 5, cv: int = 5, max_accuracy_drop: float = 0.02,
+            max_auc_drop: float = 0.02, calibration_method: str = "isotonic",
+            calibration_cv: int = 5, threshold: float = 0.5):
+    """
+    Return (student fitted on all rows, report). ``teacher`` must be
+    fitted; it is cloned and refitted per fold for the metric comparison.
+    ``report["calibration"]`` is the student's calibration table.
+    """
+    y = np.asarray(y)
+    student_params = {"kind": student, "n_estimators": n_estimators,
+                      "max_depth": max_depth}
+    scores = out_of_fold_probabilities(teacher, X, y, cv=cv,
+                                       **student_params)
+    metrics = {
+        name: decision_metrics(
+            held_out_calibrated(p, y, calibration_method, calibration_cv),
+            y, threshold,
+        )
+        for name, p in scores.items()
+    }
+    drop = {
+        key: metrics["teacher"][key] - metrics["student"][key]
+        for key in ("accuracy", "roc_auc")
+    }
+
+    model = fit_student(teacher, X, **student_params)
+    cost = {
+        "teacher": serving_cost(teacher, X),
+        "student": serving_cost(model, X, classes=teacher.classes_),
+    }
+
+    return model, {
+        "student": student_params,
+        "threshold": threshold,
+        "metrics": metrics,
+        "drop": drop,
+        "tolerance": {"accuracy": max_accuracy_drop,
+                      "roc_auc": max_auc_drop},
+        "accepted": drop["accuracy"] <= max_accuracy_drop
+        and drop["roc_auc"] <= max_auc_drop,
+        "serving_cost": cost,
+        "calibration": calibrate_scores(scores["student"], y,
+                                        method=calibration_method,
+                                        cv=calibration_cv),
+    }
+
+
+def run_distillation(teacher, scaler, df: pd.DataFrame,
+                     artifact_path=None, calibration_path=None,
+                     quantized_path=None, report_path=None) -> dict:
+    """
+    Distill ``teacher`` with the configured student and tolerance, write
+    the report and (if accepted) the student's engine arrays, calibration
+    table and validated quantized copy.
+    """
+    settings = get_settings()
+    config = settings.distillation
+    artifact_path = Path(
+        artifact_path or settings.serving.distilled_params_path
+    )
+    calibration_path = Path(
+        calibration_path or settings.serving.distilled_calibration_path
+    )
+    quantized_path = Path(
+        quantized_path or settings.serving.distilled_quantized_params_path
+    )
+    report_path = Path(report_path or config.report_path)
+
+    X = scaler.transform(df.drop("target", axis=1))
+    model, report = distill(
+        teacher, X, df["target"],
+        student=config.student,
+        n_estimators=config.n_estimators,
+        max_depth=config.max_depth,
+        cv=config.cv,
+        max_accuracy_drop=config.max_accuracy_drop,
+        max_auc_drop=config.max_auc_drop,
+        calibration_method=settings.calibration.method,
+        calibration_cv=settings.calibration.cv,
+        threshold=settings.serving.decision_threshold,
+    )
+
+    artifact_path.parent.mkdir(parents=True, exist_ok=True)
+    if report["accepted"]:
+        export_forest_params(artifact_path, model, classes=teacher.classes_)
+        # Served under the random forest key, tied to the student's hash
+        report["calibration"]["model_version"] = artifact_version(
+            artifact_path
+        )
+        save_calibration({"random-forest": report["calibration"]},
+                         calibration_path)
+        report["quantized"] = quantize_student(
+            df.drop("target", axis=1).to_numpy(), scaler,
+            forest_path=artifact_path, calibration_path=calibration_path,
+            quantized_path=quantized_path,
+        )
+    else:
+        for path in (artifact_path, calibration_path, quantized_path):
+            path.unlink(missing_ok=True)
+
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print_report(report, artifact_path)
+    return report
+
+
+def print_report(report: dict, artifact_path) -> None:
+    metrics, cost = report["metrics"], report["serving_cost"]
+    print("\n-------------------------------------------------")
+    print(f"Distillation: {report['student']}")
+    print("-------------------------------------------------")
+    print(f"* calibrated ({report['calibration']['method']}), decision "
+          f"threshold {report['threshold']}")
+    for key in ("accuracy", "roc_auc"):
+        print(
+            f"* {key}: teacher {metrics['teacher'][key]:.3f} | "
+            f"student {metrics['student'][key]:.3f} | "
+            f"drop {report['drop'][key]:+.3f} "
+            f"(tolerance {report['tolerance'][key]:.3f})"
+        )
+    print(f"* brier: teacher {metrics['teacher']['brier']:.4f} | "
+          f"student {metrics['student']['brier']:.4f}")
+    for key in cost["teacher"]:
+        print(f"* {key}: teacher {cost['teacher'][key]} | "
+              f"student {cost['student'][key]}")
+    if report["accepted"]:
+        print(f"* accepted -> {artifact_path}")
+        quantized = report["quantized"]
+        mismatches = quantized["validation"]["random-forest"]
+        print(f"* quantized copy: "
+              f"{'written' if quantized['identical'] else 'not written'} "
+              f"({mismatches['class_mismatches']} class / "
+              f"{mismatches['decision_mismatches']} decision mismatches)")
+    else:
+        print("* rejected: metric loss above tolerance, no artifact")
+    print("-------------------------------------------------\n")
+
+
+if __name__ == "__main__":
+    from src.models.train_evaluate_random_forest import (
+        train_random_forest_pipeline
+    )
+
+    rf_model, _, scaler = train_random_forest_pipeline(save_scaler_path=None)
+    run_distillation(
+        rf_model, scaler,
+        pd.read_csv(get_settings().data.processed.file_path),
+    )
@@ -1,7 +1,7 @@
 import mlflow
 import pandas as pd
-import mlflow.sklearn
 from pathlib import Path
+from src.models.tracking import TrackedRun
 from src.utils.config_loader import load_config
 from sklearn.model_selection import cross_validate
 from sklearn.linear_model import LogisticRegression
@@ -20,14 +20,6 @@ PROCESSED_FILE_PATH = Path(config["data"]["processed"]["file_path"])
 OUTPUT_FILENAME = config["data"]["raw"]["file_name"]
 COLUMNS = config["schema"]["columns"]
 
-############################################################
-# Load processed data
-############################################################
-df = pd.read_csv(PROCESSED_FILE_PATH)
-
-X = df.drop("target", axis=1)
-y = df["target"]
-
 ############################################################
 # Feature groups
 ############################################################
@@ -48,67 +40,84 @@ numerical_features = ["age", "trestbps", "chol", "thalach", "oldpeak"]
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 MLFLOW_TRACKING_DIR = PROJECT_ROOT / "mlruns"
 
-mlflow.set_tracking_uri(str(MLFLOW_TRACKING_DIR))
-mlflow.set_experiment("Heart_Disease_Classification")
-
-############################################################
-# Logistic Regression (with pipeline)
-############################################################
-with mlflow.start_run(run_name="Logistic_Regression"):
-    preprocessor = ColumnTransformer(
-        transformers=[
-            ("num", StandardScaler(), numerical_features),
-            ("cat", "passthrough", categorical_features),
-        ]
-    )
-
-    lr_pipeline = Pipeline(
-        steps=[
-            ("preprocessing", preprocessor),
-            ("model", LogisticRegression(C=1.0, penalty="l2", max_iter=1000)),
-        ]
-    )
-
-    scores = cross_validate(
-        lr_pipeline, X, y, cv=5, scoring=["accuracy",
-                                          "precision",
-                                          "recall",
-                                          "roc_auc"]
-    )
-
-    mlflow.log_param("model", "LogisticRegression")
-    mlflow.log_param("C", 1.0)
-    mlflow.log_param("penalty", "l2")
-    mlflow.log_param("cv_folds", 5)
-
-    mlflow.log_metric("accuracy", scores["test_accuracy"].mean())
-    mlflow.log_metric("precision", scores["test_precision"].mean())
-    mlflow.log_metric("recall", scores["test_recall"].mean())
-    mlflow.log_metric("roc_auc", scores["test_roc_auc"].mean())
-
-    # Fit pipeline on full data and log SAME object
-    lr_pipeline.fit(X, y)
-    mlflow.sklearn.log_model(lr_pipeline, name="logistic_regression_pipeline")
-
-############################################################
-# Random Forest
-############################################################
-with mlflow.start_run(run_name="Random_Forest"):
-    rf = RandomForestClassifier(n_estimators=200, max_depth=5, random_state=42)
-
-    scores = cross_validate(
-        rf, X, y, cv=5, scoring=["accuracy", "precision", "recall", "roc_auc"]
-    )
-
-    mlflow.log_param("model", "RandomForest")
-    mlflow.log_param("n_estimators", 200)
-    mlflow.log_param("max_depth", 5)
-    mlflow.log_param("cv_folds", 5)
-
-    mlflow.log_metric("accuracy", scores["test_accuracy"].mean())
-    mlflow.log_metric("precision", scores["test_precision"].mean())
-    mlflow.log_metric("recall", scores["test_recall"].mean())
-    mlflow.log_metric("roc_auc", scores["test_roc_auc"].mean())
 
-    rf.fit(X, y)
-    mlflow.sklearn.log_model(rf, name="random_forest_model")
+def run_experiments(df: pd.DataFrame = None) -> None:
+    """
+    Cross-validate both models and log them as MLflow runs.
+    """
+    ############################################################
+    # Load processed data
+    ############################################################
+    if df is None:
+        df = pd.read_csv(PROCESSED_FILE_PATH)
+
+    X = df.drop("target", axis=1)
+    y = df["target"]
+
+    mlflow.set_tracking_uri(str(MLFLOW_TRACKING_DIR))
+    mlflow.set_experiment("Heart_Disease_Classification")
+
+    ############################################################
+    # Logistic Regression (with pipeline)
+    ############################################################
+    with TrackedRun("Logistic_Regression") as run:
+        run.log_params({
+            "model": "LogisticRegression",
+            "C": 1.0,
+            "penalty": "l2",
+            "cv_folds": 5,
+        })
+
+        preprocessor = ColumnTransformer(
+            transformers=[
+                ("num", StandardScaler(), numerical_features),
+                ("cat", "passthrough", categorical_features),
+            ]
+        )
+
+        lr_pipeline = Pipeline(
+            steps=[
+                ("preprocessing", preprocessor),
+                ("model", LogisticRegression(C=1.0, penalty="l2", max_iter=1000)),
+            ]
+        )
+
+        scores = cross_validate(
+            lr_pipeline, X, y, cv=5, scoring=["accuracy",
+                                              "precision",
+                                              "recall",
+                                              "roc_auc"]
+        )
+
+        # Mean per metric plus every fold as <metric>_fold
+        run.log_cv_scores(scores)
+
+        # Fit pipeline on full data and log SAME object
+        lr_pipeline.fit(X, y)
+        run.log_model(lr_pipeline, "logistic_regression_pipeline")
+
+    ############################################################
+    # Random Forest
+    ############################################################
+    with TrackedRun("Random_Forest") as run:
+        run.log_params({
+            "model": "RandomForest",
+            "n_estimators": 200,
+            "max_depth": 5,
+            "cv_folds": 5,
+        })
+
+        rf = RandomForestClassifier(n_estimators=200, max_depth=5, random_state=42)
+
+        scores = cross_validate(
+            rf, X, y, cv=5, scoring=["accuracy", "precision", "recall", "roc_auc"]
+        )
+
+        run.log_cv_scores(scores)
+
+        rf.fit(X, y)
+        run.log_model(rf, "random_forest_model")
+
+
+if __name__ == "__main__":
+    run_experiments()
@@ -0,0 +1,283 @@
+"""
+Quantized export of the serving engines.
+
+Builds ``models/engine_params_quantized.npz`` from the float64 engine
+arrays in ``models/engine_params.npz``:
+
+- scaler mean / scale and logistic regression coefficients in float32;
+- the random forest as complete trees (``QuantizedForestEngine``) with
+  uint8 features, float32 thresholds snapped to the midpoints of the
+  training data's split grid, and float32 node values.
+
+Before anything is written the quantized engines are validated against
+the float64 engines on the training data: every class and every served
+decision (the calibrated probability at the serving threshold, as
+``classify`` decides) must be identical, otherwise no export is written
+and serving stays on the float64 engines. The memory and latency of both
+variants are written to ``models/quantization.json``. Serving loads the
+compact arrays with ``SERVING_ENGINE=quantized``.
+
+The distilled student is quantized the same way by the distillation stage
+(``quantize_student``, validated through the student's calibration
+table) into ``models/distilled_forest_quantized.npz``; serving never
+quantizes at startup. Each quantized file records the version of the
+float64 export it was validated against.
+
+Usage:
+    python -m src.models.quantization
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.serving.calibration import (
+    artifact_version,
+    decide,
+    load_calibrators,
+)
+from src.serving.engines import (
+    ScalerEngine,
+    engine_nbytes,
+    export_quantized_forest,
+    export_quantized_params,
+    load_engines,
+    load_forest,
+    load_quantized_engines,
+    load_quantized_forest,
+    quantize_forest,
+    split_grid,
+)
+from src.utils.config_loader import get_settings
+
+MODEL_KEYS = ("logistic-regression", "random-forest")
+
+
+def compare_predictions(reference, quantized, X_raw, calibrators,
+                        threshold: float = 0.5) -> dict:
+    """
+    Per model: mismatched classes and served decisions (calibrated
+    probability >= ``threshold``) and the largest raw / calibrated
+    positive-class probability difference. Engines are
+    (scaler, {model key: model}) pairs; ``calibrators`` holds the
+    calibrator serving applies to each model key.
+    """
+    ref_scaler, ref_models = reference
+    q_scaler, q_models = quantized
+    X_ref, X_q = ref_scaler.transform(X_raw), q_scaler.transform(X_raw)
+
+    result = {}
+    for key, ref_model in ref_models.items():
+        q_model = q_models[key]
+        probs_ref = ref_model.predict_proba(X_ref)
+        probs_q = q_model.predict_proba(X_q)
+        decisions_ref, p_ref = decide(calibrators[key], probs_ref, threshold)
+        decisions_q, p_q = decide(calibrators[key], probs_q, threshold)
+        result[key] = {
+            "rows": int(len(X_raw)),
+            "class_mismatches": int(
+                (ref_model.predict(X_ref) != q_model.predict(X_q)).sum()
+            ),
+            "decision_mismatches": int((decisions_ref != decisions_q).sum()),
+            "max_probability_diff": float(
+                np.abs(probs_ref[:, 1] - probs_q[:, 1]).max()
+            ),
+            "max_calibrated_diff": float(np.abs(p_ref - p_q).max()),
+        }
+    return result
+
+
+def identical(validation: dict) -> bool:
+    return all(
+        v["class_mismatches"] == 0 and v["decision_mismatches"] == 0
+        for v in validation.values()
+    )
+
+
+def _by_key(engines):
+    scaler, *models = engines
+    return scaler, dict(zip(MODEL_KEYS, models))
+
+
+def serving_calibrators(path, versions: dict) -> dict:
+    """
+    The calibrators serving loads for ``versions`` (model key -> model
+    version) from ``path``; identity when calibration is disabled.
+    """
+    enabled = get_settings().serving.calibration_enabled
+    return load_calibrators(Path(path) if enabled else None, versions)
+
+
+def _latency_us(fn, X, repeats: int) -> float:
+    fn(X)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn(X)
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def serving_cost(engines, X_raw, batch_size: int = 256,
+                 repeats: int = 200) -> dict:
+    """
+    Engine memory and scale + predict_proba latency per model, for a
+    (scaler, {model key: model}) pair.
+    """
+    scaler, models = engines
+    batch = np.resize(np.asarray(X_raw, dtype=np.float64),
+                      (batch_size, np.asarray(X_raw).shape[1]))
+
+    cost = {}
+    for key, model in models.items():
+        def score(X, model=model):
+            return model.predict_proba(scaler.transform(X))
+
+        cost[key] = {
+            "engine_bytes": engine_nbytes(scaler) + engine_nbytes(model),
+            "single_row_us": round(_latency_us(score, batch[:1], repeats),
+                                   2),
+            f"batch_{batch_size}_us": round(
+                _latency_us(score, batch, repeats), 2
+            ),
+        }
+    return cost
+
+
+def quantize_artifacts(X_raw, engine_params_path=None, quantized_path=None,
+                       report_path=None, calibrators=None) -> dict:
+    """
+    Quantize, validate on ``X_raw`` and export. The export is optional:
+    if any class or served decision changes it is not written (and any
+    previous one is removed) and the report has ``identical: False``.
+    ``calibrators`` defaults to the tables serving loads for the model
+    pickles.
+    """
+    settings = get_settings()
+    serving = settings.serving
+    report_path = Path(report_path or settings.quantization.report_path)
+    engine_params_path = Path(
+        engine_params_path or serving.engine_params_path
+    )
+    quantized_path = Path(quantized_path or serving.quantized_params_path)
+    X_raw = np.asarray(X_raw, dtype=np.float64)
+    if calibrators is None:
+        calibrators = serving_calibrators(serving.calibration_path, {
+            "logistic-regression": artifact_version(serving.lr_model_path),
+            "random-forest": artifact_version(serving.rf_model_path),
+        })
+
+    reference = load_engines(engine_params_path)
+    scaler, lr, rf = reference
+
+    # Round trip through the file so the validated arrays are the served ones
+    tmp_path = quantized_path.with_name(f".{quantized_path.name}")
+    grid = split_grid(scaler.transform(X_raw))
+    export_quantized_params(tmp_path, scaler, lr, quantize_forest(rf, grid),
+                            source_version=artifact_version(
+                                engine_params_path
+                            ))
+    quantized = load_quantized_engines(tmp_path)
+
+    reference, quantized = _by_key(reference), _by_key(quantized)
+    validation = compare_predictions(reference, quantized, X_raw,
+                                     calibrators, serving.decision_threshold)
+    report = {
+        "validation": validation,
+        "identical": identical(validation),
+        "file_bytes": {
+            "engine_params": engine_params_path.stat().st_size,
+            "quantized": tmp_path.stat().st_size,
+        },
+        "serving_cost": {
+            "float64": serving_cost(reference, X_raw),
+            "quantized": serving_cost(quantized, X_raw),
+        },
+    }
+
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2)
+    print_report(report)
+
+    if report["identical"]:
+        os.replace(tmp_path, quantized_path)
+    else:
+        tmp_path.unlink()
+        # Never leave an older export behind for serving to pick up
+        quantized_path.unlink(missing_ok=True)
+    return report
+
+
+def quantize_student(X_raw, scaler, forest_path=None, calibration_path=None,
+                     quantized_path=None) -> dict:
+    """
+    Quantized copy of the distilled student, validated on ``X_raw`` against
+    the float64 student with the student's calibration table. ``scaler``
+    is the fitted StandardScaler; the quantized side scales in float32 as
+    the quantized engines do. Written only if every class and served
+    decision is identical, otherwise any previous copy is removed.
+    """
+    serving = get_settings().serving
+    forest_path = Path(forest_path or serving.distilled_params_path)
+    calibration_path = Path(
+        calibration_path or serving.distilled_calibration_path
+    )
+    quantized_path = Path(
+        quantized_path or serving.distilled_quantized_params_path
+    )
+    X_raw = np.asarray(X_raw, dtype=np.float64)
+    version = artifact_version(forest_path)
+    calibrators = serving_calibrators(calibration_path,
+                                      {"random-forest": version})
+
+    scaler64 = ScalerEngine(scaler.mean_, scaler.scale_)
+    scaler32 = ScalerEngine(np.float32(scaler.mean_),
+                            np.float32(scaler.scale_), dtype=np.float32)
+    student = load_forest(forest_path)
+
+    tmp_path = quantized_path.with_name(f".{quantized_path.name}")
+    grid = split_grid(scaler64.transform(X_raw))
+    export_quantized_forest(tmp_path, quantize_forest(student, grid),
+                            source_version=version)
+
+    validation = compare_predictions(
+        (scaler64, {"random-forest": student}),
+        (scaler32, {"random-forest": load_quantized_forest(tmp_path)}),
+        X_raw, calibrators, serving.decision_threshold,
+    )
+    if identical(validation):
+        os.replace(tmp_path, quantized_path)
+    else:
+        tmp_path.unlink()
+        quantized_path.unlink(missing_ok=True)
+    return {"validation": validation, "identical": identical(validation)}
+
+
+def print_report(report: dict) -> None:
+    cost = report["serving_cost"]
+    print("\n-------------------------------------------------")
+    print("Quantized engines:")
+    print("-------------------------------------------------")
+    for key, v in report["validation"].items():
+        print(f"* {key}: {v['class_mismatches']} class / "
+              f"{v['decision_mismatches']} decision mismatches on "
+              f"{v['rows']} rows | max |dp| {v['max_probability_diff']:.2e}"
+              f" | calibrated {v['max_calibrated_diff']:.2e}")
+    for key in MODEL_KEYS:
+        for metric in cost["float64"][key]:
+            print(f"* {key} {metric}: float64 {cost['float64'][key][metric]}"
+                  f" | quantized {cost['quantized'][key][metric]}")
+    files = report["file_bytes"]
+    print(f"* file bytes: float64 {files['engine_params']} | "
+          f"quantized {files['quantized']}")
+    if not report["identical"]:
+        print("* predictions differ from float64: quantized export not "
+              "written, SERVING_ENGINE=quantized falls back to numpy")
+    print("-------------------------------------------------\n")
+
+
+if __name__ == "__main__":
+    df = pd.read_csv(get_settings().data.processed.file_path)
+    quantize_artifacts(df.drop("target", axis=1).to_numpy())
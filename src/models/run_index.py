@@ -0,0 +1,321 @@
+"""
+Incremental SQLite index over the local MLflow ``mlruns`` file store.
+
+Querying runs through the file store means opening every ``meta.yaml``,
+param, tag and metric file of every run. This indexer copies run
+metadata, params, tags and the latest value of each metric into an
+embedded SQLite database. On each refresh a run is re-read only if its
+signature (file count and newest mtime under ``meta.yaml``, ``params/``,
+``metrics/`` and ``tags/``) changed, which needs ``stat`` calls but no
+file reads. Runs deleted from the tree are dropped from the index.
+
+Usage:
+    python -m src.models.run_index index
+    python -m src.models.run_index best --metric roc_auc --model RandomForest
+    python -m src.models.run_index best --metric log_loss --minimize --top 5
+"""
+
+import os
+import json
+import time
+import sqlite3
+import argparse
+from pathlib import Path
+
+import yaml
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+MLRUNS_DIR = PROJECT_ROOT / "mlruns"
+INDEX_PATH = PROJECT_ROOT / "mlruns_index.db"
+
+# mlflow.entities.RunStatus values as stored in the file store
+RUN_STATUS = {1: "RUNNING", 2: "SCHEDULED", 3: "FINISHED", 4: "FAILED",
+              5: "KILLED"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS experiments (
+    experiment_id TEXT PRIMARY KEY,
+    name TEXT
+);
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    experiment_id TEXT,
+    run_name TEXT,
+    status TEXT,
+    lifecycle_stage TEXT,
+    start_time INTEGER,
+    end_time INTEGER,
+    signature TEXT
+);
+CREATE TABLE IF NOT EXISTS params (
+    run_id TEXT, key TEXT, value TEXT, PRIMARY KEY (run_id, key)
+);
+CREATE TABLE IF NOT EXISTS tags (
+    run_id TEXT, key TEXT, value TEXT, PRIMARY KEY (run_id, key)
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id TEXT, key TEXT, value REAL, step INTEGER, timestamp INTEGER,
+    PRIMARY KEY (run_id, key)
+);
+CREATE INDEX IF NOT EXISTS metrics_key_value ON metrics (key, value);
+CREATE INDEX IF NOT EXISTS params_key_value ON params (key, value);
+"""
+
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+# -----------------------------
+# File Store Reading
+# -----------------------------
+def _read_yaml(path: Path) -> dict:
+    with open(path) as f:
+        return yaml.load(f, Loader=_Loader) or {}
+
+
+def _walk_files(directory: Path, prefix: str = ""):
+    """
+    Yield (key, DirEntry) for files below ``directory``; nested keys
+    such as ``val/roc_auc`` are stored as sub-directories.
+    """
+    try:
+        entries = list(os.scandir(directory))
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        if entry.is_dir():
+            yield from _walk_files(Path(entry.path),
+                                   f"{prefix}{entry.name}/")
+        else:
+            yield f"{prefix}{entry.name}", entry
+
+
+def run_signature(run_dir: Path) -> str:
+    count, newest = 0, 0
+    meta = run_dir / "meta.yaml"
+    entries = [("meta.yaml", meta)]
+    for sub in ("params", "metrics", "tags"):
+        entries.extend(_walk_files(run_dir / sub))
+
+    for _, entry in entries:
+        try:
+            mtime = entry.stat().st_mtime_ns
+        except FileNotFoundError:
+            continue
+        count += 1
+        newest = max(newest, mtime)
+    return f"{count}:{newest}"
+
+
+def _read_values(directory: Path) -> dict:
+    values = {}
+    for key, entry in _walk_files(directory):
+        with open(entry.path) as f:
+            values[key] = f.read()
+    return values
+
+
+def latest_metric(text: str):
+    """
+    (value, step, timestamp) of the latest point, by step then
+    timestamp, from a file-store metric history.
+    """
+    latest = None
+    for line in text.splitlines():
+        parts = line.split()
+        if len(parts) < 2:
+            continue
+        timestamp, value = int(parts[0]), float(parts[1])
+        step = int(parts[2]) if len(parts) > 2 else 0
+        if latest is None or (step, timestamp) >= (latest[1], latest[2]):
+            latest = (value, step, timestamp)
+    return latest
+
+
+def iter_run_dirs(mlruns: Path):
+    """
+    Yield (experiment_id, experiment_dir, run_dir) for every run.
+    """
+    for experiment in os.scandir(mlruns):
+        if not experiment.is_dir() or experiment.name.startswith("."):
+            continue
+        experiment_dir = Path(experiment.path)
+        if not (experiment_dir / "meta.yaml").exists():
+            continue
+        for run in os.scandir(experiment_dir):
+            run_dir = Path(run.path)
+            # Skips logged-model and trace directories (no run meta.yaml)
+            if run.is_dir() and (run_dir / "meta.yaml").exists() \
+                    and (run_dir / "params").is_dir():
+                yield experiment.name, experiment_dir, run_dir
+
+
+# -----------------------------
+# Index
+# -----------------------------
+def connect(db_path=INDEX_PATH) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(db_path))
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _index_run(conn, experiment_id, run_dir: Path, signature: str):
+    run_id = run_dir.name
+    meta = _read_yaml(run_dir / "meta.yaml")
+
+    conn.execute(
+        "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            run_id,
+            experiment_id,
+            meta.get("run_name"),
+            RUN_STATUS.get(meta.get("status"), str(meta.get("status"))),
+            meta.get("lifecycle_stage"),
+            meta.get("start_time"),
+            meta.get("end_time"),
+            signature,
+        ),
+    )
+    for table in ("params", "tags", "metrics"):
+        conn.execute(f"DELETE FROM {table} WHERE run_id = ?", (run_id,))
+
+    conn.executemany(
+        "INSERT INTO params VALUES (?, ?, ?)",
+        [(run_id, k, v) for k, v in
+         _read_values(run_dir / "params").items()],
+    )
+    conn.executemany(
+        "INSERT INTO tags VALUES (?, ?, ?)",
+        [(run_id, k, v) for k, v in _read_values(run_dir / "tags").items()],
+    )
+    metrics = []
+    for key, text in _read_values(run_dir / "metrics").items():
+        latest = latest_metric(text)
+        if latest is not None:
+            metrics.append((run_id, key, *latest))
+    conn.executemany("INSERT INTO metrics VALUES (?, ?, ?, ?, ?)", metrics)
+
+
+def refresh(conn, mlruns=MLRUNS_DIR) -> dict:
+    """
+    Bring the index up to date with the ``mlruns`` tree.
+    """
+    mlruns = Path(mlruns)
+    known = dict(conn.execute("SELECT run_id, signature FROM runs"))
+    seen = set()
+    stats = {"scanned": 0, "indexed": 0, "removed": 0}
+    experiments = {}
+
+    with conn:
+        for experiment_id, experiment_dir, run_dir in iter_run_dirs(mlruns):
+            if experiment_id not in experiments:
+                meta = _read_yaml(experiment_dir / "meta.yaml")
+                experiments[experiment_id] = meta.get("name")
+
+            run_id = run_dir.name
+            seen.add(run_id)
+            stats["scanned"] += 1
+
+            signature = run_signature(run_dir)
+            if known.get(run_id) == signature:
+                continue
+            _index_run(conn, experiment_id, run_dir, signature)
+            stats["indexed"] += 1
+
+        conn.executemany(
+            "INSERT OR REPLACE INTO experiments VALUES (?, ?)",
+            experiments.items(),
+        )
+
+        removed = [(run_id,) for run_id in known if run_id not in seen]
+        for table in ("runs", "params", "tags", "metrics"):
+            conn.executemany(f"DELETE FROM {table} WHERE run_id = ?",
+                             removed)
+        stats["removed"] = len(removed)
+
+    return stats
+
+
+# -----------------------------
+# Queries
+# -----------------------------
+def best_runs(conn, metric: str = "roc_auc", model: str = None,
+              experiment: str = None, params: dict = None,
+              minimize: bool = False, top: int = 1) -> list:
+    """
+    Active runs ranked by ``metric``, optionally filtered by the
+    ``model`` param, experiment name and other exact param values.
+    """
+    filters = dict(params or {})
+    if model is not None:
+        filters["model"] = model
+
+    sql = [
+        "SELECT r.run_id, r.run_name, e.name, r.status, m.value",
+        "FROM metrics m",
+        "JOIN runs r ON r.run_id = m.run_id",
+        "LEFT JOIN experiments e ON e.experiment_id = r.experiment_id",
+    ]
+    args = []
+    for i, (key, value) in enumerate(filters.items()):
+        sql.append(
+            f"JOIN params p{i} ON p{i}.run_id = m.run_id "
+            f"AND p{i}.key = ? AND p{i}.value = ?"
+        )
+        args += [key, str(value)]
+
+    sql.append("WHERE m.key = ? AND r.lifecycle_stage = 'active'")
+    args.append(metric)
+    if experiment is not None:
+        sql.append("AND e.name = ?")
+        args.append(experiment)
+    sql.append(f"ORDER BY m.value {'ASC' if minimize else 'DESC'} LIMIT ?")
+    args.append(top)
+
+    return [
+        {"run_id": run_id, "run_name": run_name, "experiment": exp,
+         "status": status, metric: value}
+        for run_id, run_name, exp, status, value
+        in conn.execute(" ".join(sql), args)
+    ]
+
+
+def _parse_params(pairs) -> dict:
+    return dict(pair.split("=", 1) for pair in pairs or [])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local MLflow run index")
+    parser.add_argument("--mlruns", default=str(MLRUNS_DIR))
+    parser.add_argument("--db", default=str(INDEX_PATH))
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("index", help="Incrementally index the mlruns tree")
+
+    best = sub.add_parser("best", help="Best runs by a metric")
+    best.add_argument("--metric", default="roc_auc")
+    best.add_argument("--model", default=None,
+                      help="Value of the 'model' param")
+    best.add_argument("--experiment", default=None)
+    best.add_argument("--param", action="append", metavar="KEY=VALUE")
+    best.add_argument("--minimize", action="store_true")
+    best.add_argument("--top", type=int, default=1)
+    best.add_argument("--no-refresh", action="store_true")
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+
+    if args.command == "index" or not args.no_refresh:
+        start = time.perf_counter()
+        stats = refresh(conn, args.mlruns)
+        print(f"Indexed | {stats} | "
+              f"{(time.perf_counter() - start) * 1000:.1f} ms")
+
+    if args.command == "best":
+        start = time.perf_counter()
+        rows = best_runs(
+            conn, args.metric, model=args.model, experiment=args.experiment,
+            params=_parse_params(args.param), minimize=args.minimize,
+            top=args.top,
+        )
+        print(json.dumps(rows, indent=2))
+        print(f"Query | {(time.perf_counter() - start) * 1000:.2f} ms")
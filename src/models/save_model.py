@@ -1,19 +1,83 @@
 import os
 import pickle
-from src.models.train_evaluate_logistic_regression import log_reg
+import pandas as pd
+from src.utils.config_loader import load_config
+from src.serving.calibration import artifact_version
+from src.serving.drift import build_reference, save_reference
+from src.serving.engines import export_engine_params
+from src.models.calibration import calibrate_models, save_calibration
+from src.models.quantization import quantize_artifacts
+from src.models.train_evaluate_logistic_regression import (
+    train_logistic_regression_pipeline
+)
 from src.models.train_evaluate_random_forest import (
     train_random_forest_pipeline
 )
 
-MODEL_DIR = "./models"
-os.makedirs(MODEL_DIR, exist_ok=True)
 
-# Logistic Regression
-with open(os.path.join(MODEL_DIR, "logistic_regression_model.pkl"), "wb") as f:
-    pickle.dump(log_reg, f)
+def save_artifacts(log_reg, rf_model, scaler,
+                   df: pd.DataFrame = None) -> None:
+    """
+    Write the model pickles and every artifact derived from them to the
+    paths in the ``serving`` settings.
+    """
+    config = load_config()
+    paths = config["serving"]
+    os.makedirs(os.path.dirname(paths["lr_model_path"]), exist_ok=True)
+
+    # Logistic Regression
+    with open(paths["lr_model_path"], "wb") as f:
+        pickle.dump(log_reg, f)
+
+    # Random Forest
+    with open(paths["rf_model_path"], "wb") as f:
+        pickle.dump(rf_model, f)
+
+    versions = {
+        "logistic-regression": artifact_version(paths["lr_model_path"]),
+        "random-forest": artifact_version(paths["rf_model_path"]),
+    }
+
+    # Plain-array copies for the NumPy serving engines (no sklearn at serving)
+    export_engine_params(paths["engine_params_path"], scaler, log_reg,
+                         rf_model, source_versions=versions)
+
+    if df is None:
+        df = pd.read_csv(config["data"]["processed"]["file_path"])
+    features = [c for c in df.columns if c != "target"]
+
+    # Drift reference sketches (compared against live traffic at serving time)
+
+    save_reference(
+        build_reference(df, features),
+        paths["drift_reference_path"],
+    )
+
+    # Calibration tables (applied with np.interp at serving time)
+    calibration = config["calibration"]
+    save_calibration(
+        calibrate_models(
+            {"logistic-regression": log_reg, "random-forest": rf_model},
+            scaler.transform(df[features]),
+            df["target"],
+            versions=versions,
+            method=calibration["method"],
+            cv=calibration["cv"],
+            n_jobs=calibration["n_jobs"],
+        ),
+        paths["calibration_path"],
+    )
+
+    # Float32 / complete-tree copy, written only if predictions are identical
+    quantize_artifacts(
+        df[features].to_numpy(),
+        engine_params_path=paths["engine_params_path"],
+        quantized_path=paths["quantized_params_path"],
+        report_path=config["quantization"]["report_path"],
+    )
 
-# Random Forest
-rf_model, rf_metrics, _ = train_random_forest_pipeline()
 
-with open(os.path.join(MODEL_DIR, "random_forest_model.pkl"), "wb") as f:
-    pickle.dump(rf_model, f)
+if __name__ == "__main__":
+    log_reg, _, _ = train_logistic_regression_pipeline()
+    rf_model, rf_metrics, scaler = train_random_forest_pipeline()
+    save_artifacts(log_reg, rf_model, scaler)
@@ -0,0 +1,222 @@
+"""
+Batched, asynchronous MLflow run logging.
+
+``mlflow.log_param`` / ``mlflow.log_metric`` each perform a synchronous
+write to the tracking store. ``TrackedRun`` instead accumulates params,
+metrics (including per-fold cross-validation arrays) and tags in memory
+and a background thread flushes them with ``MlflowClient.log_batch``.
+Models are logged with ``mlflow.sklearn.log_model`` on a separate thread
+pool.
+Training code only blocks when the run ends, and the time spent there is
+reported.
+
+Usage:
+    with TrackedRun("Random_Forest") as run:
+        run.log_params({"n_estimators": 200})
+        run.log_cv_scores(cross_validate(...))
+        run.log_model(rf, "random_forest_model")
+"""
+
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import mlflow
+import mlflow.sklearn
+from mlflow import MlflowClient
+from mlflow.entities import Metric, Param, RunTag
+
+logger = logging.getLogger(__name__)
+
+# Per-request limits of the MLflow log_batch API
+MAX_METRICS_PER_BATCH = 1000
+MAX_PARAMS_PER_BATCH = 100
+MAX_TAGS_PER_BATCH = 100
+
+
+class TrackedRun:
+    """
+    MLflow run whose logging happens off the training thread.
+    """
+
+    def __init__(self, run_name: str, flush_interval: float = 1.0,
+                 artifact_workers: int = 2):
+        self.run_name = run_name
+        self.flush_interval = flush_interval
+        self.client = MlflowClient()
+        self.run_id = None
+
+        self._metrics, self._params, self._tags = [], [], []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._flusher = None
+        self._artifacts = ThreadPoolExecutor(
+            max_workers=artifact_workers, thread_name_prefix="mlflow-artifact"
+        )
+        self._artifact_futures = []
+        self._errors = []
+
+        self.timings = {
+            "flush_seconds": 0.0,
+            "batches": 0,
+            "artifact_seconds": 0.0,
+            "blocked_at_end_seconds": 0.0,
+        }
+
+    # -----------------------------
+    # Accumulation (non-blocking)
+    # -----------------------------
+    def log_param(self, key, value):
+        with self._lock:
+            self._params.append(Param(key, str(value)))
+
+    def log_params(self, params: dict):
+        with self._lock:
+            self._params.extend(Param(k, str(v)) for k, v in params.items())
+
+    def set_tag(self, key, value):
+        with self._lock:
+            self._tags.append(RunTag(key, str(value)))
+
+    def log_metric(self, key, value, step: int = 0):
+        metric = Metric(key, float(value), int(time.time() * 1000), step)
+        with self._lock:
+            self._metrics.append(metric)
+
+    def log_metrics(self, metrics: dict, step: int = 0):
+        timestamp = int(time.time() * 1000)
+        with self._lock:
+            self._metrics.extend(
+                Metric(k, float(v), timestamp, step)
+                for k, v in metrics.items()
+            )
+
+    def log_cv_scores(self, scores: dict):
+        """
+        Log a ``cross_validate`` result: the mean of each ``test_<name>``
+        as ``<name>`` and every fold as ``<name>_fold`` at step = fold.
+        """
+        timestamp = int(time.time() * 1000)
+        metrics = []
+        for key, values in scores.items():
+            if not key.startswith("test_"):
+                continue
+            name = key[len("test_"):]
+            metrics.append(Metric(name, float(values.mean()), timestamp, 0))
+            metrics.extend(
+                Metric(f"{name}_fold", float(v), timestamp, fold)
+                for fold, v in enumerate(values)
+            )
+        with self._lock:
+            self._metrics.extend(metrics)
+
+    def log_model(self, sk_model, name: str, **save_kwargs):
+        """
+        Log a scikit-learn model (an MLflow LoggedModel linked to this
+        run) in the background.
+        """
+        self._artifact_futures.append(
+            self._artifacts.submit(self._log_model, sk_model, name,
+                                   save_kwargs)
+        )
+
+    # -----------------------------
+    # Background Writers
+    # -----------------------------
+    def _log_model(self, sk_model, name, save_kwargs):
+        # The active run is thread-local: pass the run explicitly so the
+        # LoggedModel is linked to it
+        start = time.perf_counter()
+        try:
+            mlflow.sklearn.log_model(
+                sk_model, name=name, run_id=self.run_id, **save_kwargs
+            )
+        finally:
+            with self._lock:
+                self.timings["artifact_seconds"] += (
+                    time.perf_counter() - start
+                )
+
+    def _take(self):
+        with self._lock:
+            taken = self._metrics, self._params, self._tags
+            self._metrics, self._params, self._tags = [], [], []
+        return taken
+
+    def flush(self):
+        metrics, params, tags = self._take()
+        start = time.perf_counter()
+        batches = 0
+        while metrics or params or tags:
+            self.client.log_batch(
+                self.run_id,
+                metrics=metrics[:MAX_METRICS_PER_BATCH],
+                params=params[:MAX_PARAMS_PER_BATCH],
+                tags=tags[:MAX_TAGS_PER_BATCH],
+                synchronous=True,
+            )
+            metrics = metrics[MAX_METRICS_PER_BATCH:]
+            params = params[MAX_PARAMS_PER_BATCH:]
+            tags = tags[MAX_TAGS_PER_BATCH:]
+            batches += 1
+        if batches:
+            self.timings["flush_seconds"] += time.perf_counter() - start
+            self.timings["batches"] += batches
+
+    def _flush_loop(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.exception("MLflow batch flush failed")
+                self._errors.append(e)
+
+    # -----------------------------
+    # Run Lifecycle
+    # -----------------------------
+    def __enter__(self):
+        self.run_id = mlflow.start_run(run_name=self.run_name).info.run_id
+        self._flusher = threading.Thread(
+            target=self._flush_loop, name="mlflow-flush", daemon=True
+        )
+        self._flusher.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        start = time.perf_counter()
+        failed = exc_type is not None
+        try:
+            self._stop.set()
+            self._wake.set()
+            self._flusher.join()
+            self.flush()
+            for future in self._artifact_futures:
+                future.result()
+            if self._errors:
+                raise self._errors[0]
+        except Exception:
+            # Never mask an exception raised by the training code itself
+            if not failed:
+                failed = True
+                raise
+        finally:
+            self._artifacts.shutdown(wait=True)
+            self.timings["blocked_at_end_seconds"] = (
+                time.perf_counter() - start
+            )
+            mlflow.end_run("FAILED" if failed else "FINISHED")
+            self.report()
+        return False
+
+    def report(self):
+        t = self.timings
+        print(
+            f"Tracking | run={self.run_name} | "
+            f"blocked_at_end={t['blocked_at_end_seconds']:.3f}s | "
+            f"flush={t['flush_seconds']:.3f}s ({t['batches']} batches) | "
+            f"artifacts={t['artifact_seconds']:.3f}s"
+        )
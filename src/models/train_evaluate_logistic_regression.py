@@ -34,94 +34,109 @@ COLUMNS = config["schema"]["columns"]
 ############################################################
 
 
-df = pd.read_csv(PROCESSED_FILE_PATH)
-
-X = df.drop("target", axis=1)
-y = df["target"]
-
-############################################################
-# 4.2 Scaling
-############################################################
-scaler = StandardScaler()
-X_scaled = scaler.fit_transform(X)
-
-X_scaled_df = pd.DataFrame(X_scaled, columns=X.columns)
-
-# Save scaler
-with open("data/processed/standard_scaler.pkl", "wb") as f:
-    pickle.dump(scaler, f)
-
-X_scaled_df.to_csv(f"{PROCESSED_BASE_PATH}/heart_disease_scaled.csv",
-                   index=False)
-
-############################################################
-# Logistic Regression
-############################################################
-log_reg = LogisticRegression(max_iter=1000)
-scores_lr = cross_validate(
-    log_reg, X_scaled, y, cv=5, scoring=["accuracy",
-                                         "precision",
-                                         "recall",
-                                         "roc_auc"]
-)
-
+def train_logistic_regression_pipeline(
+    df: pd.DataFrame = None,
+    save_scaler_path: str = config["serving"]["scaler_path"],
+    save_scaled_path: str = f"{PROCESSED_BASE_PATH}/heart_disease_scaled.csv",
+    save_plots_dir: str = "screenshots",
+):
+    """
+    Scale, cross-validate and fit the logistic regression.
 
-lr_metrics = {
-    "accuracy": scores_lr["test_accuracy"].mean(),
-    "precision": scores_lr["test_precision"].mean(),
-    "recall": scores_lr["test_recall"].mean(),
-    "roc_auc": scores_lr["test_roc_auc"].mean(),
-}
+    Returns (log_reg, lr_metrics, scaler); ``log_reg`` is fitted on the
+    training split used for the ROC curve.
+    """
+    if df is None:
+        df = pd.read_csv(PROCESSED_FILE_PATH)
+
+    X = df.drop("target", axis=1)
+    y = df["target"]
+
+    ############################################################
+    # 4.2 Scaling
+    ############################################################
+    scaler = StandardScaler()
+    X_scaled = scaler.fit_transform(X)
+
+    X_scaled_df = pd.DataFrame(X_scaled, columns=X.columns)
+
+    # Save scaler
+    if save_scaler_path:
+        with open(save_scaler_path, "wb") as f:
+            pickle.dump(scaler, f)
+
+    if save_scaled_path:
+        X_scaled_df.to_csv(save_scaled_path, index=False)
+
+    ############################################################
+    # Logistic Regression
+    ############################################################
+    log_reg = LogisticRegression(max_iter=1000)
+    scores_lr = cross_validate(
+        log_reg, X_scaled, y, cv=5, scoring=["accuracy",
+                                             "precision",
+                                             "recall",
+                                             "roc_auc"]
+    )
 
-print("\n-------------------------------------------------")
-print("Logistic Regression Metrics:")
-print("-------------------------------------------------\n")
+    lr_metrics = {
+        "accuracy": scores_lr["test_accuracy"].mean(),
+        "precision": scores_lr["test_precision"].mean(),
+        "recall": scores_lr["test_recall"].mean(),
+        "roc_auc": scores_lr["test_roc_auc"].mean(),
+    }
 
-for metric, value in lr_metrics.items():
-    print(f"* {metric}: {value:.3f}")
+    print("\n-------------------------------------------------")
+    print("Logistic Regression Metrics:")
+    print("-------------------------------------------------\n")
 
-print("-------------------------------------------------\n")
+    for metric, value in lr_metrics.items():
+        print(f"* {metric}: {value:.3f}")
 
-############################################################
-# ROC Curve - Logistic Regression
-############################################################
-X_train, X_test, y_train, y_test = train_test_split(
-    X_scaled, y, test_size=0.2, random_state=42
-)
+    print("-------------------------------------------------\n")
 
+    ############################################################
+    # ROC Curve - Logistic Regression
+    ############################################################
+    X_train, X_test, y_train, y_test = train_test_split(
+        X_scaled, y, test_size=0.2, random_state=42
+    )
 
-log_reg.fit(X_train, y_train)
-y_prob = log_reg.predict_proba(X_test)[:, 1]
+    log_reg.fit(X_train, y_train)
+    y_prob = log_reg.predict_proba(X_test)[:, 1]
 
+    fpr, tpr, _ = roc_curve(y_test, y_prob)
+    roc_auc = auc(fpr, tpr)
 
-fpr, tpr, _ = roc_curve(y_test, y_prob)
-roc_auc = auc(fpr, tpr)
+    # -----------------------------
+    # Ensure folder exists
+    # -----------------------------
+    os.makedirs(save_plots_dir, exist_ok=True)
 
+    # -----------------------------
+    # Plot ROC curve
+    # -----------------------------
+    plt.figure()
+    plt.plot(fpr, tpr, label=f"ROC AUC = {roc_auc:.2f}")
+    plt.plot([0, 1], [0, 1], "--")
+    plt.xlabel("False Positive Rate")
+    plt.ylabel("True Positive Rate")
+    plt.title("ROC Curve – Logistic Regression")
+    plt.legend()
 
-# -----------------------------
-# Ensure folder exists
-# -----------------------------
-output_dir = "screenshots"
-os.makedirs(output_dir, exist_ok=True)  # Creates folder if it doesn't exist
+    # -----------------------------
+    # Save plot (overwrites if exists)
+    # -----------------------------
+    output_path = os.path.join(save_plots_dir, "roc_curve_logistic.png")
+    plt.savefig(output_path)  # Will overwrite if file already exists
+    plt.close()
 
-# -----------------------------
-# Plot ROC curve
-# -----------------------------
-plt.plot(fpr, tpr, label=f"ROC AUC = {roc_auc:.2f}")
-plt.plot([0, 1], [0, 1], "--")
-plt.xlabel("False Positive Rate")
-plt.ylabel("True Positive Rate")
-plt.title("ROC Curve – Logistic Regression")
-plt.legend()
+    print(f"✅ ROC curve saved to {output_path}")
 
-# -----------------------------
-# Save plot (overwrites if exists)
-# -----------------------------
-output_path = os.path.join(output_dir, "roc_curve_logistic.png")
-plt.savefig(output_path)  # Will overwrite if file already exists
-plt.close()
+    print("\n")
+    print(generate_model_comments("Logistic Regression", scores_lr))
 
-print(f"✅ ROC curve saved to {output_path}")
+    return log_reg, lr_metrics, scaler
 
 
 def generate_model_comments(model_name, metrics):
@@ -207,5 +222,5 @@ def generate_model_comments(model_name, metrics):
     return "\n\n".join(comments)
 
 
-print("\n")
-print(generate_model_comments("Logistic Regression", scores_lr))
+if __name__ == "__main__":
+    train_logistic_regression_pipeline()
@@ -2,7 +2,7 @@
 
 import matplotlib.pyplot as plt
 import os
-from src.utils.config_loader import load_config
+from src.utils.config_loader import get_settings, load_config
 import pickle
 import pandas as pd
 from pathlib import Path
@@ -19,16 +19,18 @@ rf = None
 
 def train_random_forest_pipeline(
     processed_file_path: str = None,
-    save_scaler_path: str = "data/processed/standard_scaler.pkl",
+    save_scaler_path: str = get_settings().serving.scaler_path,
     save_plots_dir: str = "screenshots",
+    df: pd.DataFrame = None,
 ) -> dict:
-    # Load config if file path not provided
-    if not processed_file_path:
-        config = load_config()
-        processed_file_path = config["data"]["processed"]["file_path"]
-
-    # Load dataset
-    df = pd.read_csv(processed_file_path)
+    # Load dataset unless it is passed in already loaded
+    if df is None:
+        # Load config if file path not provided
+        if not processed_file_path:
+            config = load_config()
+            processed_file_path = config["data"]["processed"]["file_path"]
+
+        df = pd.read_csv(processed_file_path)
 
     X = df.drop("target", axis=1)
     y = df["target"]
@@ -0,0 +1,236 @@
+"""
+In-process pipeline orchestrator.
+
+Runs acquisition → preprocessing → training → tracking → distillation →
+artifact export as a DAG of stages in one interpreter. Stage results (the
+raw and processed DataFrames, fitted models, scaler) are passed to
+dependent stages in memory instead of being re-read from disk, and
+independent stages (EDA plots, logistic regression, random forest, MLflow
+tracking, distillation) run concurrently in a process pool once their
+inputs are ready. A per-stage timing report is printed at the end.
+
+Usage:
+    python -m src.orchestrator
+    python -m src.orchestrator --offline --skip track --workers 3
+"""
+
+import os
+import time
+import argparse
+from functools import partial
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    wait,
+)
+
+from tabulate import tabulate
+
+
+class Stage:
+    """
+    A named pipeline step. ``func`` receives the results of ``deps`` as
+    keyword arguments; ``in_process=False`` stages run in the pool.
+    """
+
+    def __init__(self, name: str, func, deps=(), in_process: bool = True):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.in_process = in_process
+
+
+# -----------------------------
+# Stages
+# -----------------------------
+# Imports are local so each pool worker only imports what its stage needs.
+def acquire(download: bool = True):
+    from src.data.data_acquisition import download_data, download_sources
+    from src.data.preprocess import load_raw
+
+    if download:
+        download_data()
+        download_sources()
+    return load_raw()
+
+
+def preprocess(acquire):
+    from src.data.preprocess import clean, save_processed
+
+    df = clean(acquire)
+    save_processed(df)
+    return df
+
+
+def eda(preprocess):
+    from src.data.preprocess import plot_eda
+
+    plot_eda(preprocess)
+
+
+def train_lr(preprocess):
+    from src.models.train_evaluate_logistic_regression import (
+        train_logistic_regression_pipeline,
+    )
+
+    return train_logistic_regression_pipeline(df=preprocess)
+
+
+def train_rf(preprocess):
+    from src.models.train_evaluate_random_forest import (
+        train_random_forest_pipeline,
+    )
+
+    # train_lr writes the (identical) scaler pickle
+    return train_random_forest_pipeline(df=preprocess, save_scaler_path=None)
+
+
+def track(preprocess):
+    from src.models.experiment_tracking import run_experiments
+
+    run_experiments(df=preprocess)
+
+
+def distill(preprocess, train_rf):
+    from src.models.distillation import run_distillation
+
+    rf_model, _, scaler = train_rf
+    return run_distillation(rf_model, scaler, preprocess)
+
+
+def save(preprocess, train_lr, train_rf):
+    from src.models.save_model import save_artifacts
+
+    log_reg, _, _ = train_lr
+    rf_model, _, scaler = train_rf
+    save_artifacts(log_reg, rf_model, scaler, df=preprocess)
+
+
+def default_stages(download: bool = True) -> list:
+    return [
+        Stage("acquire", partial(acquire, download=download)),
+        Stage("preprocess", preprocess, ["acquire"]),
+        Stage("eda", eda, ["preprocess"], in_process=False),
+        Stage("train_lr", train_lr, ["preprocess"], in_process=False),
+        Stage("train_rf", train_rf, ["preprocess"], in_process=False),
+        Stage("track", track, ["preprocess"], in_process=False),
+        Stage("distill", distill, ["preprocess", "train_rf"],
+              in_process=False),
+        Stage("save", save, ["preprocess", "train_lr", "train_rf"]),
+    ]
+
+
+# -----------------------------
+# Scheduler
+# -----------------------------
+def validate(stages: list) -> None:
+    names = [s.name for s in stages]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate stage names: {names}")
+    for stage in stages:
+        missing = [d for d in stage.deps if d not in names]
+        if missing:
+            raise ValueError(
+                f"Stage {stage.name!r} depends on unknown stages {missing}"
+            )
+
+    # Kahn's algorithm: every stage must become runnable
+    done, remaining = set(), list(stages)
+    while remaining:
+        ready = [s for s in remaining if set(s.deps) <= done]
+        if not ready:
+            raise ValueError(
+                f"Dependency cycle among {[s.name for s in remaining]}"
+            )
+        done.update(s.name for s in ready)
+        remaining = [s for s in remaining if s.name not in done]
+
+
+def run_pipeline(stages: list, max_workers: int = None):
+    """
+    Run ``stages`` respecting dependencies. Returns (results, timings),
+    both keyed by stage name; timings hold start/end offsets in seconds
+    from pipeline start and where the stage ran.
+    """
+    validate(stages)
+
+    results, timings = {}, {}
+    pending = {s.name: s for s in stages}
+    running = {}
+    t0 = time.perf_counter()
+
+    def record(stage, start, end):
+        timings[stage.name] = {
+            "where": "main" if stage.in_process else "pool",
+            "start": start - t0,
+            "end": end - t0,
+            "seconds": end - start,
+        }
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        try:
+            while pending or running:
+                ready = [s for s in pending.values()
+                         if all(d in results for d in s.deps)]
+
+                # Hand pool stages out first so they overlap with main work
+                for stage in sorted(ready, key=lambda s: s.in_process):
+                    del pending[stage.name]
+                    inputs = {d: results[d] for d in stage.deps}
+                    if stage.in_process:
+                        start = time.perf_counter()
+                        results[stage.name] = stage.func(**inputs)
+                        record(stage, start, time.perf_counter())
+                        break
+                    future = pool.submit(stage.func, **inputs)
+                    running[future] = (stage, time.perf_counter())
+                else:
+                    if not running:
+                        continue
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        stage, start = running.pop(future)
+                        results[stage.name] = future.result()
+                        record(stage, start, time.perf_counter())
+        except BaseException:
+            for future in running:
+                future.cancel()
+            raise
+
+    total = time.perf_counter() - t0
+    timings["total"] = {"where": "", "start": 0.0, "end": total,
+                        "seconds": total}
+    return results, timings
+
+
+def report(timings: dict) -> str:
+    rows = [
+        [name, t["where"], f"{t['start']:.2f}", f"{t['end']:.2f}",
+         f"{t['seconds']:.2f}"]
+        for name, t in timings.items()
+    ]
+    serial = sum(t["seconds"] for n, t in timings.items() if n != "total")
+    rows.append(["sum of stages", "", "", "", f"{serial:.2f}"])
+    return tabulate(
+        rows,
+        headers=["stage", "where", "start (s)", "end (s)", "duration (s)"],
+        tablefmt="psql",
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the full pipeline")
+    parser.add_argument("--offline", action="store_true",
+                        help="Use the raw dataset already on disk")
+    parser.add_argument("--skip", action="append", default=[],
+                        help="Stage to leave out (repeatable)")
+    parser.add_argument("--workers", type=int,
+                        default=min(4, os.cpu_count() or 1))
+    args = parser.parse_args()
+
+    stages = [s for s in default_stages(download=not args.offline)
+              if s.name not in args.skip]
+    _, timings = run_pipeline(stages, max_workers=args.workers)
+
+    print("\nPipeline timing:")
+    print(report(timings))
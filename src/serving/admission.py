@@ -0,0 +1,123 @@
+"""
+Adaptive admission control for the prediction endpoints.
+
+Each model and route kind (single-row predictions, batches,
+explanations) has its own concurrency limit, so slow batches never shrink
+the limit for single-row traffic, and batch limiters are judged against
+their own target latency. Limits are adjusted with AIMD from observed
+request latency: every request that finishes under the target latency
+grows the limit by ``1 / limit`` (about +1 per window of requests), and a
+slow or failed request shrinks it multiplicatively, at most once per
+latency window: requests that were already in flight when the limit was
+cut do not cut it again. Requests arriving while the limiter is at its
+limit are rejected immediately instead of queueing until the ingress
+times out.
+"""
+
+import time
+import threading
+
+from prometheus_client import Counter, Gauge
+
+ADMISSION_LIMIT = Gauge(
+    "admission_concurrency_limit",
+    "Current adaptive concurrency limit (summed over workers)",
+    ["model"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_IN_FLIGHT = Gauge(
+    "admission_in_flight",
+    "Requests currently admitted and in flight",
+    ["model"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_REJECTED = Counter(
+    "admission_rejected_total",
+    "Requests rejected because the concurrency limit was reached",
+    ["model"],
+)
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit driven by request latency.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int = 20,
+        min_limit: int = 2,
+        max_limit: int = 200,
+        target_latency: float = 0.05,
+        backoff: float = 0.9,
+        clock=time.monotonic,
+    ):
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.backoff = backoff
+        self._clock = clock
+        self._last_backoff = float("-inf")
+
+        self.limit = float(initial_limit)
+        self.in_flight = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+        ADMISSION_LIMIT.labels(name).set(int(self.limit))
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self.in_flight >= int(self.limit):
+                self.rejected += 1
+                ADMISSION_REJECTED.labels(self.name).inc()
+                return False
+            self.in_flight += 1
+            ADMISSION_IN_FLIGHT.labels(self.name).set(self.in_flight)
+            return True
+
+    def release(self, latency: float, failed: bool = False) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            now = self._clock()
+
+            if failed or latency > self.target_latency:
+                # Only requests started after the last cut may cut again
+                if now - latency >= self._last_backoff:
+                    self.limit = max(self.min_limit,
+                                     self.limit * self.backoff)
+                    self._last_backoff = now
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+            ADMISSION_IN_FLIGHT.labels(self.name).set(self.in_flight)
+            ADMISSION_LIMIT.labels(self.name).set(int(self.limit))
+
+
+class AdmissionController:
+    """
+    One limiter per name in ``routes`` (path -> limiter name); routes
+    mapped to the same name share it. ``targets`` overrides the target
+    latency of individual limiters.
+    """
+
+    def __init__(self, routes: dict, targets: dict = None, **limiter_kwargs):
+        targets = targets or {}
+        self.limiters = {}
+        self.routes = {}
+        for path, name in routes.items():
+            if name not in self.limiters:
+                kwargs = dict(limiter_kwargs)
+                if name in targets:
+                    kwargs["target_latency"] = targets[name]
+                self.limiters[name] = AdaptiveLimiter(name, **kwargs)
+            self.routes[path] = self.limiters[name]
+
+    def limiter_for(self, path: str):
+        """
+        Return the limiter for ``path``, or None for unlimited routes
+        such as /health, /ready and /metrics.
+        """
+        return self.routes.get(path)
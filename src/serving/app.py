@@ -1,12 +1,42 @@
-from fastapi import FastAPI, Request
-from pydantic import BaseModel
+from fastapi import Depends, FastAPI, Header, Query, Request
+from pydantic import BaseModel, Field
+from typing import List, Optional
+import os
 import pickle
-import numpy as np
+import hmac
 import time
 import logging
 import sys
+import threading
+from functools import partial
+from pathlib import Path
+import numpy as np
+from contextlib import asynccontextmanager
 from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+from prometheus_client import REGISTRY
 from prometheus_fastapi_instrumentator import Instrumentator
+from src.serving.drift import DriftMonitor, build_reference
+from src.serving.audit import AuditSink
+from src.serving.shadow import ShadowEvaluator
+from src.serving.warmup import run_warmup, SERVICE_READY
+from src.serving.admission import AdmissionController
+from src.serving.lookup import LookupIndex, training_rows, audit_rows
+from src.serving.features import FEATURES, FeatureEncoder
+from src.serving.binary import MODEL_IDS, BinaryServer
+from src.serving.profiler import RequestProfiler, StackSampler
+from src.serving.calibration import (
+    artifact_version,
+    decide,
+    load_calibrators,
+)
+from src.serving.explain import (
+    as_forest_engine,
+    forest_contributions,
+    logistic_contributions,
+)
+from src.utils.config_loader import get_settings
 
 # -----------------------------
 # Logging Setup
@@ -19,38 +49,246 @@ logging.basicConfig(
 
 logger = logging.getLogger("heart-disease-api")
 
+
 # -----------------------------
 # FastAPI App
 # -----------------------------
-app = FastAPI(title="Heart Disease Prediction API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if AUDIT_ENABLED:
+        audit_sink.start()
+    if BINARY_PORT:
+        await binary_server.start(port=BINARY_PORT)
+    start_warmup()
+    yield
+    if BINARY_PORT:
+        await binary_server.close()
+    shadow.shutdown()
+    if AUDIT_ENABLED:
+        audit_sink.close()
+
+
+app = FastAPI(title="Heart Disease Prediction API", lifespan=lifespan)
+
+# Enable Prometheus metrics. Under the multi-worker launcher
+# (PROMETHEUS_MULTIPROC_DIR set) every worker writes its samples to that
+# directory and /metrics aggregates all of them (see metrics() below).
+MULTIPROCESS_METRICS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
 
-# Enable Prometheus metrics
-Instrumentator().instrument(app).expose(app)
+instrumentator = Instrumentator().instrument(app)
+if not MULTIPROCESS_METRICS:
+    instrumentator.expose(app)
 
 # -----------------------------
 # Load Artifacts
 # -----------------------------
 logger.info("Loading scaler and models...")
 
-with open("data/processed/standard_scaler.pkl", "rb") as f:
-    scaler = pickle.load(f)
+# Every serving tunable comes from the validated ``serving`` settings
+# (config.json, overridable per deployment through environment variables).
+settings = get_settings().serving
+
+SCALER_PATH = settings.scaler_path
+PROCESSED_DATA_PATH = settings.processed_data_path
+LR_MODEL_PATH = settings.lr_model_path
+RF_MODEL_PATH = settings.rf_model_path
+ENGINE_PARAMS_PATH = Path(settings.engine_params_path)
+QUANTIZED_PARAMS_PATH = Path(settings.quantized_params_path)
+
+# "numpy" serves from exported arrays without importing scikit-learn;
+# "quantized" from the validated float32 / complete-tree export;
+# "sklearn" unpickles the estimators (imports scikit-learn, SciPy, pandas).
+SERVING_ENGINE = settings.serving_engine
+
+
+def load_pickle(path):
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+# Versions of the pickled models; the array exports record the versions
+# they were built from and are only served when those match
+PICKLE_VERSIONS = {
+    "logistic-regression": artifact_version(LR_MODEL_PATH),
+    "random-forest": artifact_version(RF_MODEL_PATH),
+}
+
+if SERVING_ENGINE in ("numpy", "quantized"):
+    from src.serving.engines import engine_source_versions, source_version
+
+    if not ENGINE_PARAMS_PATH.exists() \
+            or engine_source_versions(ENGINE_PARAMS_PATH) != PICKLE_VERSIONS:
+        logger.warning(
+            f"{ENGINE_PARAMS_PATH} missing or not exported from the current "
+            f"model files, falling back to sklearn engine"
+        )
+        SERVING_ENGINE = "sklearn"
+
+if SERVING_ENGINE == "quantized":
+    # The export records the float64 arrays it was validated against
+    if not QUANTIZED_PARAMS_PATH.exists() \
+            or source_version(QUANTIZED_PARAMS_PATH) \
+            != artifact_version(ENGINE_PARAMS_PATH):
+        logger.warning(
+            f"No validated {QUANTIZED_PARAMS_PATH}, falling back to numpy "
+            f"engine"
+        )
+        SERVING_ENGINE = "numpy"
+
+if SERVING_ENGINE == "quantized":
+    from src.serving.engines import load_quantized_engines
+
+    scaler, lr_model, rf_model = load_quantized_engines(QUANTIZED_PARAMS_PATH)
+elif SERVING_ENGINE == "numpy":
+    from src.serving.engines import load_engines
+
+    scaler, lr_model, rf_model = load_engines(ENGINE_PARAMS_PATH)
+else:
+    scaler = load_pickle(SCALER_PATH)
+    lr_model = load_pickle(LR_MODEL_PATH)
+    rf_model = load_pickle(RF_MODEL_PATH)
+
+# "distilled" serves the compact student forest exported by the
+# distillation stage (only written when it met the accuracy tolerance),
+# decided through the student's own calibration table. The quantized
+# engine serves the student's validated quantized copy, never a forest
+# quantized at startup.
+RF_VARIANT = settings.random_forest_variant
+DISTILLED_PARAMS_PATH = Path(settings.distilled_params_path)
+DISTILLED_QUANTIZED_PARAMS_PATH = Path(
+    settings.distilled_quantized_params_path
+)
+DISTILLED_CALIBRATION_PATH = Path(settings.distilled_calibration_path)
+CALIBRATION_ENABLED = settings.calibration_enabled
 
-with open("models/logistic_regression_model.pkl", "rb") as f:
-    lr_model = pickle.load(f)
 
-with open("models/random_forest_model.pkl", "rb") as f:
-    rf_model = pickle.load(f)
+def validated_student(path) -> bool:
+    if not path.exists() or not DISTILLED_PARAMS_PATH.exists():
+        return False
+    if SERVING_ENGINE != "quantized":
+        return True
+    # Stale if the student was re-distilled after it was quantized
+    return source_version(path) == artifact_version(DISTILLED_PARAMS_PATH)
 
-logger.info("Models and scaler loaded successfully")
+
+if RF_VARIANT == "distilled":
+    student_path = (DISTILLED_QUANTIZED_PARAMS_PATH
+                    if SERVING_ENGINE == "quantized"
+                    else DISTILLED_PARAMS_PATH)
+    if validated_student(student_path) and (
+        DISTILLED_CALIBRATION_PATH.exists() or not CALIBRATION_ENABLED
+    ):
+        if SERVING_ENGINE == "quantized":
+            from src.serving.engines import load_quantized_forest
+
+            rf_model = load_quantized_forest(student_path)
+        else:
+            from src.serving.engines import load_forest
+
+            rf_model = load_forest(student_path)
+    else:
+        logger.warning(
+            f"No validated {student_path} or no "
+            f"{DISTILLED_CALIBRATION_PATH}, serving the full random forest"
+        )
+        RF_VARIANT = "full"
+
+MODEL_VERSIONS = dict(PICKLE_VERSIONS)
+if RF_VARIANT == "distilled":
+    MODEL_VERSIONS["random-forest"] = artifact_version(DISTILLED_PARAMS_PATH)
+
+logger.info(
+    f"Models and scaler loaded successfully | engine={SERVING_ENGINE} | "
+    f"random_forest={RF_VARIANT} | versions={MODEL_VERSIONS}"
+)
+
+# -----------------------------
+# Calibration & Decision Threshold
+# -----------------------------
+# Model probabilities are mapped through the calibration tables exported at
+# training time; a prediction is positive when the calibrated probability
+# reaches the threshold. DECISION_THRESHOLD sets the deployment's
+# operating point and ?threshold= overrides it per request.
+CALIBRATION_PATH = Path(settings.calibration_path)
+DECISION_THRESHOLD = settings.decision_threshold
+
+# Each table must match the version of the model it is applied to
+CALIBRATION_PATHS = {key: CALIBRATION_PATH for key in MODEL_VERSIONS}
+if RF_VARIANT == "distilled":
+    CALIBRATION_PATHS["random-forest"] = DISTILLED_CALIBRATION_PATH
+
+calibrators = {}
+for key, path in CALIBRATION_PATHS.items():
+    calibrators.update(load_calibrators(
+        path if CALIBRATION_ENABLED else None, {key: MODEL_VERSIONS[key]}
+    ))
+
+# Content hash of the calibration file each decision was made with
+CALIBRATION_VERSIONS = {
+    key: artifact_version(path)
+    if CALIBRATION_ENABLED and path.exists() else "identity"
+    for key, path in CALIBRATION_PATHS.items()
+}
+logger.info(
+    "Calibration | "
+    + " | ".join(f"{k}={c.method}" for k, c in calibrators.items())
+    + f" | threshold={DECISION_THRESHOLD}"
+)
+
+
+def classify(model_key, probs, threshold=None):
+    """
+    Return (predictions, calibrated positive-class probabilities) for an
+    (n, 2) matrix of model probabilities.
+    """
+    if threshold is None:
+        threshold = DECISION_THRESHOLD
+    return decide(calibrators[model_key], probs, threshold)
+
+
+ThresholdQuery = Query(
+    None, ge=0.0, le=1.0,
+    description="Decision threshold on the calibrated probability",
+)
+
+# -----------------------------
+# Drift Monitoring
+# -----------------------------
+DRIFT_REFERENCE_PATH = Path(settings.drift_reference_path)
+DRIFT_WINDOW = settings.drift_window
+REJECT_OUT_OF_DOMAIN = settings.reject_out_of_domain
+
+# -----------------------------
+# Prediction Audit Log
+# -----------------------------
+AUDIT_ENABLED = settings.audit_enabled
+
+audit_sink = AuditSink(
+    settings.audit_log_dir,
+    batch_size=settings.audit_batch_size,
+    max_buffer=settings.audit_max_buffer,
+    drop_policy=settings.audit_drop_policy,
+)
+
+# -----------------------------
+# Shadow / Canary Evaluation
+# -----------------------------
+# Random forest is evaluated as a candidate replacement for the
+# logistic regression endpoint; agreement compares the calibrated,
+# thresholded decisions each model would serve.
+shadow = ShadowEvaluator(
+    rf_model,
+    primary="logistic-regression",
+    candidate="random-forest",
+    shadow_fraction=settings.shadow_fraction,
+    canary_weight=settings.canary_weight,
+    max_in_flight=settings.shadow_max_in_flight,
+    decide=classify,
+)
 
 # -----------------------------
 # Feature Schema
 # -----------------------------
-FEATURES = [
-    "age", "sex", "cp", "trestbps", "chol", "fbs",
-    "restecg", "thalach", "exang", "oldpeak",
-    "slope", "ca", "thal",
-]
 
 
 class HeartDiseaseInput(BaseModel):
@@ -69,11 +307,222 @@ class HeartDiseaseInput(BaseModel):
     thal: int
 
 
+MAX_BATCH_SIZE = settings.max_batch_size
+
+
+class HeartDiseaseBatchInput(BaseModel):
+    instances: List[HeartDiseaseInput] = Field(
+        ..., min_length=1, max_length=MAX_BATCH_SIZE
+    )
+
+
+# Decodes payloads into reusable per-thread buffers, scaled in place
+encoder = FeatureEncoder.from_scaler(
+    FEATURES, scaler, max_batch=MAX_BATCH_SIZE
+)
+
+
+if DRIFT_REFERENCE_PATH.exists():
+    drift_monitor = DriftMonitor.from_file(
+        DRIFT_REFERENCE_PATH, window=DRIFT_WINDOW,
+        shared=MULTIPROCESS_METRICS,
+    )
+else:
+    import pandas as pd
+
+    logger.warning(
+        "Drift reference not found, building from processed dataset"
+    )
+    drift_monitor = DriftMonitor(
+        build_reference(
+            pd.read_csv(PROCESSED_DATA_PATH),
+            FEATURES,
+        ),
+        window=DRIFT_WINDOW,
+        shared=MULTIPROCESS_METRICS,
+    )
+
+if MULTIPROCESS_METRICS:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST,
+        CollectorRegistry,
+        generate_latest,
+        multiprocess,
+    )
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        # Drift counts are shared by all workers (created before the fork)
+        registry.register(drift_monitor)
+        return Response(generate_latest(registry),
+                        media_type=CONTENT_TYPE_LATEST)
+else:
+    REGISTRY.register(drift_monitor)
+
+
+# -----------------------------
+# Warm-up & Readiness
+# -----------------------------
+WARMUP_ITERATIONS = settings.warmup_iterations
+WARMUP_BATCH_SIZE = settings.warmup_batch_size
+
+MODELS = {
+    "logistic-regression": lr_model,
+    "random-forest": rf_model,
+}
+
+service_state = {
+    "models_loaded": scaler is not None and all(
+        m is not None for m in MODELS.values()
+    ),
+    "warmed_up": False,
+    "warmup_seconds": None,
+}
+
+
+def warmup_encode(payloads):
+    instances = [HeartDiseaseInput.model_validate(p) for p in payloads]
+    if len(instances) == 1:
+        return prepare_input(instances[0])
+    return prepare_batch(instances)
+
+
+def warmup_paths() -> dict:
+    """
+    Serving paths warmed before readiness: request validation and
+    encoding, each model with its calibrated decision, explanations and
+    (when enabled) the binary frontend. Drift monitoring and the audit
+    log are left out so synthetic rows never reach them.
+    """
+    def predict(model_key, model):
+        def path(payloads):
+            classify(model_key, model.predict_proba(warmup_encode(payloads)))
+        return path
+
+    def explain_path(name):
+        def path(payloads):
+            explain(name, warmup_encode(payloads))
+        return path
+
+    def binary_path(model_id):
+        def path(payloads):
+            X = np.array([[p[f] for f in FEATURES] for p in payloads],
+                         dtype="<f8")
+            binary_server.respond(0, model_id, X.tobytes())
+        return path
+
+    paths = {f"predict/{key}": predict(key, model)
+             for key, model in MODELS.items() if model is not None}
+    paths.update({f"explain/{name}": explain_path(name)
+                  for name in EXPLAINERS})
+    if BINARY_PORT:
+        paths.update({f"binary/{key}": binary_path(model_id)
+                      for model_id, key in enumerate(MODEL_IDS)})
+    return paths
+
+
+def warmup():
+    try:
+        if LOOKUP_ENABLED:
+            build_lookup_tables()
+        service_state["warmup_seconds"] = round(run_warmup(
+            warmup_paths(),
+            scaler,
+            FEATURES,
+            iterations=WARMUP_ITERATIONS,
+            batch_size=WARMUP_BATCH_SIZE,
+        ), 4)
+        service_state["warmed_up"] = True
+        SERVICE_READY.set(1)
+    except Exception:
+        logger.exception("Warm-up failed")
+
+
+# -----------------------------
+# Prediction Lookup Table
+# -----------------------------
+LOOKUP_ENABLED = settings.lookup_enabled
+
+lookup = LookupIndex(FEATURES, max_entries=settings.lookup_max_entries)
+
+
+def build_lookup_tables():
+    """
+    Index the most frequent feature vectors from the training data and
+    audit log. Tables whose model version is unchanged are kept.
+    """
+    rows = training_rows(PROCESSED_DATA_PATH, FEATURES)
+    if AUDIT_ENABLED and audit_sink.directory.exists():
+        rows += audit_rows(audit_sink.directory, FEATURES)
+
+    for model_key, model in MODELS.items():
+        if lookup.ensure(model_key, model, scaler,
+                         MODEL_VERSIONS[model_key], rows):
+            logger.info(
+                f"Lookup table built | model={model_key} | "
+                f"entries={len(lookup.tables[model_key])}"
+            )
+
+
+def lookup_prediction(model_key, data):
+    if not LOOKUP_ENABLED:
+        return None
+    return lookup.get(model_key, data, MODEL_VERSIONS[model_key])
+
+
+# -----------------------------
+# Binary Inference Frontend
+# -----------------------------
+# Packed feature matrices over a length-prefixed TCP protocol for
+# service-to-service scoring; 0 disables it.
+BINARY_PORT = settings.binary_port
+BINARY_INLINE_ROWS = settings.binary_inline_rows
+BINARY_THREADS = settings.binary_threads
+
+binary_server = BinaryServer(
+    MODELS, encoder, max_batch=MAX_BATCH_SIZE,
+    inline_rows=BINARY_INLINE_ROWS, threads=BINARY_THREADS,
+    decide=classify,
+)
+
+
+def start_warmup():
+    """
+    Warm up in the background so /live answers immediately while /ready
+    keeps traffic away until the models are warm.
+    """
+    if service_state["warmed_up"]:
+        return
+    threading.Thread(target=warmup, name="warmup", daemon=True).start()
+
+
 @app.get("/health")
 def health():
     return {"status": "ok"}
 
 
+@app.get("/live")
+def live():
+    if not service_state["models_loaded"]:
+        return JSONResponse(
+            status_code=503, content={"status": "models_not_loaded"}
+        )
+    return {"status": "alive"}
+
+
+@app.get("/ready")
+def ready():
+    if not (service_state["models_loaded"] and service_state["warmed_up"]):
+        return JSONResponse(status_code=503, content={"status": "warming_up"})
+    return {
+        "status": "ready",
+        "warmup_seconds": service_state["warmup_seconds"],
+        "model_versions": MODEL_VERSIONS,
+    }
+
+
 # -----------------------------
 # Request Logging Middleware
 # -----------------------------
@@ -92,67 +541,531 @@ async def log_requests(request: Request, call_next):
 
 
 # -----------------------------
-# Input Preparation
+# Admission Control Middleware
+# -----------------------------
+# Registered after log_requests so it is the outermost middleware and
+# rejected requests cost as little as possible. Only /predict/* and
+# /explain/* routes are limited; /health, /live, /ready and /metrics are always admitted.
+ADMISSION_ENABLED = settings.admission_enabled
+
+# Single rows, batches and explanations of a model are limited separately;
+# batch routes are judged against the batch latency target.
+ADMISSION_ROUTES = {
+    "/predict/logistic": "logistic-regression:predict",
+    "/predict/random-forest": "random-forest:predict",
+    "/predict/logistic/batch": "logistic-regression:predict-batch",
+    "/predict/random-forest/batch": "random-forest:predict-batch",
+    "/explain/logistic": "logistic-regression:explain",
+    "/explain/random-forest": "random-forest:explain",
+    "/explain/logistic/batch": "logistic-regression:explain-batch",
+    "/explain/random-forest/batch": "random-forest:explain-batch",
+}
+
+admission = AdmissionController(
+    ADMISSION_ROUTES,
+    targets={
+        name: settings.admission_batch_target_latency_ms / 1000
+        for name in ADMISSION_ROUTES.values() if name.endswith("-batch")
+    },
+    initial_limit=settings.admission_initial_limit,
+    min_limit=settings.admission_min_limit,
+    max_limit=settings.admission_max_limit,
+    target_latency=settings.admission_target_latency_ms / 1000,
+)
+
+
+@app.middleware("http")
+async def admission_control(request: Request, call_next):
+    limiter = admission.limiter_for(request.url.path)
+    if not ADMISSION_ENABLED or limiter is None:
+        return await call_next(request)
+
+    if not limiter.try_acquire():
+        logger.warning(
+            f"Request rejected | path={request.url.path} | "
+            f"limit={int(limiter.limit)}"
+        )
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Server overloaded, retry later"},
+            headers={"Retry-After": "1"},
+        )
+
+    start = time.perf_counter()
+    failed = True
+    try:
+        response = await call_next(request)
+        failed = response.status_code >= 500
+        return response
+    finally:
+        limiter.release(time.perf_counter() - start, failed=failed)
+
+
+# -----------------------------
+# Input Validation & Preparation
 # -----------------------------
+def monitor_input(*instances: HeartDiseaseInput):
+    """
+    Count a request's rows into the drift monitor. With
+    REJECT_OUT_OF_DOMAIN, a request with any out-of-domain value is
+    rejected and none of its rows are counted.
+    """
+    invalid = drift_monitor.observe_batch(
+        [data.model_dump() for data in instances],
+        reject_invalid=REJECT_OUT_OF_DOMAIN,
+    )
+
+    if invalid:
+        logger.warning(f"Out-of-domain category codes | features={invalid}")
+        if REJECT_OUT_OF_DOMAIN:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Out-of-domain values for: {', '.join(invalid)}",
+            )
+
+
 def prepare_input(data: HeartDiseaseInput):
-    X = np.array([[getattr(data, f) for f in FEATURES]])
-    return scaler.transform(X)
+    """
+    Scaled (1, n_features) matrix in a reused per-thread buffer.
+    """
+    return encoder.encode(data)
+
+
+def prepare_batch(instances: List[HeartDiseaseInput]):
+    return encoder.encode_batch(instances)
+
+
+def audit_prediction(endpoint, model_key, data, prediction, confidence,
+                     threshold, start, canary=False):
+    """
+    Record a served decision with everything needed to reproduce it: the
+    model that served it (``canary`` when the candidate answered another
+    model's endpoint), its version, engine, calibration and threshold.
+    """
+    if not AUDIT_ENABLED:
+        return
+    audit_sink.record({
+        "ts": time.time(),
+        "endpoint": endpoint,
+        "model": model_key,
+        "model_version": MODEL_VERSIONS[model_key],
+        "engine": SERVING_ENGINE,
+        "canary": canary,
+        "calibration_version": CALIBRATION_VERSIONS[model_key],
+        "threshold": threshold,
+        "inputs": data.model_dump(),
+        "prediction": prediction,
+        "confidence": confidence,
+        "latency_ms": round((time.perf_counter() - start) * 1000, 3),
+    })
+
+
+def prediction_response(model_name, prediction, probability, threshold):
+    confidence = probability if prediction == 1 else 1.0 - probability
+    return {
+        "model": model_name,
+        "prediction": prediction,
+        "confidence": round(confidence, 3),
+        "probability": round(probability, 4),
+        "threshold": threshold,
+    }
+
+
+# -----------------------------
+# Request Profiling
+# -----------------------------
+# With profiling enabled, PROFILE_REQUEST_FRACTION of /predict/* calls run
+# under cProfile; traces are read through the /admin/profile endpoints.
+PROFILING_ENABLED = settings.profiling_enabled
+ADMIN_TOKEN = settings.admin_token
+
+request_profiler = RequestProfiler(
+    fraction=settings.profile_request_fraction if PROFILING_ENABLED else 0.0,
+    max_traces=settings.profile_max_traces,
+)
 
 
 # -----------------------------
 # Logistic Regression Endpoint
 # -----------------------------
 @app.post("/predict/logistic")
-def predict_logistic(data: HeartDiseaseInput):
+@request_profiler.wrap
+def predict_logistic(data: HeartDiseaseInput,
+                     threshold: Optional[float] = ThresholdQuery):
+    start = time.perf_counter()
     logger.info("Inference started | model=logistic-regression")
+    threshold = DECISION_THRESHOLD if threshold is None else threshold
 
-    X_scaled = prepare_input(data)
-    prediction = int(lr_model.predict(X_scaled)[0])
-    confidence = float(lr_model.predict_proba(X_scaled)[0][prediction])
+    monitor_input(data)
+
+    if shadow.route_to_candidate():
+        X_scaled = prepare_input(data)
+        probs = rf_model.predict_proba(X_scaled)
+        predictions, p = classify("random-forest", probs, threshold)
+        response = prediction_response(
+            "Random Forest", int(predictions[0]), float(p[0]), threshold
+        )
+
+        logger.info(
+            f"Inference completed | model=random-forest (canary) | "
+            f"prediction={response['prediction']} | "
+            f"confidence={response['confidence']:.3f}"
+        )
+        audit_prediction("/predict/logistic", "random-forest", data,
+                         response["prediction"], response["confidence"],
+                         threshold, start, canary=True)
+        return response
+
+    cached = lookup_prediction("logistic-regression", data)
+    if cached is not None:
+        probs = cached[1][None, :]
+        # Shadowed like any other request; encoded only if sampled
+        shadow.maybe_submit(partial(prepare_input, data), probs[0],
+                            threshold)
+    else:
+        X_scaled = prepare_input(data)
+        probs = lr_model.predict_proba(X_scaled)
+        shadow.maybe_submit(X_scaled, probs[0], threshold)
+    predictions, p = classify("logistic-regression", probs, threshold)
+    response = prediction_response(
+        "Logistic Regression", int(predictions[0]), float(p[0]), threshold
+    )
 
     logger.info(
         f"Inference completed | model=logistic-regression | "
-        f"prediction={prediction} | confidence={round(confidence, 3)}"
+        f"prediction={response['prediction']} | "
+        f"confidence={response['confidence']}"
     )
-
-    return {
-        "model": "Logistic Regression",
-        "prediction": prediction,
-        "confidence": round(confidence, 3),
-    }
+    audit_prediction("/predict/logistic", "logistic-regression", data,
+                     response["prediction"], response["confidence"],
+                     threshold, start)
+    return response
 
 
 # -----------------------------
 # Random Forest Endpoint
 # -----------------------------
 @app.post("/predict/random-forest")
-def predict_random_forest(data: HeartDiseaseInput):
+@request_profiler.wrap
+def predict_random_forest(data: HeartDiseaseInput,
+                          threshold: Optional[float] = ThresholdQuery):
+    start = time.perf_counter()
     logger.info("Inference started | model=random-forest")
+    threshold = DECISION_THRESHOLD if threshold is None else threshold
 
     if rf_model is None:
         logger.error("Random Forest model not loaded")
         raise HTTPException(status_code=500, detail="Model not available")
 
-    try:
-        X_scaled = prepare_input(data)
+    monitor_input(data)
 
-        probs = rf_model.predict_proba(X_scaled)[0]
-        prediction = int(probs.argmax())
-        confidence = float(probs[prediction])
+    try:
+        cached = lookup_prediction("random-forest", data)
+        if cached is not None:
+            probs = cached[1][None, :]
+        else:
+            X_scaled = prepare_input(data)
+            probs = rf_model.predict_proba(X_scaled)
+        predictions, p = classify("random-forest", probs, threshold)
+        response = prediction_response(
+            "Random Forest", int(predictions[0]), float(p[0]), threshold
+        )
 
         logger.info(
             f"Inference completed | model=random-forest | "
-            f"prediction={prediction} | confidence={confidence:.3f}"
+            f"prediction={response['prediction']} | "
+            f"confidence={response['confidence']:.3f}"
         )
-
-        return {
-            "model": "Random Forest",
-            "prediction": prediction,
-            "confidence": round(confidence, 3),
-        }
+        audit_prediction("/predict/random-forest", "random-forest", data,
+                         response["prediction"], response["confidence"],
+                         threshold, start)
+        return response
     except Exception:
         logger.exception("Random Forest inference failed")
         raise HTTPException(
             status_code=500,
             detail="Inference failed"
         )
+
+
+# -----------------------------
+# Batch Endpoints
+# -----------------------------
+def batch_response(endpoint, model_key, model_name, instances, probs,
+                   threshold, start):
+    predictions, calibrated = classify(model_key, probs, threshold)
+
+    results = []
+    for data, prediction, p in zip(instances, predictions.tolist(),
+                                   calibrated.tolist()):
+        confidence = p if prediction == 1 else 1.0 - p
+        audit_prediction(endpoint, model_key, data, prediction, confidence,
+                         threshold, start)
+        results.append({
+            "prediction": prediction,
+            "confidence": round(confidence, 3),
+            "probability": round(p, 4),
+        })
+
+    logger.info(
+        f"Batch inference completed | model={model_key} | "
+        f"size={len(results)}"
+    )
+    return {"model": model_name, "threshold": threshold,
+            "predictions": results}
+
+
+@app.post("/predict/logistic/batch")
+@request_profiler.wrap
+def predict_logistic_batch(batch: HeartDiseaseBatchInput,
+                           threshold: Optional[float] = ThresholdQuery):
+    start = time.perf_counter()
+    threshold = DECISION_THRESHOLD if threshold is None else threshold
+
+    monitor_input(*batch.instances)
+
+    X_scaled = prepare_batch(batch.instances)
+    probs = lr_model.predict_proba(X_scaled)
+
+    return batch_response("/predict/logistic", "logistic-regression",
+                          "Logistic Regression", batch.instances, probs,
+                          threshold, start)
+
+
+@app.post("/predict/random-forest/batch")
+@request_profiler.wrap
+def predict_random_forest_batch(batch: HeartDiseaseBatchInput,
+                                threshold: Optional[float] = ThresholdQuery):
+    start = time.perf_counter()
+    threshold = DECISION_THRESHOLD if threshold is None else threshold
+
+    monitor_input(*batch.instances)
+
+    try:
+        X_scaled = prepare_batch(batch.instances)
+        probs = rf_model.predict_proba(X_scaled)
+    except Exception:
+        logger.exception("Random Forest batch inference failed")
+        raise HTTPException(status_code=500, detail="Inference failed")
+
+    return batch_response("/predict/random-forest", "random-forest",
+                          "Random Forest", batch.instances, probs,
+                          threshold, start)
+
+
+# -----------------------------
+# Explanation Endpoints
+# -----------------------------
+# Logistic regression contributions are exact, in log-odds; random forest
+# contributions are a tree-path decomposition, in positive-class
+# probability. In both, base_value + sum(contributions) equals model_output,
+# the uncalibrated score; prediction and probability are calibrated and
+# thresholded like /predict.
+rf_explainer = as_forest_engine(rf_model)
+
+
+def explain_logistic(X_scaled):
+    base, contributions = logistic_contributions(lr_model, X_scaled)
+    return ("logistic-regression", "Logistic Regression", "log-odds", base,
+            contributions, lr_model.predict_proba(X_scaled))
+
+
+def explain_random_forest(X_scaled):
+    base, contributions = forest_contributions(rf_explainer, X_scaled)
+    return ("random-forest", "Random Forest", "probability", base,
+            contributions, rf_explainer.predict_proba(X_scaled))
+
+
+EXPLAINERS = {
+    "logistic": explain_logistic,
+    "random-forest": explain_random_forest,
+}
+
+
+def check_explainer(model: str) -> None:
+    if model not in EXPLAINERS:
+        raise HTTPException(status_code=404, detail=f"Unknown model: {model}")
+
+
+def explain(model: str, X_scaled, threshold=None):
+    check_explainer(model)
+    threshold = DECISION_THRESHOLD if threshold is None else threshold
+
+    model_key, name, units, base, contributions, probs = \
+        EXPLAINERS[model](X_scaled)
+    # float32 engines: round in float64 so JSON gets the short decimals
+    contributions = np.asarray(contributions, dtype=np.float64)
+    predictions, calibrated = classify(model_key, probs, threshold)
+    outputs = base + contributions.sum(axis=1)
+
+    explanations = [
+        {
+            "prediction": prediction,
+            "probability": round(p, 4),
+            "model_output": round(output, 4),
+            "contributions": dict(zip(FEATURES, np.round(c, 4).tolist())),
+        }
+        for prediction, p, output, c in zip(
+            predictions.tolist(), calibrated.tolist(), outputs.tolist(),
+            contributions,
+        )
+    ]
+    logger.info(
+        f"Explanation completed | model={model} | size={len(explanations)}"
+    )
+    return {
+        "model": name,
+        "units": units,
+        "base_value": round(base, 4),
+        "threshold": threshold,
+        "explanations": explanations,
+    }
+
+
+# Inputs are monitored (and out-of-domain rows rejected) and decisions
+# thresholded exactly as on /predict, so the explained decision is the
+# served one.
+@app.post("/explain/{model}")
+def explain_single(model: str, data: HeartDiseaseInput,
+                   threshold: Optional[float] = ThresholdQuery):
+    check_explainer(model)
+    monitor_input(data)
+    response = explain(model, prepare_input(data), threshold)
+    explanation = response.pop("explanations")[0]
+    return {**response, **explanation}
+
+
+@app.post("/explain/{model}/batch")
+def explain_batch(model: str, batch: HeartDiseaseBatchInput,
+                  threshold: Optional[float] = ThresholdQuery):
+    check_explainer(model)
+    monitor_input(*batch.instances)
+    return explain(model, prepare_batch(batch.instances), threshold)
+
+
+# -----------------------------
+# Model Reload
+# -----------------------------
+# Models are loaded once at import. reload_model swaps one in a running
+# process (e.g. after retraining): every serving reference to the model
+# is replaced and its lookup table is rebuilt for the new version, so a
+# table built for the previous model is never served. Requests in flight
+# during the swap may be answered by either model.
+def reload_model(model_key, model, version):
+    """
+    Serve ``model`` as ``model_key`` from now on. ``version`` identifies
+    the new artifact; with calibration enabled its table must have been
+    fitted for that version.
+    """
+    global lr_model, rf_model, rf_explainer
+
+    # Fails (ValueError) before anything is swapped
+    path = CALIBRATION_PATHS[model_key]
+    calibrator = load_calibrators(
+        path if CALIBRATION_ENABLED else None, {model_key: version}
+    )[model_key]
+
+    if model_key == "logistic-regression":
+        lr_model = model
+    else:
+        rf_model = model
+        rf_explainer = as_forest_engine(model)
+    MODELS[model_key] = model
+    binary_server.models[MODEL_IDS.index(model_key)] = model
+    if model_key == shadow.labels[1]:
+        shadow.candidate_model = model
+
+    calibrators[model_key] = calibrator
+    CALIBRATION_VERSIONS[model_key] = (
+        artifact_version(path)
+        if CALIBRATION_ENABLED and path.exists() else "identity"
+    )
+    MODEL_VERSIONS[model_key] = version
+
+    if LOOKUP_ENABLED:
+        build_lookup_tables()
+    logger.info(f"Model reloaded | model={model_key} | version={version}")
+
+
+# -----------------------------
+# Profiling Endpoints (admin)
+# -----------------------------
+# Disabled (404) unless PROFILING_ENABLED; requests must carry the
+# configured ADMIN_TOKEN in the X-Admin-Token header.
+PROFILE_MAX_SECONDS = settings.profile_max_seconds
+
+profile_session = threading.Lock()
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    if not PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_admin_token is None or not hmac.compare_digest(
+        x_admin_token.encode(), ADMIN_TOKEN.encode()
+    ):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+
+@app.get("/admin/profile", dependencies=[Depends(require_admin)])
+async def profile_stacks(
+    seconds: float = Query(min(5.0, PROFILE_MAX_SECONDS), gt=0,
+                           le=PROFILE_MAX_SECONDS),
+    interval_ms: float = Query(settings.profile_interval_ms, gt=0, le=1000),
+    idle: bool = Query(False, description="Keep threads waiting for work"),
+):
+    """
+    Sample every thread's stack for ``seconds``; collapsed-stack text for
+    flamegraph.pl / speedscope.
+    """
+    if not profile_session.acquire(blocking=False):
+        raise HTTPException(status_code=409,
+                            detail="A profile is already running")
+    try:
+        # The event loop stays free (and is sampled) while this waits
+        sampler = StackSampler(interval=interval_ms / 1000, idle=idle)
+        await run_in_threadpool(sampler.run, seconds)
+    finally:
+        profile_session.release()
+
+    logger.info(
+        f"Profile captured | seconds={seconds} | samples={sampler.samples} | "
+        f"stacks={len(sampler.stacks)}"
+    )
+    return PlainTextResponse(
+        sampler.collapsed(),
+        headers={
+            "Content-Disposition":
+                f'attachment; filename="profile-{int(time.time())}.folded"',
+            "X-Profile-Samples": str(sampler.samples),
+        },
+    )
+
+
+@app.get("/admin/profile/requests", dependencies=[Depends(require_admin)])
+def request_traces(top: int = Query(10, ge=1, le=100)):
+    return {
+        "fraction": request_profiler.fraction,
+        "traces": [
+            trace.summary(top)
+            for trace in reversed(list(request_profiler.traces))
+        ],
+    }
+
+
+@app.get("/admin/profile/requests/{trace_id}",
+         dependencies=[Depends(require_admin)])
+def request_trace(trace_id: int):
+    """
+    One trace as a cProfile stats file (``python -m pstats``, snakeviz).
+    """
+    trace = request_profiler.get(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="Unknown trace")
+    return Response(
+        trace.dump(),
+        media_type="application/octet-stream",
+        headers={
+            "Content-Disposition":
+                f'attachment; filename="{trace.endpoint}-{trace_id}.prof"',
+        },
+    )
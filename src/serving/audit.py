@@ -0,0 +1,260 @@
+"""
+Asynchronous prediction audit log.
+
+Prediction records are appended to an in-memory buffer (O(1), no I/O on
+the request path) and flushed in batches by a background thread into
+rotating, append-only gzip NDJSON segments. When the buffer is full,
+records are dropped according to a bounded drop policy and counted, so
+request latency is never affected by the audit sink.
+
+Replay recorded traffic against a running API:
+    python -m src.serving.audit logs/audit --url http://localhost:8000
+"""
+
+import os
+import gzip
+import json
+import time
+import argparse
+import threading
+import urllib.request
+from pathlib import Path
+from collections import deque
+
+import numpy as np
+from prometheus_client import Counter
+
+AUDIT_WRITTEN = Counter(
+    "audit_records_written_total",
+    "Prediction audit records flushed to disk",
+)
+AUDIT_DROPPED = Counter(
+    "audit_records_dropped_total",
+    "Prediction audit records dropped because the buffer was full",
+)
+
+DROP_POLICIES = ("newest", "oldest")
+
+# Single-row endpoint of each serving model
+MODEL_ENDPOINTS = {
+    "logistic-regression": "/predict/logistic",
+    "random-forest": "/predict/random-forest",
+}
+
+
+# -----------------------------
+# Audit Sink
+# -----------------------------
+class AuditSink:
+    """
+    Bounded in-memory buffer flushed to rotating gzip NDJSON segments.
+
+    drop_policy="newest" discards incoming records when the buffer is
+    full; "oldest" evicts the oldest buffered record instead.
+    """
+
+    def __init__(
+        self,
+        directory,
+        batch_size: int = 256,
+        flush_interval: float = 1.0,
+        max_buffer: int = 10000,
+        segment_records: int = 100000,
+        drop_policy: str = "newest",
+    ):
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"drop_policy must be one of {DROP_POLICIES}")
+
+        self.directory = Path(directory)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.segment_records = segment_records
+        self.drop_policy = drop_policy
+
+        self.dropped = 0
+        self.written = 0
+
+        self._buffer = deque()
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+        self._segment = None
+        self._segment_count = 0
+        self._segment_seq = 0
+
+    # Request path
+    def record(self, entry: dict) -> bool:
+        """
+        Buffer one record. Never blocks on I/O; returns False if a
+        record was dropped.
+        """
+        with self._lock:
+            if len(self._buffer) >= self.max_buffer:
+                self.dropped += 1
+                AUDIT_DROPPED.inc()
+                if self.drop_policy == "newest":
+                    return False
+                self._buffer.popleft()
+                self._buffer.append(entry)
+                return False
+
+            self._buffer.append(entry)
+            full_batch = len(self._buffer) >= self.batch_size
+
+        if full_batch:
+            self._wakeup.set()
+        return True
+
+    # Background flushing
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="audit-sink", daemon=True
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._wakeup.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self) -> int:
+        with self._lock:
+            batch = list(self._buffer)
+            self._buffer.clear()
+
+        if not batch:
+            return 0
+
+        payload = "".join(
+            json.dumps(r, separators=(",", ":")) + "\n" for r in batch
+        ).encode()
+
+        with self._write_lock:
+            if (
+                self._segment is None
+                or self._segment_count >= self.segment_records
+            ):
+                self._rotate()
+
+            # Each flush appends one gzip member; concatenated members
+            # are a valid gzip stream.
+            with open(self._segment, "ab") as f:
+                f.write(gzip.compress(payload))
+            self._segment_count += len(batch)
+
+        self.written += len(batch)
+        AUDIT_WRITTEN.inc(len(batch))
+        return len(batch)
+
+    def _rotate(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._segment_seq += 1
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime())
+        self._segment = self.directory / (
+            f"audit-{stamp}-{os.getpid()}-{self._segment_seq:05d}.ndjson.gz"
+        )
+        self._segment_count = 0
+
+
+# -----------------------------
+# Reading & Replay
+# -----------------------------
+def iter_records(directory):
+    """
+    Yield audit records from every segment in ``directory``, oldest first.
+    """
+    for segment in sorted(Path(directory).glob("audit-*.ndjson.gz")):
+        with gzip.open(segment, "rt") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _http_post(base_url: str):
+    def post(path, payload):
+        request = urllib.request.Request(
+            base_url.rstrip("/") + path,
+            data=json.dumps(payload).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request) as response:
+            return json.loads(response.read())
+    return post
+
+
+def replay_path(record: dict) -> str:
+    """
+    Endpoint reproducing a recorded decision: the single-row endpoint of
+    the model that served it (canary and batch records included) at the
+    recorded threshold.
+    """
+    path = MODEL_ENDPOINTS.get(record.get("model"), record["endpoint"])
+    if record.get("threshold") is not None:
+        path += f"?threshold={record['threshold']}"
+    return path
+
+
+def replay(records, post, limit: int = None) -> dict:
+    """
+    Re-send recorded inputs through ``post(path, payload)`` and report
+    latency percentiles, throughput and agreement with the logged
+    predictions. Agreement is only meaningful against a server with the
+    recorded model and calibration versions.
+    """
+    latencies = []
+    agree = 0
+
+    start = time.perf_counter()
+    for i, record in enumerate(records):
+        if limit is not None and i >= limit:
+            break
+        t0 = time.perf_counter()
+        result = post(replay_path(record), record["inputs"])
+        latencies.append(time.perf_counter() - t0)
+        agree += int(result.get("prediction") == record.get("prediction"))
+    elapsed = time.perf_counter() - start
+
+    if not latencies:
+        return {"requests": 0}
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        "requests": len(latencies),
+        "throughput_rps": round(len(latencies) / elapsed, 2),
+        "p50_ms": round(float(np.percentile(latencies_ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(latencies_ms, 95)), 3),
+        "p99_ms": round(float(np.percentile(latencies_ms, 99)), 3),
+        "agreement": round(agree / len(latencies), 4),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Replay prediction audit logs against the API"
+    )
+    parser.add_argument("directory", help="Audit log directory")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--limit", type=int, default=None)
+    args = parser.parse_args()
+
+    report = replay(
+        iter_records(args.directory), _http_post(args.url), limit=args.limit
+    )
+    print(json.dumps(report, indent=2))
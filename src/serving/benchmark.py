@@ -0,0 +1,297 @@
+"""
+HTTP throughput benchmark for the prediction API.
+
+Compares the single-process ``uvicorn src.serving.app:app`` setup with the
+multi-worker launcher by starting each on its own port, waiting for
+/ready, and driving closed-loop load from several client processes.
+
+With ``--frontends`` it instead starts one API process with the binary
+frontend enabled and compares JSON/HTTP against the binary protocol, for
+single rows and for batches, reporting rows scored per second.
+
+Usage:
+    python -m src.serving.benchmark --duration 10 --clients 8
+    python -m src.serving.benchmark --audit-dir logs/audit   # replay inputs
+    python -m src.serving.benchmark --frontends --batch-size 64
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import http.client
+import urllib.request
+from collections import deque
+from itertools import cycle
+from multiprocessing import Pool
+
+import numpy as np
+
+SAMPLE_REQUEST = "tests/sample_request.json"
+
+
+# -----------------------------
+# Load Generation
+# -----------------------------
+def _client_loop(args):
+    host, port, path, payloads, duration = args
+    conn = http.client.HTTPConnection(host, port)
+    headers = {"Content-Type": "application/json"}
+    bodies = cycle([json.dumps(p) for p in payloads])
+
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        conn.request("POST", path, body=next(bodies), headers=headers)
+        response = conn.getresponse()
+        response.read()
+        if response.status == 200:
+            latencies.append(time.perf_counter() - t0)
+        else:
+            errors += 1
+    conn.close()
+    return latencies, errors
+
+
+def run_load(
+    port: int,
+    payloads: list,
+    path: str = "/predict/logistic",
+    clients: int = 8,
+    duration: float = 10.0,
+    host: str = "127.0.0.1",
+    rows_per_request: int = 1,
+) -> dict:
+    """
+    Closed-loop load from ``clients`` processes for ``duration`` seconds.
+    """
+    with Pool(clients) as pool:
+        results = pool.map(
+            _client_loop,
+            [(host, port, path, payloads, duration)] * clients,
+        )
+
+    return summarise(results, duration, rows_per_request)
+
+
+def summarise(results: list, duration: float, rows_per_request: int = 1):
+    latencies = np.concatenate([np.array(r[0]) for r in results]) * 1000
+    errors = sum(r[1] for r in results)
+
+    # Every request failed: no latency to report
+    if latencies.size == 0:
+        return {"requests": 0, "errors": errors, "throughput_rps": 0.0,
+                "rows_per_s": 0.0, "p50_ms": None, "p99_ms": None}
+
+    return {
+        "requests": int(latencies.size),
+        "errors": errors,
+        "throughput_rps": round(latencies.size / duration, 1),
+        "rows_per_s": round(latencies.size * rows_per_request / duration, 1),
+        "p50_ms": round(float(np.percentile(latencies, 50)), 2),
+        "p99_ms": round(float(np.percentile(latencies, 99)), 2),
+    }
+
+
+def report_errors(report: dict) -> bool:
+    """
+    Print setups with failed requests to stderr; True if any setup
+    completed no request at all.
+    """
+    for name, stats in report.items():
+        if stats["errors"]:
+            print(f"{name}: {stats['errors']} failed requests "
+                  f"({stats['requests']} succeeded)", file=sys.stderr)
+    return any(stats["requests"] == 0 for stats in report.values())
+
+
+def _binary_client_loop(args):
+    from src.serving.binary import BinaryClient
+
+    host, port, model, X, duration, window = args
+    sent = deque()
+    deadline = time.perf_counter() + duration
+
+    def frames():
+        while time.perf_counter() < deadline:
+            sent.append(time.perf_counter())
+            yield X
+
+    # Latency is measured from send to response, including pipelining
+    latencies = []
+    with BinaryClient(host, port) as client:
+        for _ in client.stream(model, frames(), window=window):
+            latencies.append(time.perf_counter() - sent.popleft())
+    return latencies, 0
+
+
+def run_binary_load(
+    port: int,
+    X,
+    model: str = "logistic-regression",
+    clients: int = 8,
+    duration: float = 10.0,
+    window: int = 1,
+    host: str = "127.0.0.1",
+) -> dict:
+    """
+    Closed-loop load on the binary frontend, ``window`` frames in flight
+    per client, each frame carrying the rows of ``X``.
+    """
+    with Pool(clients) as pool:
+        results = pool.map(
+            _binary_client_loop,
+            [(host, port, model, X, duration, window)] * clients,
+        )
+    return summarise(results, duration, rows_per_request=len(X))
+
+
+def wait_ready(port: int, timeout: float = 60.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(
+                f"http://127.0.0.1:{port}/ready", timeout=1
+            ) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise TimeoutError(f"Server on port {port} did not become ready")
+
+
+# -----------------------------
+# Setups Under Test
+# -----------------------------
+def server_commands(workers: int) -> dict:
+    return {
+        "single-process": lambda port: [
+            sys.executable, "-m", "uvicorn", "src.serving.app:app",
+            "--port", str(port), "--log-level", "warning",
+        ],
+        f"launcher-{workers}-workers": lambda port: [
+            sys.executable, "-m", "src.serving.launcher",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning",
+        ],
+    }
+
+
+def benchmark(commands: dict, payloads: list, base_port: int = 8100,
+              **load_kwargs) -> dict:
+    report = {}
+    env = {"AUDIT_ENABLED": "false", "ADMISSION_ENABLED": "false"}
+
+    for offset, (name, command) in enumerate(commands.items()):
+        port = base_port + offset
+        process = subprocess.Popen(
+            command(port),
+            env={**os.environ, **env},
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_ready(port)
+            report[name] = run_load(port, payloads, **load_kwargs)
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+    return report
+
+
+def compare_frontends(payloads: list, batch_size: int = 64,
+                      port: int = 8100, binary_port: int = 9100,
+                      clients: int = 8, duration: float = 10.0,
+                      window: int = 32) -> dict:
+    """
+    HTTP vs binary frontend on the same server process and model.
+    """
+    from src.serving.features import FEATURES
+
+    rows = np.array([[p[f] for f in FEATURES] for p in payloads], dtype=float)
+    batch = np.resize(rows, (batch_size, len(FEATURES)))
+    batch_payload = {"instances": [
+        dict(zip(FEATURES, row)) for row in batch.tolist()
+    ]}
+
+    env = {"AUDIT_ENABLED": "false", "ADMISSION_ENABLED": "false",
+           "BINARY_PORT": str(binary_port)}
+    process = subprocess.Popen(
+        server_commands(1)["single-process"](port),
+        env={**os.environ, **env},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    load = {"clients": clients, "duration": duration}
+    try:
+        wait_ready(port)
+        report = {
+            "http-single": run_load(port, payloads, **load),
+            "binary-single": run_binary_load(binary_port, rows[:1], **load),
+        }
+        report[f"http-batch-{batch_size}"] = run_load(
+            port, [batch_payload], path="/predict/logistic/batch",
+            rows_per_request=batch_size, **load
+        )
+        report[f"binary-stream-{batch_size}"] = run_binary_load(
+            binary_port, batch, window=window, **load
+        )
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+    return report
+
+
+def load_payloads(audit_dir: str = None, limit: int = 1000) -> list:
+    if audit_dir:
+        from src.serving.audit import iter_records
+        payloads = []
+        for record in iter_records(audit_dir):
+            payloads.append(record["inputs"])
+            if len(payloads) >= limit:
+                break
+        if payloads:
+            return payloads
+    with open(SAMPLE_REQUEST) as f:
+        return [json.load(f)]
+
+
+if __name__ == "__main__":
+    from src.serving.launcher import available_cpus
+
+    parser = argparse.ArgumentParser(description="API throughput benchmark")
+    parser.add_argument("--workers", type=int, default=available_cpus())
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--path", default="/predict/logistic")
+    parser.add_argument("--audit-dir", default=None)
+    parser.add_argument("--frontends", action="store_true",
+                        help="Compare HTTP with the binary frontend")
+    parser.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args()
+
+    if args.frontends:
+        report = compare_frontends(
+            load_payloads(args.audit_dir),
+            batch_size=args.batch_size,
+            clients=args.clients,
+            duration=args.duration,
+        )
+        print(json.dumps(report, indent=2))
+        sys.exit(1 if report_errors(report) else 0)
+
+    report = benchmark(
+        server_commands(args.workers),
+        load_payloads(args.audit_dir),
+        path=args.path,
+        clients=args.clients,
+        duration=args.duration,
+    )
+    print(json.dumps(report, indent=2))
+    sys.exit(1 if report_errors(report) else 0)
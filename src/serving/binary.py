@@ -0,0 +1,335 @@
+"""
+Binary inference frontend for service-to-service scoring.
+
+A length-prefixed protocol over plain TCP (asyncio), served on its own
+port next to the HTTP API and scoring with the same loaded scaler, models
+and encoder. Requests carry a packed little-endian float64 feature matrix,
+so there is no JSON parsing, pydantic validation or per-row Python
+objects on the hot path.
+
+Frames (all integers little-endian):
+
+    request   = header(request_id u32, model u8, n_features u8, n_rows u16)
+                + n_rows * n_features float64 (row-major, FEATURES order)
+    response  = header(request_id u32, status u8, model u8, count u16)
+                + OK:    count u8 predictions + count * 2 float64 probs
+                         (calibrated and thresholded like the HTTP API)
+                + error: count bytes of UTF-8 message
+
+A connection may pipeline any number of request frames without waiting
+for replies (streaming batches); responses are written in request order.
+Drift monitoring and the prediction audit log remain HTTP-only.
+
+Usage:
+    python -m src.serving.binary --port 9000
+"""
+
+import time
+import struct
+import asyncio
+import logging
+import argparse
+import socket
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from prometheus_client import Counter, Histogram
+
+logger = logging.getLogger("heart-disease-api")
+
+REQUEST_HEADER = struct.Struct("<IBBH")
+RESPONSE_HEADER = struct.Struct("<IBBH")
+
+MODEL_IDS = ("logistic-regression", "random-forest")
+
+STATUS_OK = 0
+STATUS_BAD_REQUEST = 1
+STATUS_ERROR = 2
+
+BINARY_REQUESTS = Counter(
+    "binary_requests_total",
+    "Frames handled by the binary inference frontend",
+    ["model", "status"],
+)
+BINARY_ROWS = Counter(
+    "binary_rows_total",
+    "Feature rows scored by the binary inference frontend",
+    ["model"],
+)
+BINARY_LATENCY = Histogram(
+    "binary_request_latency_seconds",
+    "Binary frontend scoring latency per frame",
+    ["model"],
+)
+
+
+class ProtocolError(ValueError):
+    """
+    Malformed frame; reported to the client with STATUS_BAD_REQUEST.
+    """
+
+
+# -----------------------------
+# Encoding
+# -----------------------------
+def encode_request(request_id: int, model: int, X) -> bytes:
+    X = np.ascontiguousarray(X, dtype="<f8")
+    n_rows, n_features = X.shape
+    return REQUEST_HEADER.pack(request_id, model, n_features, n_rows) \
+        + X.tobytes()
+
+
+def encode_response(request_id: int, model: int, predictions, probs) -> bytes:
+    return (
+        RESPONSE_HEADER.pack(request_id, STATUS_OK, model, len(predictions))
+        + np.asarray(predictions, dtype=np.uint8).tobytes()
+        + np.ascontiguousarray(probs, dtype="<f8").tobytes()
+    )
+
+
+def encode_error(request_id: int, model: int, status: int,
+                 message: str) -> bytes:
+    body = message.encode()[:0xFFFF]
+    return RESPONSE_HEADER.pack(request_id, status, model, len(body)) + body
+
+
+# -----------------------------
+# Server
+# -----------------------------
+class BinaryServer:
+    """
+    asyncio server scoring packed feature matrices.
+
+    Frames with at most ``inline_rows`` rows are scored directly on the
+    event loop (cheaper than a thread hop for the NumPy engines); larger
+    batches are scored on a ``threads``-sized pool so they do not stall
+    other connections or the HTTP endpoints sharing the loop.
+    """
+
+    def __init__(self, models: dict, encoder, max_batch: int = 256,
+                 inline_rows: int = 8, threads: int = 1, decide=None):
+        self.models = [models[key] for key in MODEL_IDS]
+        self.encoder = encoder
+        self.n_features = len(encoder.features)
+        self.max_batch = min(max_batch, encoder.max_batch)
+        self.inline_rows = inline_rows
+        # (model_key, probs) -> (predictions, calibrated positive prob)
+        self.decide = decide
+        self.threads = threads
+        self._executor = None
+        self._server = None
+
+    def respond(self, request_id: int, model: int, payload: bytes):
+        """
+        Return (response frame, rows scored) without recording metrics;
+        warm-up drives the frontend through this.
+        """
+        X = self.encoder.encode_matrix(
+            np.frombuffer(payload, dtype="<f8").reshape(-1, self.n_features)
+        )
+        probs = self.models[model].predict_proba(X)
+        if self.decide is None:
+            predictions = probs.argmax(axis=1)
+        else:
+            predictions, p = self.decide(MODEL_IDS[model], probs)
+            probs = np.column_stack([1.0 - p, p])
+        return (encode_response(request_id, model, predictions, probs),
+                len(predictions))
+
+    def score(self, request_id: int, model: int, payload: bytes) -> bytes:
+        start = time.perf_counter()
+        response, rows = self.respond(request_id, model, payload)
+
+        name = MODEL_IDS[model]
+        BINARY_LATENCY.labels(name).observe(time.perf_counter() - start)
+        BINARY_ROWS.labels(name).inc(rows)
+        BINARY_REQUESTS.labels(name, "ok").inc()
+        return response
+
+    def _validate(self, model: int, n_features: int, n_rows: int) -> None:
+        if model >= len(MODEL_IDS):
+            raise ProtocolError(f"Unknown model id {model}")
+        if n_features != self.n_features:
+            raise ProtocolError(
+                f"Expected {self.n_features} features, got {n_features}"
+            )
+        if not 0 < n_rows <= self.max_batch:
+            raise ProtocolError(
+                f"Batch of {n_rows} rows outside 1..{self.max_batch}"
+            )
+
+    @staticmethod
+    async def _discard(reader, size: int) -> None:
+        """
+        Skip a rejected frame's payload without buffering all of it.
+        """
+        while size:
+            size -= len(await reader.readexactly(min(size, 1 << 16)))
+
+    async def _score_frame(self, loop, request_id, model, n_rows, payload):
+        try:
+            if n_rows <= self.inline_rows:
+                return self.score(request_id, model, payload)
+            return await loop.run_in_executor(
+                self._executor, self.score, request_id, model, payload
+            )
+        except Exception:
+            logger.exception("Binary inference failed")
+            BINARY_REQUESTS.labels(MODEL_IDS[model], "error").inc()
+            return encode_error(request_id, model, STATUS_ERROR,
+                                "Inference failed")
+
+    async def handle(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(REQUEST_HEADER.size)
+                except asyncio.IncompleteReadError:
+                    break
+
+                request_id, model, n_features, n_rows = \
+                    REQUEST_HEADER.unpack(header)
+                size = n_rows * n_features * 8
+
+                try:
+                    self._validate(model, n_features, n_rows)
+                except ProtocolError as e:
+                    await self._discard(reader, size)
+                    BINARY_REQUESTS.labels("unknown", "bad_request").inc()
+                    response = encode_error(request_id, model,
+                                            STATUS_BAD_REQUEST, str(e))
+                else:
+                    payload = await reader.readexactly(size)
+                    response = await self._score_frame(
+                        loop, request_id, model, n_rows, payload
+                    )
+
+                writer.write(response)
+                # Only wait for the socket when the client stops reading
+                if writer.transport.get_write_buffer_size() > 1 << 20:
+                    await writer.drain()
+        except asyncio.IncompleteReadError:
+            logger.warning("Binary client disconnected mid-frame")
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "0.0.0.0", port: int = 9000):
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.threads, thread_name_prefix="binary"
+        )
+        # reuse_port lets every forked launcher worker bind the same port
+        self._server = await asyncio.start_server(
+            self.handle, host, port, reuse_port=True
+        )
+        for sock in self._server.sockets:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        logger.info(f"Binary inference frontend listening on {host}:{port}")
+        return self._server
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+# -----------------------------
+# Client
+# -----------------------------
+class BinaryClient:
+    """
+    Blocking client for the binary frontend.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 9000,
+                 timeout: float = 10.0):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.file = self.sock.makefile("rb")
+        self._next_id = 0
+
+    def _send(self, model: str, X) -> int:
+        request_id = self._next_id
+        self._next_id = (self._next_id + 1) & 0xFFFFFFFF
+        self.sock.sendall(
+            encode_request(request_id, MODEL_IDS.index(model), np.atleast_2d(X))
+        )
+        return request_id
+
+    def _receive(self):
+        request_id, status, _, count = RESPONSE_HEADER.unpack(
+            self._read(RESPONSE_HEADER.size)
+        )
+        if status != STATUS_OK:
+            raise RuntimeError(self._read(count).decode())
+        predictions = np.frombuffer(self._read(count), dtype=np.uint8)
+        probs = np.frombuffer(self._read(count * 16), dtype="<f8")
+        return request_id, predictions, probs.reshape(count, 2)
+
+    def _read(self, n: int) -> bytes:
+        data = self.file.read(n)
+        if len(data) != n:
+            raise ConnectionError("Binary server closed the connection")
+        return data
+
+    def predict(self, model: str, X):
+        """
+        Return (predictions, probabilities) for the rows of ``X``.
+        """
+        self._send(model, X)
+        return self._receive()[1:]
+
+    def stream(self, model: str, batches, window: int = 32):
+        """
+        Pipeline ``batches`` with up to ``window`` frames in flight and
+        yield (predictions, probabilities) per batch, in order.
+        """
+        in_flight = 0
+        for X in batches:
+            if in_flight == window:
+                yield self._receive()[1:]
+                in_flight -= 1
+            self._send(model, X)
+            in_flight += 1
+        for _ in range(in_flight):
+            yield self._receive()[1:]
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# -----------------------------
+# Standalone Entry Point
+# -----------------------------
+def serve(host: str, port: int) -> None:
+    """
+    Serve only the binary frontend from the API's loaded artifacts.
+    """
+    from src.serving.app import binary_server
+
+    async def main():
+        await (await binary_server.start(host, port)).serve_forever()
+
+    asyncio.run(main())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Binary inference frontend")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=9000)
+    args = parser.parse_args()
+
+    serve(args.host, args.port)
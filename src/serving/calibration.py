@@ -0,0 +1,90 @@
+"""
+Calibrated probabilities and decision thresholds at serving time.
+
+Calibrators are the interpolation tables exported by the training-time
+calibration stage (``models/calibration.json``) and are applied to a whole
+column of positive-class probabilities with one ``np.interp``. The
+decision is ``calibrated_probability >= threshold``, so moving the
+operating point never needs another model call.
+
+Every table names the model version (``artifact_version`` of the model
+file) it was fitted for; loading it next to any other model fails.
+"""
+
+import json
+import logging
+import hashlib
+
+import numpy as np
+
+logger = logging.getLogger("heart-disease-api")
+
+
+class Calibrator:
+    """
+    Monotone piecewise-linear map from model to calibrated probability.
+    """
+
+    def __init__(self, x, y, method: str = "identity"):
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        self.method = method
+
+    @classmethod
+    def identity(cls):
+        return cls([0.0, 1.0], [0.0, 1.0])
+
+    def __call__(self, p):
+        return np.interp(p, self.x, self.y)
+
+
+def artifact_version(path) -> str:
+    """
+    Short content hash identifying a model artifact.
+    """
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:12]
+
+
+def load_calibrators(path, versions: dict) -> dict:
+    """
+    Calibrator per model key in ``versions`` (key -> model version).
+    With ``path`` None (calibration disabled) every model gets the
+    identity; a missing file is logged and also falls back to the
+    identity. Otherwise each model needs a table fitted for its version.
+    """
+    if path is None:
+        return {key: Calibrator.identity() for key in versions}
+    if not path.exists():
+        logger.warning(
+            f"Calibration enabled but {path} not found, serving "
+            f"uncalibrated probabilities for {sorted(versions)}"
+        )
+        return {key: Calibrator.identity() for key in versions}
+
+    with open(path) as f:
+        tables = json.load(f)
+
+    calibrators = {}
+    for key, version in versions.items():
+        table = tables.get(key)
+        if table is None:
+            raise ValueError(f"{path} has no calibration table for {key}")
+        if table.get("model_version") != version:
+            raise ValueError(
+                f"{path}: the {key} table was fitted for model version "
+                f"{table.get('model_version')}, the loaded model is "
+                f"{version}; re-run the calibration stage"
+            )
+        calibrators[key] = Calibrator(table["x"], table["y"],
+                                      table["method"])
+    return calibrators
+
+
+def decide(calibrator: Calibrator, probs, threshold: float):
+    """
+    Return (predictions, calibrated positive-class probabilities) for an
+    (n, 2) matrix of model probabilities.
+    """
+    p = calibrator(probs[:, 1])
+    return (p >= threshold).astype(np.int64), p
@@ -0,0 +1,287 @@
+"""
+Constant-memory drift monitoring for the prediction API.
+
+Each feature keeps a fixed-size histogram: one bin per known category code
+for categorical features, and quantile bins for numerical ones. Live
+traffic is counted into the same bins on every request (O(1) per feature)
+and compared with the reference histograms built from the processed
+training data. PSI and KS scores are computed lazily when Prometheus
+scrapes ``/metrics``.
+"""
+
+import json
+import mmap
+import threading
+import multiprocessing
+from bisect import bisect_right
+from pathlib import Path
+
+import numpy as np
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+CATEGORICAL_FEATURES = [
+    "sex", "cp", "fbs", "restecg", "exang", "slope", "ca", "thal",
+]
+
+EPSILON = 1e-4
+
+
+# -----------------------------
+# Reference Sketches
+# -----------------------------
+def build_reference(df, features, n_bins: int = 10) -> dict:
+    """
+    Build reference histograms from a training DataFrame.
+    """
+    reference = {"features": {}}
+
+    for feature in features:
+        values = np.asarray(df[feature], dtype=float)
+
+        if feature in CATEGORICAL_FEATURES:
+            codes, counts = np.unique(values, return_counts=True)
+            reference["features"][feature] = {
+                "type": "categorical",
+                "values": [float(c) for c in codes],
+                "counts": [int(c) for c in counts],
+            }
+        else:
+            quantiles = np.linspace(0, 1, n_bins + 1)[1:-1]
+            edges = np.unique(np.quantile(values, quantiles))
+            counts = np.bincount(
+                np.searchsorted(edges, values, side="right"),
+                minlength=len(edges) + 1,
+            )
+            reference["features"][feature] = {
+                "type": "numerical",
+                "edges": [float(e) for e in edges],
+                "counts": [int(c) for c in counts],
+            }
+
+    return reference
+
+
+def save_reference(reference: dict, path) -> None:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(reference, f, indent=2)
+
+
+def load_reference(path) -> dict:
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+# -----------------------------
+# Drift Scores
+# -----------------------------
+def psi(expected, actual) -> float:
+    """
+    Population Stability Index between two binned distributions.
+    """
+    expected = np.asarray(expected, dtype=float)
+    actual = np.asarray(actual, dtype=float)
+    p = np.clip(expected / max(expected.sum(), 1), EPSILON, None)
+    q = np.clip(actual / max(actual.sum(), 1), EPSILON, None)
+    return float(np.sum((q - p) * np.log(q / p)))
+
+
+def ks(expected, actual) -> float:
+    """
+    Kolmogorov-Smirnov statistic on binned cumulative distributions.
+    """
+    expected = np.asarray(expected, dtype=float)
+    actual = np.asarray(actual, dtype=float)
+    cdf_p = np.cumsum(expected) / max(expected.sum(), 1)
+    cdf_q = np.cumsum(actual) / max(actual.sum(), 1)
+    return float(np.max(np.abs(cdf_p - cdf_q)))
+
+
+# -----------------------------
+# Live Monitor
+# -----------------------------
+class DriftMonitor:
+    """
+    Per-feature live histograms over a rolling window of requests.
+
+    Two fixed-size count buffers are kept per feature; when the current
+    one has seen ``window`` requests it replaces the previous one, so the
+    live distribution always covers between ``window`` and ``2 * window``
+    requests without growing memory.
+
+    With ``shared=True`` the counts live in an anonymous shared memory map
+    guarded by a process lock; a monitor created before the launcher forks
+    its workers then counts the traffic of every worker, and any worker's
+    scrape reports the whole service.
+    """
+
+    def __init__(self, reference: dict, window: int = 1000,
+                 shared: bool = False):
+        self.window = window
+        self.features = list(reference["features"])
+
+        self._reference = {}
+        self._edges = {}
+        self._codes = {}
+        self._slices = {}
+        n_bins = 0
+        for feature, sketch in reference["features"].items():
+            self._reference[feature] = sketch["counts"]
+            self._slices[feature] = slice(n_bins,
+                                          n_bins + len(sketch["counts"]))
+            n_bins += len(sketch["counts"])
+            if sketch["type"] == "categorical":
+                self._codes[feature] = {
+                    v: i for i, v in enumerate(sketch["values"])
+                }
+            else:
+                self._edges[feature] = sketch["edges"]
+
+        # [active buffer, requests in it, observations] + out-of-domain
+        # counts per categorical feature + the two count buffers
+        size = 3 + len(self._codes) + 2 * n_bins
+        if shared:
+            self._lock = multiprocessing.Lock()
+            buffer = mmap.mmap(-1, size * 8)
+        else:
+            self._lock = threading.Lock()
+            buffer = bytearray(size * 8)
+        state = np.frombuffer(buffer, dtype=np.int64)
+        self._header = state[:3]
+        self._out_of_domain = state[3:3 + len(self._codes)]
+        self._counts = state[3 + len(self._codes):].reshape(2, n_bins)
+        self._ood_index = {f: i for i, f in enumerate(self._codes)}
+
+        self.reset()
+
+    @classmethod
+    def from_file(cls, path, window: int = 1000, shared: bool = False):
+        return cls(load_reference(path), window=window, shared=shared)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._header[:] = 0
+            self._out_of_domain[:] = 0
+            self._counts[:] = 0
+
+    @property
+    def observations(self) -> int:
+        return int(self._header[2])
+
+    @property
+    def out_of_domain(self) -> dict:
+        return {f: int(self._out_of_domain[i])
+                for f, i in self._ood_index.items()}
+
+    def observe(self, row: dict, reject_invalid: bool = False) -> list:
+        """
+        Count one request into the live histograms; see ``observe_batch``.
+        """
+        return self.observe_batch([row], reject_invalid)
+
+    def observe_batch(self, rows: list, reject_invalid: bool = False) -> list:
+        """
+        Count the rows of one request into the live histograms.
+
+        Returns the out-of-domain categorical features; those values are
+        counted separately and not added to the histograms. With
+        ``reject_invalid`` the request is being rejected when any value is
+        out of domain, and then none of its rows are counted.
+        """
+        # Resolve every bin before counting anything
+        binned, invalid = [], set()
+        for row in rows:
+            indices = []
+            for feature in self.features:
+                value = float(row[feature])
+                codes = self._codes.get(feature)
+
+                if codes is None:
+                    index = bisect_right(self._edges[feature], value)
+                else:
+                    index = codes.get(value)
+                    if index is None:
+                        invalid.add(feature)
+                        continue
+
+                indices.append(self._slices[feature].start + index)
+            binned.append(indices)
+        invalid = [f for f in self.features if f in invalid]
+
+        with self._lock:
+            for feature in invalid:
+                self._out_of_domain[self._ood_index[feature]] += 1
+            if invalid and reject_invalid:
+                return invalid
+
+            for indices in binned:
+                if self._header[1] >= self.window:
+                    self._header[0] ^= 1
+                    self._header[1] = 0
+                    self._counts[self._header[0]] = 0
+                self._counts[self._header[0], indices] += 1
+                self._header[1] += 1
+                self._header[2] += 1
+
+        return invalid
+
+    def live_counts(self, feature: str) -> list:
+        with self._lock:
+            return self._counts[:, self._slices[feature]].sum(
+                axis=0
+            ).tolist()
+
+    def scores(self) -> dict:
+        """
+        PSI and KS per feature against the reference histograms.
+        """
+        result = {}
+        for feature in self.features:
+            live = self.live_counts(feature)
+            if sum(live) == 0:
+                result[feature] = {"psi": 0.0, "ks": 0.0}
+                continue
+            reference = self._reference[feature]
+            result[feature] = {
+                "psi": psi(reference, live),
+                "ks": ks(reference, live),
+            }
+        return result
+
+    # Prometheus custom collector interface
+    def collect(self):
+        psi_gauge = GaugeMetricFamily(
+            "feature_drift_psi",
+            "Population Stability Index of live traffic vs training data",
+            labels=["feature"],
+        )
+        ks_gauge = GaugeMetricFamily(
+            "feature_drift_ks",
+            "Binned KS statistic of live traffic vs training data",
+            labels=["feature"],
+        )
+        for feature, score in self.scores().items():
+            psi_gauge.add_metric([feature], score["psi"])
+            ks_gauge.add_metric([feature], score["ks"])
+
+        out_of_domain = CounterMetricFamily(
+            "feature_out_of_domain",
+            "Requests with a category code unseen in training data",
+            labels=["feature"],
+        )
+        for feature, count in self.out_of_domain.items():
+            out_of_domain.add_metric([feature], count)
+
+        observed = GaugeMetricFamily(
+            "feature_drift_observations",
+            "Requests observed by the drift monitor",
+            value=self.observations,
+        )
+
+        yield psi_gauge
+        yield ks_gauge
+        yield out_of_domain
+        yield observed
+
+    def describe(self):
+        return []
@@ -0,0 +1,475 @@
+"""
+NumPy-only inference engines for the serving models.
+
+scikit-learn (and through it SciPy and pandas) is only needed to unpickle
+the trained estimators, yet it dominates API cold-start time. At training
+time the fitted scaler, logistic regression and random forest are exported
+as plain arrays (``models/engine_params.npz``); at serving time these
+engines evaluate them with NumPy alone and expose the same
+``transform`` / ``predict`` / ``predict_proba`` interface as the
+estimators they replace.
+
+The quantized export (``models/engine_params_quantized.npz``) stores the
+scaler and logistic regression in float32 and the forest as complete
+binary trees with uint8 features, float32 thresholds snapped to the
+training split grid and float32 node values; see
+``QuantizedForestEngine``.
+"""
+
+import numpy as np
+
+TREE_LEAF = -1
+
+# Complete-tree layout grows as 2 ** depth; deeper forests stay unquantized
+QUANTIZED_MAX_DEPTH = 10
+
+
+# -----------------------------
+# Engines
+# -----------------------------
+class ScalerEngine:
+    """
+    StandardScaler.transform: (X - mean_) / scale_.
+    """
+
+    def __init__(self, mean, scale, dtype=np.float64):
+        self.mean_ = np.asarray(mean, dtype=dtype)
+        self.scale_ = np.asarray(scale, dtype=dtype)
+
+    def transform(self, X):
+        X = np.array(X, dtype=self.mean_.dtype)
+        X -= self.mean_
+        X /= self.scale_
+        return X
+
+
+class LogisticEngine:
+    """
+    Binary logistic regression from coefficients and intercept.
+    """
+
+    def __init__(self, coef, intercept, classes, dtype=np.float64):
+        self.coef_ = np.asarray(coef, dtype=dtype)
+        self.intercept_ = np.asarray(intercept, dtype=dtype)
+        self.classes_ = np.asarray(classes)
+
+    def decision_function(self, X):
+        return X @ self.coef_.T[:, 0] + self.intercept_[0]
+
+    def predict_proba(self, X):
+        p = 1.0 / (1.0 + np.exp(-self.decision_function(X)))
+        return np.column_stack([1.0 - p, p])
+
+    def predict(self, X):
+        return self.classes_[(self.decision_function(X) > 0).astype(int)]
+
+
+class ForestEngine:
+    """
+    Random forest evaluated over flattened node arrays of all trees.
+
+    Leaves point to themselves, so every row walks every tree for exactly
+    ``max_depth`` vectorised steps with no per-tree Python loop.
+    """
+
+    def __init__(self, left, right, feature, threshold, value, roots,
+                 max_depth, classes):
+        self.left = np.asarray(left, dtype=np.intp)
+        self.right = np.asarray(right, dtype=np.intp)
+        self.feature = np.asarray(feature, dtype=np.intp)
+        self.threshold = np.asarray(threshold, dtype=np.float64)
+        self.value = np.asarray(value, dtype=np.float64)
+        self.roots = np.asarray(roots, dtype=np.intp)
+        self.max_depth = int(max_depth)
+        self.classes_ = np.asarray(classes)
+
+    @property
+    def positive_value(self):
+        return self.value[:, 1]
+
+    def step(self, X, rows, node):
+        """
+        (split feature, child) for every (row, tree) at ``node``.
+        """
+        split = self.feature[node]
+        go_left = X[rows, split] <= self.threshold[node]
+        return split, np.where(go_left, self.left[node], self.right[node])
+
+    def apply(self, X):
+        """
+        Leaf index (into the flat node arrays) per row and tree.
+        """
+        # Trees split on float32 features, as in scikit-learn
+        X = np.asarray(X, dtype=np.float32)
+        rows = np.arange(X.shape[0])[:, None]
+        node = np.broadcast_to(self.roots, (X.shape[0], self.roots.size))
+
+        for _ in range(self.max_depth):
+            _, node = self.step(X, rows, node)
+
+        return node
+
+    def predict_proba(self, X):
+        return self.value[self.apply(X)].mean(axis=1)
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+
+class QuantizedForestEngine:
+    """
+    Forest stored as complete binary trees of depth ``max_depth``.
+
+    Node i of a tree has children 2i + 1 and 2i + 2, so descending is
+    arithmetic instead of child-pointer gathers and no child arrays are
+    stored. Leaves above the bottom level are padded with always-left
+    splits (threshold +inf) that repeat the leaf value. Per node only a
+    uint8 feature, a float32 threshold and the float32 positive-class
+    probability are kept.
+    """
+
+    def __init__(self, feature, threshold, value, max_depth, classes):
+        self.feature = np.asarray(feature, dtype=np.uint8)
+        self.threshold = np.asarray(threshold, dtype=np.float32)
+        self.value = np.asarray(value, dtype=np.float32)
+        self.max_depth = int(max_depth)
+        self.classes_ = np.asarray(classes)
+        self.tree_size = 2 ** (self.max_depth + 1) - 1
+        self.roots = np.arange(0, self.value.size, self.tree_size)
+
+    @property
+    def positive_value(self):
+        return self.value
+
+    def step(self, X, rows, node):
+        split = self.feature[node]
+        go_right = X[rows, split] > self.threshold[node]
+        return split, 2 * node - self.roots + 1 + go_right
+
+    def apply(self, X):
+        X = np.asarray(X, dtype=np.float32)
+        n_rows, n_features = X.shape
+        flat = X.ravel()
+        row_offset = (np.arange(n_rows) * n_features)[:, None]
+        position = np.zeros((n_rows, self.roots.size), dtype=np.intp)
+
+        for _ in range(self.max_depth):
+            node = self.roots + position
+            go_right = flat[row_offset + self.feature[node]] \
+                > self.threshold[node]
+            position *= 2
+            position += 1
+            position += go_right
+
+        return self.roots + position
+
+    def predict_proba(self, X):
+        leaves = self.value[self.apply(X)]
+        p = leaves.sum(axis=1, dtype=np.float64) / self.roots.size
+        return np.column_stack([1.0 - p, p])
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+
+# -----------------------------
+# Quantization
+# -----------------------------
+def snap_down(threshold):
+    """
+    Largest float32 <= each float64 threshold. Features are compared as
+    float32, so ``x <= snap_down(t)`` decides exactly like ``x <= t``.
+    """
+    threshold = np.asarray(threshold, dtype=np.float64)
+    snapped = threshold.astype(np.float32)
+    over = snapped.astype(np.float64) > threshold
+    snapped[over] = np.nextafter(snapped[over], np.float32(-np.inf))
+    return snapped
+
+
+def split_grid(X_scaled) -> list:
+    """
+    Sorted distinct float32 training values of each feature.
+    """
+    X32 = np.asarray(X_scaled, dtype=np.float32)
+    return [np.unique(X32[:, j]) for j in range(X32.shape[1])]
+
+
+def snap_to_grid(feature, threshold, grid):
+    """
+    Move each threshold to the midpoint between the training values it
+    separates. Training rows are partitioned exactly as before, and every
+    split sits as far as possible from the data, so float32 scaling noise
+    cannot flip it. Thresholds outside the data range are kept.
+    """
+    threshold = np.asarray(threshold, dtype=np.float64)
+    snapped = threshold.copy()
+    for j, values in enumerate(grid):
+        mask = (feature == j) & np.isfinite(threshold)
+        upper = np.searchsorted(values, threshold[mask], side="right")
+        inside = (upper > 0) & (upper < values.size)
+        below = values[upper[inside] - 1].astype(np.float64)
+        above = values[upper[inside]].astype(np.float64)
+        snapped_j = threshold[mask]
+        snapped_j[inside] = (below + above) / 2
+        snapped[mask] = snapped_j
+    return snapped
+
+
+def quantize_forest(forest: ForestEngine, grid=None) -> QuantizedForestEngine:
+    """
+    Re-lay a flattened forest as complete trees with compact dtypes.
+    With a ``split_grid`` of the training data, thresholds are first
+    snapped to it.
+    """
+    depth = forest.max_depth
+    if depth > QUANTIZED_MAX_DEPTH:
+        raise ValueError(
+            f"max_depth {depth} exceeds {QUANTIZED_MAX_DEPTH} for the "
+            f"complete-tree layout"
+        )
+    if forest.feature.size and forest.feature.max() > np.iinfo(np.uint8).max:
+        raise ValueError("uint8 feature indices support 256 features")
+
+    tree_size = 2 ** (depth + 1) - 1
+    n_nodes = forest.roots.size * tree_size
+    feature = np.zeros(n_nodes, dtype=np.uint8)
+    threshold = np.full(n_nodes, np.inf, dtype=np.float32)
+    value = np.zeros(n_nodes, dtype=np.float32)
+    threshold_grid = forest.threshold if grid is None else snap_to_grid(
+        forest.feature, forest.threshold, grid
+    )
+    snapped = snap_down(threshold_grid)
+    positive = forest.positive_value
+
+    for tree, root in enumerate(forest.roots):
+        offset = tree * tree_size
+        stack = [(root, 0, 0)]
+        while stack:
+            node, position, level = stack.pop()
+            value[offset + position] = positive[node]
+            if level == depth:
+                continue
+            if forest.left[node] == node:
+                # Padded leaf: +inf always goes left, right is unreachable
+                children = (node, node)
+            else:
+                feature[offset + position] = forest.feature[node]
+                threshold[offset + position] = snapped[node]
+                children = (forest.left[node], forest.right[node])
+            stack.append((children[0], 2 * position + 1, level + 1))
+            stack.append((children[1], 2 * position + 2, level + 1))
+
+    return QuantizedForestEngine(feature, threshold, value, depth,
+                                 forest.classes_)
+
+
+# -----------------------------
+# Export / Load
+# -----------------------------
+def forest_arrays(rf_model, classes=None) -> dict:
+    """
+    Flatten the fitted trees of a RandomForestClassifier.
+
+    Regression forests and single regression trees fitted on
+    positive-class probabilities (distilled students) are flattened too;
+    their leaf value p becomes the class distribution [1 - p, p], and
+    ``classes`` must be given.
+    """
+    left, right, feature, threshold, value, roots = [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+
+    for estimator in getattr(rf_model, "estimators_", [rf_model]):
+        tree = estimator.tree_
+        n = tree.node_count
+        idx = np.arange(n) + offset
+        is_leaf = tree.children_left == TREE_LEAF
+
+        left.append(np.where(is_leaf, idx, tree.children_left + offset))
+        right.append(np.where(is_leaf, idx, tree.children_right + offset))
+        feature.append(np.where(is_leaf, 0, tree.feature))
+        threshold.append(np.where(is_leaf, np.inf, tree.threshold))
+
+        leaf_value = tree.value[:, 0, :]
+        if leaf_value.shape[1] == 1:
+            p = np.clip(leaf_value[:, 0], 0.0, 1.0)
+            value.append(np.column_stack([1.0 - p, p]))
+        else:
+            value.append(leaf_value / leaf_value.sum(axis=1, keepdims=True))
+
+        roots.append(offset)
+        max_depth = max(max_depth, tree.max_depth)
+        offset += n
+
+    return {
+        "rf_left": np.concatenate(left),
+        "rf_right": np.concatenate(right),
+        "rf_feature": np.concatenate(feature),
+        "rf_threshold": np.concatenate(threshold),
+        "rf_value": np.concatenate(value),
+        "rf_roots": np.array(roots),
+        "rf_max_depth": np.array(max_depth),
+        "rf_classes": rf_model.classes_ if classes is None else classes,
+    }
+
+
+def forest_engine(arrays) -> ForestEngine:
+    """
+    ForestEngine from ``forest_arrays`` output (or a loaded npz).
+    """
+    return ForestEngine(
+        arrays["rf_left"],
+        arrays["rf_right"],
+        arrays["rf_feature"],
+        arrays["rf_threshold"],
+        arrays["rf_value"],
+        arrays["rf_roots"],
+        arrays["rf_max_depth"],
+        arrays["rf_classes"],
+    )
+
+
+def export_engine_params(path, scaler, lr_model, rf_model,
+                         source_versions: dict = None) -> None:
+    """
+    Save fitted estimators as plain arrays for the NumPy engines.
+    ``source_versions`` maps "logistic-regression" / "random-forest" to
+    the version of the model file each was exported from.
+    """
+    source_versions = source_versions or {}
+    np.savez(
+        path,
+        lr_source_version=np.array(
+            source_versions.get("logistic-regression", "")
+        ),
+        rf_source_version=np.array(source_versions.get("random-forest", "")),
+        scaler_mean=scaler.mean_,
+        scaler_scale=scaler.scale_,
+        lr_coef=lr_model.coef_,
+        lr_intercept=lr_model.intercept_,
+        lr_classes=lr_model.classes_,
+        **forest_arrays(rf_model),
+    )
+
+
+def load_engines(path):
+    """
+    Return (scaler, logistic regression, random forest) engines.
+    """
+    with np.load(path) as params:
+        scaler = ScalerEngine(params["scaler_mean"], params["scaler_scale"])
+        lr = LogisticEngine(
+            params["lr_coef"], params["lr_intercept"], params["lr_classes"]
+        )
+        rf = forest_engine(params)
+    return scaler, lr, rf
+
+
+def engine_source_versions(path) -> dict:
+    """
+    Versions of the model files the float64 export was built from ("" if
+    not recorded).
+    """
+    with np.load(path) as params:
+        return {
+            key: str(params[name]) if name in params.files else ""
+            for key, name in (("logistic-regression", "lr_source_version"),
+                              ("random-forest", "rf_source_version"))
+        }
+
+
+def _quantized_forest_arrays(forest: QuantizedForestEngine) -> dict:
+    return {
+        "qrf_feature": forest.feature,
+        "qrf_threshold": forest.threshold,
+        "qrf_value": forest.value,
+        "qrf_max_depth": np.array(forest.max_depth),
+        "qrf_classes": forest.classes_,
+    }
+
+
+def _quantized_forest(params) -> QuantizedForestEngine:
+    return QuantizedForestEngine(
+        params["qrf_feature"],
+        params["qrf_threshold"],
+        params["qrf_value"],
+        params["qrf_max_depth"],
+        params["qrf_classes"],
+    )
+
+
+def export_quantized_params(path, scaler, lr_model,
+                            forest: QuantizedForestEngine,
+                            source_version: str = "") -> None:
+    """
+    Save the float32 scaler / logistic regression and quantized forest.
+    ``source_version`` identifies the float64 export they were validated
+    against.
+    """
+    np.savez(
+        path,
+        scaler_mean=np.asarray(scaler.mean_, dtype=np.float32),
+        scaler_scale=np.asarray(scaler.scale_, dtype=np.float32),
+        lr_coef=np.asarray(lr_model.coef_, dtype=np.float32),
+        lr_intercept=np.asarray(lr_model.intercept_, dtype=np.float32),
+        lr_classes=lr_model.classes_,
+        source_version=np.array(source_version),
+        **_quantized_forest_arrays(forest),
+    )
+
+
+def load_quantized_engines(path):
+    """
+    Return (scaler, logistic regression, random forest) quantized engines.
+    """
+    with np.load(path) as params:
+        scaler = ScalerEngine(params["scaler_mean"], params["scaler_scale"],
+                              dtype=np.float32)
+        lr = LogisticEngine(params["lr_coef"], params["lr_intercept"],
+                            params["lr_classes"], dtype=np.float32)
+        rf = _quantized_forest(params)
+    return scaler, lr, rf
+
+
+def export_quantized_forest(path, forest: QuantizedForestEngine,
+                            source_version: str = "") -> None:
+    """
+    Save a single quantized forest (e.g. a distilled student).
+    """
+    np.savez(path, source_version=np.array(source_version),
+             **_quantized_forest_arrays(forest))
+
+
+def load_quantized_forest(path) -> QuantizedForestEngine:
+    with np.load(path) as params:
+        return _quantized_forest(params)
+
+
+def source_version(path) -> str:
+    """
+    Version of the float64 export a quantized file was validated against.
+    """
+    with np.load(path) as params:
+        return str(params["source_version"])
+
+
+def export_forest_params(path, model, classes=None) -> None:
+    """
+    Save a single forest (e.g. a distilled student) as plain arrays.
+    """
+    np.savez(path, **forest_arrays(model, classes=classes))
+
+
+def load_forest(path) -> ForestEngine:
+    with np.load(path) as params:
+        return forest_engine(params)
+
+
+def engine_nbytes(engine) -> int:
+    """
+    Memory held by an engine's NumPy arrays.
+    """
+    return sum(
+        v.nbytes for v in vars(engine).values() if isinstance(v, np.ndarray)
+    )
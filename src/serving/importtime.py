@@ -0,0 +1,109 @@
+"""
+Import-time profiling for API cold start.
+
+Imports a module in a fresh interpreter with ``python -X importtime``,
+reports the slowest top-level imports and the wall-clock cold-start time,
+and exits non-zero when the import exceeds its budget or pulls in a
+forbidden module.
+
+Usage:
+    python -m src.serving.importtime src.serving.app --budget-ms 1200 \\
+        --forbid sklearn --forbid scipy --forbid pandas
+"""
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+
+def parse_importtime(stderr: str) -> list:
+    """
+    Parse ``-X importtime`` output into (module, self_us, cumulative_us,
+    depth) tuples, in import order.
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append(
+            (name.strip(), int(self_us), int(cumulative_us), depth)
+        )
+    return entries
+
+
+def profile_import(module: str, env: dict = None) -> dict:
+    """
+    Import ``module`` in a fresh interpreter and return its profile.
+    """
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env={**os.environ, **(env or {})},
+        capture_output=True,
+        text=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+
+    entries = parse_importtime(result.stderr)
+    cumulative = {name: cum for name, _, cum, _ in entries}
+    # Python 3.7+ reports the outermost import last at depth 1
+    total_us = max((cum for _, _, cum, depth in entries if depth <= 1),
+                   default=0)
+
+    return {
+        "module": module,
+        "wall_ms": round(wall_ms, 1),
+        "import_ms": round(total_us / 1000, 1),
+        "modules": cumulative,
+        "top": sorted(
+            ((name, cum) for name, _, cum, depth in entries if depth <= 2),
+            key=lambda item: item[1],
+            reverse=True,
+        ),
+    }
+
+
+def check_budget(profile: dict, budget_ms: float = None,
+                 forbid: list = ()) -> list:
+    """
+    Return a list of budget violations (empty when within budget).
+    """
+    violations = []
+    if budget_ms is not None and profile["import_ms"] > budget_ms:
+        violations.append(
+            f"import of {profile['module']} took {profile['import_ms']}ms "
+            f"(budget {budget_ms}ms)"
+        )
+    for name in forbid:
+        if name in profile["modules"]:
+            violations.append(f"{profile['module']} imports {name}")
+    return violations
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import-time budget check")
+    parser.add_argument("module", nargs="?", default="src.serving.app")
+    parser.add_argument("--budget-ms", type=float, default=None)
+    parser.add_argument("--forbid", action="append", default=[])
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    profile = profile_import(args.module)
+
+    print(f"\n{args.module}: import {profile['import_ms']}ms | "
+          f"cold start (interpreter + import) {profile['wall_ms']}ms\n")
+    for name, cumulative_us in profile["top"][:args.top]:
+        print(f"  {cumulative_us / 1000:9.1f} ms  {name}")
+
+    violations = check_budget(profile, args.budget_ms, args.forbid)
+    for violation in violations:
+        print(f"\n[ERROR] {violation}")
+
+    sys.exit(1 if violations else 0)
@@ -0,0 +1,310 @@
+"""
+Production launcher for the prediction API.
+
+Starts N uvicorn workers sharing one listening socket:
+- N defaults to the usable CPUs (affinity mask and cgroup CPU quota)
+- BLAS/OpenMP/joblib thread pools are limited to 1 thread per worker
+  so workers do not oversubscribe cores
+- models and scaler are loaded once in the parent before forking so the
+  artifact pages are shared copy-on-write between workers
+- each worker is pinned to its own core
+- a worker that exits is restarted with exponential backoff; more than
+  ``max_crashes`` exits within ``crash_window`` seconds stops the service
+  with a non-zero status instead of fork-looping
+
+Prometheus runs in multiprocess mode: ``PROMETHEUS_MULTIPROC_DIR`` (a
+fresh temporary directory unless set) is cleared and exported before the
+app is imported, every worker writes its samples there, and a scrape of
+/metrics from any worker aggregates all of them. Files of exited workers
+are marked dead.
+
+Usage:
+    python -m src.serving.launcher --host 0.0.0.0 --port 8000 --workers 4
+"""
+
+import gc
+import os
+import sys
+import math
+import time
+import signal
+import socket
+import logging
+import argparse
+import tempfile
+from collections import deque
+from pathlib import Path
+
+logger = logging.getLogger("heart-disease-launcher")
+
+THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "BLIS_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+    "LOKY_MAX_CPU_COUNT",
+)
+
+
+# -----------------------------
+# CPU Discovery
+# -----------------------------
+def cgroup_cpu_limit(root="/sys/fs/cgroup"):
+    """
+    CPU quota in cores from cgroup v2 (cpu.max) or v1
+    (cpu.cfs_quota_us / cpu.cfs_period_us). None when unlimited.
+    """
+    root = Path(root)
+
+    cpu_max = root / "cpu.max"
+    if cpu_max.exists():
+        quota, period = cpu_max.read_text().split()[:2]
+        if quota == "max":
+            return None
+        return int(quota) / int(period)
+
+    for base in (root / "cpu", root):
+        quota_file = base / "cpu.cfs_quota_us"
+        period_file = base / "cpu.cfs_period_us"
+        if quota_file.exists() and period_file.exists():
+            quota = int(quota_file.read_text())
+            if quota <= 0:
+                return None
+            return quota / int(period_file.read_text())
+
+    return None
+
+
+def allowed_cpus() -> list:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def available_cpus(cgroup_root="/sys/fs/cgroup") -> int:
+    """
+    Number of CPUs this process may actually use.
+    """
+    cpus = len(allowed_cpus())
+    quota = cgroup_cpu_limit(cgroup_root)
+    if quota is not None:
+        cpus = min(cpus, max(1, math.floor(quota)))
+    return cpus
+
+
+def limit_threads(n: int = 1) -> None:
+    """
+    Cap native thread pools. Must run before NumPy is imported.
+    """
+    for var in THREAD_ENV_VARS:
+        os.environ[var] = str(n)
+
+
+def prepare_metrics_dir(path=None) -> str:
+    """
+    Export an empty PROMETHEUS_MULTIPROC_DIR. Must run before
+    prometheus_client is imported (it picks its value class at import).
+    """
+    path = Path(path or os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+                or tempfile.mkdtemp(prefix="prometheus-"))
+    path.mkdir(parents=True, exist_ok=True)
+    for stale in path.glob("*.db"):
+        stale.unlink()
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = str(path)
+    return str(path)
+
+
+# -----------------------------
+# Worker Management
+# -----------------------------
+def restart_delay(failures: int, base: float = 0.5,
+                  cap: float = 30.0) -> float:
+    """
+    Exponential backoff before restarting a worker that exited
+    ``failures`` times in a row.
+    """
+    return min(cap, base * 2 ** max(failures - 1, 0))
+
+
+class CrashBudget:
+    """
+    Allows at most ``max_crashes`` worker exits per sliding ``window``
+    seconds.
+    """
+
+    def __init__(self, max_crashes: int = 5, window: float = 60.0,
+                 clock=time.monotonic):
+        self.max_crashes = max_crashes
+        self.window = window
+        self._clock = clock
+        self._crashes = deque()
+
+    def record(self) -> bool:
+        """
+        Count one exit; False once the budget is exhausted.
+        """
+        now = self._clock()
+        self._crashes.append(now)
+        while self._crashes[0] <= now - self.window:
+            self._crashes.popleft()
+        return len(self._crashes) <= self.max_crashes
+
+
+def _bind(host: str, port: int) -> socket.socket:
+    # proto must be IPPROTO_TCP: asyncio only enables TCP_NODELAY on
+    # accepted connections when it is, and Nagle + delayed ACK otherwise
+    # adds ~40ms to every response.
+    sock = socket.socket(
+        socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP
+    )
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(index, app, sock, cpus, pin, log_level):
+    import uvicorn
+
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+    if pin and cpus and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {cpus[index % len(cpus)]})
+
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(1)
+    except ImportError:
+        pass
+
+    config = uvicorn.Config(app, log_level=log_level, lifespan="on")
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def serve(
+    host: str = "0.0.0.0",
+    port: int = 8000,
+    workers: int = None,
+    pin: bool = True,
+    log_level: str = "info",
+    max_crashes: int = 5,
+    crash_window: float = 60.0,
+    backoff: float = 0.5,
+    max_backoff: float = 30.0,
+) -> None:
+    workers = workers or available_cpus()
+    limit_threads(1)
+    prepare_metrics_dir()
+
+    sock = _bind(host, port)
+
+    # Preload artifacts in the parent; workers inherit them via fork.
+    from src.serving.app import app
+    from prometheus_client import multiprocess
+
+    gc.collect()
+    gc.freeze()
+
+    cpus = allowed_cpus()
+    children = {}
+    started = {}
+    failures = [0] * workers
+    budget = CrashBudget(max_crashes, crash_window)
+    stopping = False
+    failed = False
+
+    def spawn(index):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                _run_worker(index, app, sock, cpus, pin, log_level)
+            finally:
+                os._exit(0)
+        children[pid] = index
+        started[index] = time.monotonic()
+        logger.info(f"Started worker {index} | pid={pid}")
+
+    def stop_workers():
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def shutdown(signum, frame):
+        stop_workers()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    logger.info(
+        f"Serving on {host}:{port} | workers={workers} | pin={pin}"
+    )
+    for index in range(workers):
+        spawn(index)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        index = children.pop(pid, None)
+        multiprocess.mark_process_dead(pid)
+        if index is None or stopping:
+            continue
+
+        # A worker that stayed up for a whole window starts a new streak
+        if time.monotonic() - started[index] >= crash_window:
+            failures[index] = 0
+        failures[index] += 1
+        if not budget.record():
+            logger.error(
+                f"Worker {index} exited (status={status}); more than "
+                f"{max_crashes} exits in {crash_window}s, shutting down"
+            )
+            failed = True
+            stop_workers()
+            continue
+
+        delay = restart_delay(failures[index], backoff, max_backoff)
+        logger.warning(
+            f"Worker {index} exited (status={status}), restarting in "
+            f"{delay:.1f}s"
+        )
+        time.sleep(delay)
+        if not stopping:
+            spawn(index)
+
+    sock.close()
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+        handlers=[logging.StreamHandler(sys.stdout)],
+    )
+
+    parser = argparse.ArgumentParser(description="Heart disease API launcher")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers", type=int,
+        default=int(os.getenv("WEB_CONCURRENCY", "0")) or None,
+    )
+    parser.add_argument("--no-pin", action="store_true")
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--max-crashes", type=int, default=5)
+    parser.add_argument("--crash-window", type=float, default=60.0)
+    args = parser.parse_args()
+
+    serve(args.host, args.port, args.workers, not args.no_pin, args.log_level,
+          max_crashes=args.max_crashes, crash_window=args.crash_window)
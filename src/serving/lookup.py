@@ -0,0 +1,157 @@
+"""
+Precomputed prediction lookup for frequent feature vectors.
+
+Twelve of the thirteen features are small bounded integers, so live
+traffic repeats exact input vectors. For the most frequent vectors in the
+training data and the prediction audit log, model outputs are computed
+once in a batch and stored in a hash index; matching requests are answered
+in O(1) without scaling or touching the model.
+
+Tables are built at warm-up for the versions being served, and rebuilt
+when the app swaps in a model of another version (``reload_model``).
+Each table is tagged with the model version it was built for and every
+lookup passes the served version; a table built for another version is
+never used (the request falls through to the model).
+``LookupIndex.ensure`` keeps tables whose version is unchanged.
+"""
+
+import threading
+from collections import Counter as FrequencyCounter
+
+import numpy as np
+from prometheus_client import Counter, Gauge
+
+LOOKUP_HITS = Counter(
+    "lookup_hits_total", "Predictions served from the lookup table", ["model"]
+)
+LOOKUP_MISSES = Counter(
+    "lookup_misses_total", "Lookups that fell through to the model", ["model"]
+)
+# Under the multi-worker launcher: one ratio per worker (pid label)
+LOOKUP_HIT_RATIO = Gauge(
+    "lookup_hit_ratio", "Lookup table hit ratio since start", ["model"],
+    multiprocess_mode="liveall",
+)
+LOOKUP_ENTRIES = Gauge(
+    "lookup_entries", "Feature vectors in the lookup table", ["model"],
+    multiprocess_mode="livemax",
+)
+
+
+# -----------------------------
+# Frequent Feature Vectors
+# -----------------------------
+def training_rows(csv_path, features) -> list:
+    """
+    Feature vectors (tuples in ``features`` order) from a processed CSV.
+    """
+    with open(csv_path) as f:
+        header = f.readline().strip().split(",")
+    columns = [header.index(feature) for feature in features]
+    data = np.loadtxt(csv_path, delimiter=",", skiprows=1, usecols=columns,
+                      ndmin=2)
+    return [tuple(row) for row in data.tolist()]
+
+
+def audit_rows(directory, features) -> list:
+    from src.serving.audit import iter_records
+
+    return [
+        tuple(float(record["inputs"][f]) for f in features)
+        for record in iter_records(directory)
+    ]
+
+
+def most_frequent(rows, max_entries: int) -> list:
+    return [row for row, _ in FrequencyCounter(rows).most_common(max_entries)]
+
+
+# -----------------------------
+# Lookup Table
+# -----------------------------
+class PredictionTable:
+    """
+    Feature vector -> (prediction, class probabilities) for one model
+    version.
+    """
+
+    def __init__(self, model, scaler, rows: list, version: str):
+        self.version = version
+        self._index = {row: i for i, row in enumerate(rows)}
+
+        if rows:
+            X_scaled = scaler.transform(np.array(rows, dtype=np.float64))
+            self._proba = model.predict_proba(X_scaled)
+            self._prediction = np.asarray(model.predict(X_scaled))
+        else:
+            self._proba = np.empty((0, 2))
+            self._prediction = np.empty(0, dtype=int)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def get(self, key: tuple):
+        i = self._index.get(key)
+        if i is None:
+            return None
+        return int(self._prediction[i]), self._proba[i]
+
+
+class LookupIndex:
+    """
+    Per-model prediction tables with hit/miss accounting.
+    """
+
+    def __init__(self, features: list, max_entries: int = 4096):
+        self.features = features
+        self.max_entries = max_entries
+        self.tables = {}
+        self.hits = {}
+        self.misses = {}
+        self._lock = threading.Lock()
+
+    def ensure(self, model_key, model, scaler, version, rows) -> bool:
+        """
+        (Re)build the table for ``model_key`` if it is missing or was
+        built for a different model version. Returns True if rebuilt.
+        """
+        table = self.tables.get(model_key)
+        if table is not None and table.version == version:
+            return False
+
+        table = PredictionTable(
+            model, scaler, most_frequent(rows, self.max_entries), version
+        )
+        with self._lock:
+            self.tables[model_key] = table
+            self.hits.setdefault(model_key, 0)
+            self.misses.setdefault(model_key, 0)
+        LOOKUP_ENTRIES.labels(model_key).set(len(table))
+        return True
+
+    def key(self, data) -> tuple:
+        return tuple(float(getattr(data, f)) for f in self.features)
+
+    def get(self, model_key, data, version):
+        """
+        Return (prediction, probabilities) or None on a miss.
+        """
+        table = self.tables.get(model_key)
+        if table is None or table.version != version:
+            return None
+
+        result = table.get(self.key(data))
+
+        with self._lock:
+            if result is None:
+                self.misses[model_key] += 1
+                LOOKUP_MISSES.labels(model_key).inc()
+            else:
+                self.hits[model_key] += 1
+                LOOKUP_HITS.labels(model_key).inc()
+            total = self.hits[model_key] + self.misses[model_key]
+            LOOKUP_HIT_RATIO.labels(model_key).set(
+                self.hits[model_key] / total
+            )
+
+        return result
@@ -0,0 +1,187 @@
+"""
+On-demand profiling of the live service.
+
+Stack sampling: for the requested number of seconds, every thread's
+current Python stack (event loop, threadpool inference workers, audit
+writer, shadow pool, ...) is read with ``sys._current_frames()`` at a
+fixed interval and counted. Nothing is installed in the profiled threads,
+so the cost to them is one GIL hand-off per sample. Stacks are returned
+in the collapsed format (``thread;outer;...;inner count`` per line) read
+by flamegraph.pl, inferno and speedscope.
+
+Request tracing: a sampled fraction of endpoint calls runs under
+cProfile. cProfile only sees the thread that enabled it, so the wrapper
+runs inside the endpoint (the worker thread for sync routes). One trace
+is recorded at a time; calls sampled while another is being traced run
+unprofiled. The most recent traces are kept in memory as pstats data.
+"""
+
+import os
+import sys
+import time
+import random
+import marshal
+import cProfile
+import threading
+import itertools
+from collections import Counter, deque
+from functools import wraps
+
+# Innermost frames of threads that are blocked waiting for work
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+}
+
+
+def _frame_label(code, cache: dict) -> str:
+    label = cache.get(code)
+    if label is None:
+        path = code.co_filename
+        # Shortest path relative to sys.path, e.g. src/serving/app.py
+        for root in sorted(filter(None, sys.path), key=len, reverse=True):
+            if path.startswith(root + os.sep):
+                path = path[len(root) + 1:]
+                break
+        label = f"{code.co_name} ({path}:{code.co_firstlineno})"
+        cache[code] = label
+    return label
+
+
+class StackSampler:
+    """
+    Statistical sampler of all threads' Python stacks.
+    """
+
+    def __init__(self, interval: float = 0.005, idle: bool = False,
+                 max_depth: int = 128):
+        self.interval = interval
+        self.idle = idle
+        self.max_depth = max_depth
+        self.stacks = Counter()
+        self.samples = 0
+        self._labels = {}
+
+    def _is_idle(self, frame) -> bool:
+        code = frame.f_code
+        return (os.path.basename(code.co_filename), code.co_name) \
+            in IDLE_FRAMES
+
+    def sample(self) -> None:
+        """
+        Record the current stack of every other thread once.
+        """
+        names = {t.ident: t.name for t in threading.enumerate()}
+        own = threading.get_ident()
+
+        for ident, frame in sys._current_frames().items():
+            if ident == own or (not self.idle and self._is_idle(frame)):
+                continue
+            frames = []
+            while frame is not None and len(frames) < self.max_depth:
+                frames.append(_frame_label(frame.f_code, self._labels))
+                frame = frame.f_back
+            frames.append(names.get(ident, f"thread-{ident}"))
+            self.stacks[";".join(reversed(frames))] += 1
+        self.samples += 1
+
+    def run(self, seconds: float) -> "StackSampler":
+        """
+        Sample until ``seconds`` have elapsed (blocks the calling thread).
+        """
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            self.sample()
+            time.sleep(self.interval)
+        return self
+
+    def collapsed(self) -> str:
+        return "".join(
+            f"{stack} {count}\n"
+            for stack, count in sorted(self.stacks.items())
+        )
+
+
+class RequestTrace:
+    """
+    cProfile statistics of one sampled call.
+    """
+
+    def __init__(self, trace_id: int, endpoint: str, started: float,
+                 duration: float, stats: dict):
+        self.trace_id = trace_id
+        self.endpoint = endpoint
+        self.started = started
+        self.duration = duration
+        self.stats = stats
+
+    def dump(self) -> bytes:
+        """
+        Contents of a ``Profile.dump_stats`` file (pstats / snakeviz).
+        """
+        return marshal.dumps(self.stats)
+
+    def summary(self, top: int = 10) -> dict:
+        functions = sorted(self.stats.items(), key=lambda kv: kv[1][3],
+                           reverse=True)[:top]
+        return {
+            "id": self.trace_id,
+            "endpoint": self.endpoint,
+            "started": self.started,
+            "duration_ms": round(self.duration * 1000, 3),
+            "top_cumulative": [
+                {
+                    "function": f"{func} ({os.path.basename(path)}:{line})",
+                    "calls": calls,
+                    "own_ms": round(own * 1000, 3),
+                    "cumulative_ms": round(cumulative * 1000, 3),
+                }
+                for (path, line, func), (_, calls, own, cumulative, _)
+                in functions
+            ],
+        }
+
+
+class RequestProfiler:
+    """
+    Runs a sampled fraction of wrapped calls under cProfile.
+    """
+
+    def __init__(self, fraction: float = 0.0, max_traces: int = 20):
+        self.fraction = fraction
+        self.traces = deque(maxlen=max_traces)
+        self._active = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def wrap(self, func):
+        """
+        Decorate an endpoint; the signature is kept for FastAPI.
+        """
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not (self.fraction and random.random() < self.fraction
+                    and self._active.acquire(blocking=False)):
+                return func(*args, **kwargs)
+
+            profile = cProfile.Profile()
+            started, start = time.time(), time.perf_counter()
+            try:
+                return profile.runcall(func, *args, **kwargs)
+            finally:
+                duration = time.perf_counter() - start
+                self._active.release()
+                profile.create_stats()
+                self.traces.append(RequestTrace(
+                    next(self._ids), func.__name__, started, duration,
+                    profile.stats,
+                ))
+
+        return wrapper
+
+    def get(self, trace_id: int):
+        for trace in list(self.traces):
+            if trace.trace_id == trace_id:
+                return trace
+        return None
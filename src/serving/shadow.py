@@ -0,0 +1,195 @@
+"""
+Shadow and canary evaluation of a candidate model inside the API.
+
+Shadow: a sampled fraction of primary requests is also scored by the
+candidate model on a background thread, off the response path. Agreement
+of the served decisions, probability deltas and candidate latency are
+exported as Prometheus metrics; both models are compared through the
+``decide`` function the endpoints use (calibrated probability at the
+request's threshold), so agreement means the same answer would have been
+served. In-flight shadow work is bounded; when the bound is reached the
+sample is skipped rather than queued, so the primary response never waits.
+
+Canary: a weighted fraction of real responses is served by the candidate.
+"""
+
+import time
+import random
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from prometheus_client import Counter, Histogram
+
+logger = logging.getLogger("heart-disease-api")
+
+SHADOW_REQUESTS = Counter(
+    "shadow_requests_total",
+    "Requests scored by the shadow candidate model",
+    ["primary", "candidate"],
+)
+SHADOW_AGREEMENTS = Counter(
+    "shadow_agreements_total",
+    "Shadow requests where candidate and primary predictions agree",
+    ["primary", "candidate"],
+)
+SHADOW_SKIPPED = Counter(
+    "shadow_skipped_total",
+    "Sampled shadow requests skipped because the shadow pool was busy",
+    ["primary", "candidate"],
+)
+SHADOW_PROBA_DELTA = Histogram(
+    "shadow_probability_delta",
+    "Absolute difference in decided positive-class probability "
+    "(candidate - primary)",
+    ["primary", "candidate"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0),
+)
+SHADOW_LATENCY = Histogram(
+    "shadow_candidate_latency_seconds",
+    "Candidate model inference latency in shadow mode",
+    ["primary", "candidate"],
+)
+CANARY_RESPONSES = Counter(
+    "canary_responses_total",
+    "Real responses served by the canary candidate model",
+    ["primary", "candidate"],
+)
+
+
+def raw_decision(model_key, probs, threshold=None):
+    """
+    Uncalibrated decision at ``threshold`` (0.5 by default).
+    """
+    p = probs[:, 1]
+    threshold = 0.5 if threshold is None else threshold
+    return (p >= threshold).astype(np.int64), p
+
+
+class ShadowEvaluator:
+    """
+    Scores sampled primary requests with a candidate model off-path.
+    """
+
+    def __init__(
+        self,
+        candidate_model,
+        primary: str,
+        candidate: str,
+        shadow_fraction: float = 0.0,
+        canary_weight: float = 0.0,
+        max_in_flight: int = 64,
+        workers: int = 1,
+        rng: random.Random = None,
+        decide=raw_decision,
+    ):
+        self.candidate_model = candidate_model
+        self.labels = (primary, candidate)
+        self.decide = decide
+        self.shadow_fraction = shadow_fraction
+        self.canary_weight = canary_weight
+
+        self.requests = 0
+        self.agreements = 0
+        self.skipped = 0
+
+        self._rng = rng or random.Random()
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._stats_lock = threading.Lock()
+        self._workers = workers
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def _pool(self) -> ThreadPoolExecutor:
+        # Created on first use so the evaluator survives shutdown / restart
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._workers, thread_name_prefix="shadow"
+                )
+            return self._executor
+
+    def route_to_candidate(self) -> bool:
+        """
+        Decide whether this real response is served by the candidate.
+        """
+        routed = (
+            self.canary_weight > 0
+            and self._rng.random() < self.canary_weight
+        )
+        if routed:
+            CANARY_RESPONSES.labels(*self.labels).inc()
+        return routed
+
+    def maybe_submit(self, X, primary_probs, threshold=None) -> bool:
+        """
+        Sample this request for shadow scoring. Never blocks. ``X`` is the
+        scaled input or a zero-argument callable producing it, called only
+        if the request is sampled (lookup hits have no scaled input).
+        ``threshold`` is the request's decision threshold.
+        """
+        if self.shadow_fraction <= 0:
+            return False
+        if self._rng.random() >= self.shadow_fraction:
+            return False
+
+        if not self._slots.acquire(blocking=False):
+            with self._stats_lock:
+                self.skipped += 1
+            SHADOW_SKIPPED.labels(*self.labels).inc()
+            return False
+
+        # The slot is released by _score; free it here if the work never
+        # reaches the pool, and keep the failure off the primary response
+        try:
+            if callable(X):
+                X = X()
+            # X may be a reused per-thread buffer; score a private copy
+            self._pool().submit(self._score, X.copy(), primary_probs,
+                                threshold)
+        except Exception:
+            self._slots.release()
+            logger.exception("Shadow submission failed")
+            return False
+        return True
+
+    def _score(self, X, primary_probs, threshold) -> None:
+        try:
+            start = time.perf_counter()
+            candidate_probs = self.candidate_model.predict_proba(X)
+            latency = time.perf_counter() - start
+
+            primary, candidate = self.labels
+            primary_pred, primary_p = self.decide(
+                primary, np.asarray(primary_probs)[None, :], threshold
+            )
+            candidate_pred, candidate_p = self.decide(
+                candidate, candidate_probs[:1], threshold
+            )
+            agree = int(candidate_pred[0]) == int(primary_pred[0])
+            delta = abs(float(candidate_p[0]) - float(primary_p[0]))
+
+            with self._stats_lock:
+                self.requests += 1
+                self.agreements += int(agree)
+
+            SHADOW_REQUESTS.labels(*self.labels).inc()
+            if agree:
+                SHADOW_AGREEMENTS.labels(*self.labels).inc()
+            SHADOW_PROBA_DELTA.labels(*self.labels).observe(delta)
+            SHADOW_LATENCY.labels(*self.labels).observe(latency)
+        except Exception:
+            logger.exception("Shadow inference failed")
+        finally:
+            self._slots.release()
+
+    def agreement_rate(self) -> float:
+        with self._stats_lock:
+            return self.agreements / self.requests if self.requests else 0.0
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
@@ -0,0 +1,82 @@
+"""
+Ahead-of-time warm-up of the serving code paths.
+
+The first inference after start-up pays for lazy initialisation in
+scikit-learn (input validation, tree traversal code), NumPy/BLAS thread
+pools, pydantic validators and the serving helpers around the models
+(feature encoder buffers, calibration tables, explanations, the binary
+frontend). Running synthetic single-row and batch requests through every
+serving path before reporting readiness moves that cost out of the first
+real requests. The app supplies the paths, built from the same functions
+its endpoints call.
+"""
+
+import time
+import logging
+
+import numpy as np
+from prometheus_client import Gauge
+
+logger = logging.getLogger("heart-disease-api")
+
+WARMUP_DURATION = Gauge(
+    "warmup_duration_seconds",
+    "Time spent warming up models before reporting ready",
+    multiprocess_mode="livemax",
+)
+SERVICE_READY = Gauge(
+    "service_ready",
+    "1 when warm-up has completed and the service accepts traffic",
+    multiprocess_mode="livemin",
+)
+
+
+def synthetic_rows(scaler, n_rows: int, seed: int = 0) -> np.ndarray:
+    """
+    Integer-valued raw feature rows scattered around the training mean.
+    """
+    rng = np.random.default_rng(seed)
+    noise = rng.standard_normal((n_rows, len(scaler.mean_)))
+    return np.round(scaler.mean_ + noise * scaler.scale_)
+
+
+def synthetic_payloads(scaler, feature_names, n_rows: int,
+                       seed: int = 0) -> list:
+    """
+    Request payloads (dicts keyed by ``feature_names``) of synthetic rows.
+    """
+    return [dict(zip(feature_names, row))
+            for row in synthetic_rows(scaler, n_rows, seed).tolist()]
+
+
+def run_warmup(
+    paths: dict,
+    scaler,
+    feature_names,
+    iterations: int = 10,
+    batch_size: int = 32,
+) -> float:
+    """
+    Run a single-row and a batch request through every serving path.
+
+    ``paths`` maps a name to a callable taking a list of request payloads.
+    Returns the warm-up duration in seconds.
+    """
+    start = time.perf_counter()
+
+    single = synthetic_payloads(scaler, feature_names, 1)
+    batch = synthetic_payloads(scaler, feature_names, batch_size, seed=1)
+
+    for _ in range(iterations):
+        for path in paths.values():
+            path(single)
+            path(batch)
+
+    duration = time.perf_counter() - start
+    WARMUP_DURATION.set(duration)
+
+    logger.info(
+        f"Warm-up completed | paths={list(paths)} | "
+        f"iterations={iterations} | time={duration:.3f}s"
+    )
+    return duration
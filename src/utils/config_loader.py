@@ -1,15 +1,286 @@
+"""
+Validated project settings.
+
+``config.json`` is parsed once per process (per path) into a frozen
+``Settings`` object; every training, data and serving module reads the
+same instance through ``get_settings()``. Unknown keys and out-of-range
+values fail at load time instead of at first use.
+
+Any leaf can be overridden from the environment, which is how container
+and Kubernetes deployments configure the service:
+
+- ``serving`` keys use their upper-case name (``MAX_BATCH_SIZE=512``,
+  ``SERVING_ENGINE=sklearn``);
+- other keys use the upper-case section path joined by ``__``
+  (``CALIBRATION__METHOD=sigmoid``, ``DATA__RAW__DOWNLOAD__TIMEOUT=60``).
+
+JSON values (``[...]`` / ``{...}``) are decoded; scalars are coerced by the
+schema. ``CONFIG_PATH`` points at a different config file.
+
+Relative paths (data files, model artifacts, reports, log directories) are
+resolved against the project root, so scripts and the API behave the same
+from any working directory.
+"""
+
+import os
 import json
 from pathlib import Path
+from functools import lru_cache
+from typing import Annotated, Dict, List, Literal, Optional
+
+from pydantic import (
+    AfterValidator,
+    BaseModel,
+    ConfigDict,
+    Field,
+    model_validator,
+)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_CONFIG_PATH = PROJECT_ROOT / "config.json"
+
+
+def _resolve_path(path: str) -> str:
+    if os.path.isabs(path):
+        return path
+    return os.path.normpath(PROJECT_ROOT / path)
+
+
+ProjectPath = Annotated[str, AfterValidator(_resolve_path)]
+
+
+class _Section(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True,
+                              validate_default=True)
+
+
+# -----------------------------
+# Schema
+# -----------------------------
+class DownloadSettings(_Section):
+    max_workers: int = Field(4, ge=1)
+    retries: int = Field(3, ge=0)
+    timeout: float = Field(30, gt=0)
+    chunk_size: int = Field(65536, gt=0)
+    verify_ssl: bool = True
+
+
+class SourceSettings(_Section):
+    name: str
+    url: str
+    file_name: str
+    sha256: Optional[str] = None
+
+
+class RawDataSettings(_Section):
+    url: str
+    base_path: ProjectPath
+    file_name: str
+    file_path: ProjectPath
+    sources_path: Optional[ProjectPath] = None
+    sources: List[SourceSettings] = []
+    download: DownloadSettings = DownloadSettings()
+
+
+class ProcessedDataSettings(_Section):
+    base_path: ProjectPath
+    file_name: str
+    file_path: ProjectPath
+
+
+class DataSettings(_Section):
+    raw: RawDataSettings
+    processed: ProcessedDataSettings
+
+
+class CalibrationSettings(_Section):
+    method: Literal["isotonic", "sigmoid"] = "isotonic"
+    cv: int = Field(5, ge=2)
+    n_jobs: int = -1
+
+
+class DistillationSettings(_Section):
+    student: Literal["forest", "tree"] = "forest"
+    n_estimators: int = Field(20, ge=1)
+    max_depth: int = Field(5, ge=1)
+    cv: int = Field(5, ge=2)
+    max_accuracy_drop: float = Field(0.02, ge=0.0)
+    max_auc_drop: float = Field(0.02, ge=0.0)
+    report_path: ProjectPath = "models/distillation.json"
+
+
+class QuantizationSettings(_Section):
+    report_path: ProjectPath = "models/quantization.json"
+
 
+class SchemaSettings(_Section):
+    columns: List[str] = Field(..., min_length=2)
 
-def load_config(config_path: str = "config.json") -> dict:
+
+class ServingSettings(_Section):
+    # Engine & artifacts
+    serving_engine: Literal["numpy", "quantized", "sklearn"] = "numpy"
+    random_forest_variant: Literal["full", "distilled"] = "full"
+    scaler_path: ProjectPath = "data/processed/standard_scaler.pkl"
+    processed_data_path: ProjectPath = (
+        "data/processed/heart_disease_processed.csv"
+    )
+    lr_model_path: ProjectPath = "models/logistic_regression_model.pkl"
+    rf_model_path: ProjectPath = "models/random_forest_model.pkl"
+    engine_params_path: ProjectPath = "models/engine_params.npz"
+    quantized_params_path: ProjectPath = (
+        "models/engine_params_quantized.npz"
+    )
+    distilled_params_path: ProjectPath = "models/distilled_forest.npz"
+    distilled_calibration_path: ProjectPath = (
+        "models/distilled_calibration.json"
+    )
+    distilled_quantized_params_path: ProjectPath = (
+        "models/distilled_forest_quantized.npz"
+    )
+    calibration_path: ProjectPath = "models/calibration.json"
+    drift_reference_path: ProjectPath = "models/drift_reference.json"
+
+    # Decisions
+    calibration_enabled: bool = True
+    decision_threshold: float = Field(0.5, ge=0.0, le=1.0)
+
+    # Request handling
+    max_batch_size: int = Field(256, ge=1)
+    warmup_iterations: int = Field(10, ge=0)
+    warmup_batch_size: int = Field(32, ge=1)
+    lookup_enabled: bool = False
+    lookup_max_entries: int = Field(4096, ge=1)
+
+    # Binary frontend (port 0 disables it)
+    binary_port: int = Field(0, ge=0, le=65535)
+    binary_inline_rows: int = Field(8, ge=0)
+    binary_threads: int = Field(1, ge=1)
+
+    # Monitoring
+    drift_window: int = Field(1000, ge=1)
+    reject_out_of_domain: bool = False
+    audit_enabled: bool = True
+    audit_log_dir: ProjectPath = "logs/audit"
+    audit_batch_size: int = Field(256, ge=1)
+    audit_max_buffer: int = Field(10000, ge=1)
+    audit_drop_policy: Literal["newest", "oldest"] = "newest"
+
+    # Shadow / canary
+    shadow_fraction: float = Field(0.0, ge=0.0, le=1.0)
+    canary_weight: float = Field(0.0, ge=0.0, le=1.0)
+    shadow_max_in_flight: int = Field(64, ge=1)
+
+    # Admission control
+    admission_enabled: bool = True
+    admission_initial_limit: int = Field(20, ge=1)
+    admission_min_limit: int = Field(2, ge=1)
+    admission_max_limit: int = Field(200, ge=1)
+    admission_target_latency_ms: float = Field(50, gt=0)
+    admission_batch_target_latency_ms: float = Field(500, gt=0)
+
+    # Profiling (admin endpoints, X-Admin-Token header)
+    profiling_enabled: bool = False
+    admin_token: Optional[str] = None
+    profile_max_seconds: float = Field(30, gt=0)
+    profile_interval_ms: float = Field(5, gt=0)
+    profile_request_fraction: float = Field(0.0, ge=0.0, le=1.0)
+    profile_max_traces: int = Field(20, ge=1)
+
+    @model_validator(mode="after")
+    def _check_limits(self):
+        if not (self.admission_min_limit <= self.admission_initial_limit
+                <= self.admission_max_limit):
+            raise ValueError(
+                "admission limits must satisfy min <= initial <= max"
+            )
+        if self.warmup_batch_size > self.max_batch_size:
+            raise ValueError("warmup_batch_size exceeds max_batch_size")
+        if self.profiling_enabled and not self.admin_token:
+            raise ValueError("profiling_enabled requires admin_token")
+        return self
+
+
+class Settings(_Section):
+    model_config = ConfigDict(extra="forbid", frozen=True,
+                              populate_by_name=True)
+
+    data: DataSettings
+    calibration: CalibrationSettings = CalibrationSettings()
+    distillation: DistillationSettings = DistillationSettings()
+    quantization: QuantizationSettings = QuantizationSettings()
+    schema_: SchemaSettings = Field(..., alias="schema")
+    serving: ServingSettings = ServingSettings()
+
+
+# -----------------------------
+# Environment Overlay
+# -----------------------------
+def _env_name(path) -> str:
+    if path[0] == "serving":
+        path = path[1:]
+    return "__".join(path).upper()
+
+
+def _env_value(raw: str):
+    if raw[:1] in "[{":
+        return json.loads(raw)
+    return raw
+
+
+def _overlay(model, values: dict, environ, path=()) -> dict:
+    """
+    Copy of ``values`` with environment overrides applied, walking the
+    fields of ``model`` so only known keys are looked up.
+    """
+    values = dict(values)
+    for name, field in model.model_fields.items():
+        key = field.alias or name
+        annotation = field.annotation
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            nested = values.get(key)
+            if isinstance(nested, BaseModel):
+                nested = nested.model_dump(by_alias=True)
+            values[key] = _overlay(annotation, nested or {}, environ,
+                                   path + (key,))
+            continue
+        env_name = _env_name(path + (key,))
+        if env_name in environ:
+            values[key] = _env_value(environ[env_name])
+    return values
+
+
+# -----------------------------
+# Loading
+# -----------------------------
+def read_settings(config_path=None, environ=None) -> Settings:
     """
-    Load JSON configuration file.
+    Parse and validate a config file with environment overrides; uncached.
     """
-    config_file = Path(config_path)
+    environ = os.environ if environ is None else environ
+    config_file = Path(
+        config_path or environ.get("CONFIG_PATH") or DEFAULT_CONFIG_PATH
+    )
 
     if not config_file.exists():
         raise FileNotFoundError(f"Config file not found: {config_file}")
 
     with open(config_file, "r") as f:
-        return json.load(f)
+        raw = json.load(f)
+
+    return Settings.model_validate(_overlay(Settings, raw, environ))
+
+
+@lru_cache(maxsize=None)
+def get_settings(config_path=None) -> Settings:
+    """
+    Process-wide settings, loaded on first use.
+    """
+    return read_settings(config_path)
+
+
+def load_config(config_path=None) -> Dict:
+    """
+    Settings as a plain nested dict (the layout of ``config.json``).
+    """
+    return get_settings(config_path).model_dump(by_alias=True)
@@ -0,0 +1,187 @@
+"""
+Performance measurement, JSON baselines and regression comparison.
+
+``measure`` times a callable the way pytest-benchmark does: warm-up
+calls, then repeated rounds (a fixed count, or as many as fit in a time
+budget) summarised as min / median / mean / p95 / stddev. The perf suite
+in ``tests/perf`` records one entry per benchmark and saves the session
+as JSON together with the machine it ran on; ``compare`` flags
+benchmarks whose statistic grew by more than a threshold relative to a
+stored baseline.
+
+Usage:
+    pytest tests/perf --perf --perf-save perf.json
+    python -m src.utils.perf compare tests/perf/baseline.json perf.json \\
+        --threshold 0.25
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import platform
+import argparse
+import statistics
+from datetime import datetime, timezone
+
+import numpy as np
+from tabulate import tabulate
+
+STATS = ("min", "median", "mean", "p95", "max")
+
+
+def summarise(samples: list) -> dict:
+    """
+    Statistics (seconds) over per-round durations.
+    """
+    ordered = sorted(samples)
+    p95_index = min(len(ordered) - 1, math.ceil(0.95 * len(ordered)) - 1)
+    mean = statistics.fmean(ordered)
+    return {
+        "rounds": len(ordered),
+        "min": ordered[0],
+        "max": ordered[-1],
+        "mean": mean,
+        "median": statistics.median(ordered),
+        "p95": ordered[p95_index],
+        "stddev": statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+        "ops": 1.0 / mean if mean > 0 else math.inf,
+    }
+
+
+def measure(func, *args, rounds: int = None, min_rounds: int = 5,
+            max_time: float = 1.0, max_rounds: int = 100_000,
+            warmup: int = 1, **kwargs):
+    """
+    Return (last result, stats). With ``rounds`` the callable runs
+    exactly that many times; otherwise at least ``min_rounds`` times and
+    until ``max_time`` seconds have been spent.
+    """
+    result = None
+    for _ in range(warmup):
+        result = func(*args, **kwargs)
+
+    samples = []
+    started = time.perf_counter()
+    while True:
+        if rounds is not None:
+            if len(samples) >= rounds:
+                break
+        elif len(samples) >= min_rounds and (
+            time.perf_counter() - started >= max_time
+            or len(samples) >= max_rounds
+        ):
+            break
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        samples.append(time.perf_counter() - start)
+
+    return result, summarise(samples)
+
+
+def machine_info() -> dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+    }
+
+
+def save_results(benchmarks: dict, path) -> dict:
+    results = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "machine": machine_info(),
+        "benchmarks": benchmarks,
+    }
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    return results
+
+
+def load_results(path) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.25,
+            stat: str = "median") -> list:
+    """
+    One row per benchmark: (name, baseline, current, ratio, status) with
+    status regression / improved / ok / new / missing.
+    """
+    if stat not in STATS:
+        raise ValueError(f"stat must be one of {STATS}")
+
+    base, cur = baseline["benchmarks"], current["benchmarks"]
+    rows = []
+    for name in sorted(set(base) | set(cur)):
+        if name not in base:
+            rows.append((name, None, cur[name][stat], None, "new"))
+            continue
+        if name not in cur:
+            rows.append((name, base[name][stat], None, None, "missing"))
+            continue
+
+        before, after = base[name][stat], cur[name][stat]
+        ratio = after / before if before > 0 else math.inf
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 / (1 + threshold):
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append((name, before, after, ratio, status))
+    return rows
+
+
+def format_comparison(rows: list, stat: str = "median") -> str:
+    def ms(v):
+        return "" if v is None else f"{v * 1000:.3f}"
+
+    return tabulate(
+        [
+            [name, ms(before), ms(after),
+             "" if ratio is None else f"{ratio:.2f}x", status]
+            for name, before, after, ratio, status in rows
+        ],
+        headers=["benchmark", f"baseline {stat} (ms)",
+                 f"current {stat} (ms)", "ratio", "status"],
+        tablefmt="psql",
+    )
+
+
+def regressions(rows: list) -> list:
+    return [row for row in rows if row[-1] == "regression"]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Perf baseline tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    cmp = sub.add_parser("compare", help="Compare results to a baseline")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.add_argument("--threshold", type=float, default=0.25,
+                     help="Allowed relative slowdown (0.25 = +25%%)")
+    cmp.add_argument("--stat", default="median", choices=STATS)
+    args = parser.parse_args()
+
+    baseline, current = load_results(args.baseline), load_results(
+        args.current
+    )
+    rows = compare(baseline, current, args.threshold, args.stat)
+    print(format_comparison(rows, args.stat))
+
+    if baseline["machine"] != current["machine"]:
+        print("Note: baseline was recorded on a different machine "
+              f"({baseline['machine']})")
+
+    slow = regressions(rows)
+    if slow:
+        print(f"{len(slow)} regression(s) above "
+              f"{args.threshold:.0%}: {', '.join(r[0] for r in slow)}")
+        sys.exit(1)
+    print("No regressions")
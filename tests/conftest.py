@@ -0,0 +1,114 @@
+"""
+Shared pytest configuration.
+
+Performance benchmarks under ``tests/perf`` are skipped unless ``--perf``
+is given; they use the ``benchmark`` fixture below and can be saved as a
+JSON baseline and compared against one in the same run.
+"""
+
+import pytest
+
+from src.utils.perf import (
+    STATS,
+    compare,
+    format_comparison,
+    load_results,
+    measure,
+    regressions,
+    save_results,
+)
+
+_results = {}
+_comparison = []
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("perf", "performance regression suite")
+    group.addoption("--perf", action="store_true",
+                    help="Run the benchmarks in tests/perf")
+    group.addoption("--perf-save", metavar="PATH",
+                    help="Write benchmark results to a JSON file")
+    group.addoption("--perf-compare", metavar="PATH",
+                    help="Fail when slower than this JSON baseline")
+    group.addoption("--perf-threshold", type=float, default=0.25,
+                    help="Allowed relative slowdown (default 0.25)")
+    group.addoption("--perf-stat", default="median", choices=STATS,
+                    help="Statistic compared with the baseline "
+                         "(default median)")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--perf"):
+        return
+    skip = pytest.mark.skip(reason="benchmarks need --perf")
+    for item in items:
+        if "benchmark" in item.fixturenames:
+            item.add_marker(skip)
+
+
+class Benchmark:
+    """
+    Callable fixture: ``benchmark(func, *args, rounds=..., **kwargs)``
+    times ``func``, records the stats under the test's name and returns
+    the function's result.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.stats = None
+
+    def __call__(self, func, *args, rounds=None, min_rounds=5,
+                 max_time=1.0, warmup=1, **kwargs):
+        result, self.stats = measure(
+            func, *args, rounds=rounds, min_rounds=min_rounds,
+            max_time=max_time, warmup=warmup, **kwargs
+        )
+        _results[self.name] = self.stats
+        return result
+
+
+@pytest.fixture
+def benchmark(request):
+    return Benchmark(request.node.name)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    if not _results:
+        return
+
+    path = config.getoption("--perf-save")
+    current = save_results(_results, path) if path else {
+        "benchmarks": _results
+    }
+
+    baseline_path = config.getoption("--perf-compare")
+    if baseline_path:
+        _comparison[:] = compare(load_results(baseline_path), current,
+                                 config.getoption("--perf-threshold"),
+                                 config.getoption("--perf-stat"))
+        if regressions(_comparison):
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if not _results:
+        return
+    terminalreporter.section("benchmarks (ms)")
+    for name, stats in _results.items():
+        terminalreporter.write_line(
+            f"{name:<45} median {stats['median'] * 1000:9.3f} | "
+            f"min {stats['min'] * 1000:9.3f} | "
+            f"p95 {stats['p95'] * 1000:9.3f} | rounds {stats['rounds']}"
+        )
+    if _comparison:
+        terminalreporter.section("comparison with baseline")
+        terminalreporter.write_line(
+            format_comparison(_comparison, config.getoption("--perf-stat"))
+        )
+        slow = regressions(_comparison)
+        if slow:
+            terminalreporter.write_line(
+                f"{len(slow)} regression(s): "
+                f"{', '.join(row[0] for row in slow)}", red=True
+            )
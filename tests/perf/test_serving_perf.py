@@ -0,0 +1,102 @@
+"""
+Serving performance benchmarks (run with --perf)
+Covers:
+- prepare_input (validated payload -> scaled matrix)
+- Every predict / explain endpoint through an in-process client,
+  single row and batch
+- Model artifact load
+- API cold-start import time
+"""
+
+import json
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+import src.serving.app as serving
+from src.serving.engines import load_engines, load_forest
+from src.serving.importtime import profile_import
+
+with open("tests/sample_request.json") as f:
+    SAMPLE = json.load(f)
+
+BATCH_SIZE = 64
+BATCH = {
+    "instances": pd.read_csv(serving.PROCESSED_DATA_PATH)[serving.FEATURES]
+    .head(BATCH_SIZE)
+    .to_dict(orient="records")
+}
+
+ENDPOINTS = [
+    "/predict/logistic",
+    "/predict/random-forest",
+    "/explain/logistic",
+    "/explain/random-forest",
+]
+
+
+@pytest.fixture(scope="module")
+def client():
+    # Keep audit-log disk writes out of the request timings
+    serving.AUDIT_ENABLED = False
+    try:
+        yield TestClient(serving.app)
+    finally:
+        serving.AUDIT_ENABLED = serving.settings.audit_enabled
+
+
+def test_prepare_input(benchmark):
+    data = serving.HeartDiseaseInput(**SAMPLE)
+
+    X = benchmark(serving.prepare_input, data)
+
+    assert X.shape == (1, len(serving.FEATURES))
+
+
+@pytest.mark.parametrize("path", ENDPOINTS)
+def test_endpoint_single(benchmark, client, path):
+    response = benchmark(client.post, path, json=SAMPLE)
+
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("path", ENDPOINTS)
+def test_endpoint_batch(benchmark, client, path):
+    response = benchmark(client.post, f"{path}/batch", json=BATCH)
+
+    assert response.status_code == 200
+
+
+def test_load_engine_params(benchmark):
+    scaler, lr, rf = benchmark(load_engines, serving.ENGINE_PARAMS_PATH)
+
+    assert rf.roots.size > 0
+
+
+def test_load_pickled_models(benchmark):
+    def load():
+        return [serving.load_pickle(path) for path in (
+            serving.SCALER_PATH, serving.LR_MODEL_PATH, serving.RF_MODEL_PATH
+        )]
+
+    assert len(benchmark(load)) == 3
+
+
+def test_load_distilled_forest(benchmark):
+    if not serving.DISTILLED_PARAMS_PATH.exists():
+        pytest.skip("no distilled forest artifact")
+
+    rf = benchmark(load_forest, serving.DISTILLED_PARAMS_PATH)
+
+    assert rf.roots.size > 0
+
+
+def test_app_import(benchmark):
+    # Every round is a fresh interpreter, so no warm-up round
+    profile = benchmark(
+        profile_import, "src.serving.app", env={"AUDIT_ENABLED": "false"},
+        rounds=3, warmup=0,
+    )
+
+    assert "sklearn" not in profile["modules"]
@@ -0,0 +1,53 @@
+"""
+Training performance benchmarks (run with --perf)
+Covers:
+- train_random_forest_pipeline end to end on the bundled CSV
+- The same pipeline on a larger synthetic make_classification dataset
+"""
+
+import pandas as pd
+import pytest
+from sklearn.datasets import make_classification
+
+from src.models.train_evaluate_random_forest import (
+    train_random_forest_pipeline
+)
+from src.utils.config_loader import get_settings
+
+FEATURES = [c for c in get_settings().schema_.columns if c != "target"]
+
+
+@pytest.fixture(scope="module")
+def bundled():
+    return pd.read_csv(get_settings().data.processed.file_path)
+
+
+@pytest.fixture(scope="module")
+def synthetic():
+    X, y = make_classification(
+        n_samples=2000, n_features=len(FEATURES), n_informative=8,
+        random_state=42,
+    )
+    df = pd.DataFrame(X, columns=FEATURES)
+    df["target"] = y
+    return df
+
+
+def _train(df, plots_dir):
+    return train_random_forest_pipeline(
+        df=df, save_scaler_path=None, save_plots_dir=str(plots_dir)
+    )
+
+
+def test_train_random_forest_bundled(benchmark, bundled, tmp_path):
+    rf, metrics, _ = benchmark(_train, bundled, tmp_path, rounds=3,
+                               warmup=0)
+
+    assert metrics["roc_auc"] > 0.5
+
+
+def test_train_random_forest_synthetic(benchmark, synthetic, tmp_path):
+    rf, metrics, _ = benchmark(_train, synthetic, tmp_path, rounds=3,
+                               warmup=0)
+
+    assert metrics["roc_auc"] > 0.5
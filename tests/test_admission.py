@@ -0,0 +1,124 @@
+"""
+Unit tests for adaptive admission control
+Covers:
+- Rejection at the concurrency limit
+- AIMD limit growth and back-off, at most once per latency window
+- Separate limiters and targets for batch and explain routes
+- 503 responses from the API middleware
+- Health endpoints bypassing the limiter
+"""
+
+import json
+
+from fastapi.testclient import TestClient
+
+from src.serving.admission import AdaptiveLimiter, AdmissionController
+
+SAMPLE = json.load(open("tests/sample_request.json"))
+
+
+# --------------------------------------------------
+# Test 1: Requests above the limit are rejected
+# --------------------------------------------------
+def test_rejects_above_limit():
+    limiter = AdaptiveLimiter("test-reject", initial_limit=2)
+
+    assert limiter.try_acquire()
+    assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+    assert limiter.rejected == 1
+
+    limiter.release(0.001)
+    assert limiter.try_acquire()
+
+
+# --------------------------------------------------
+# Test 2: Fast requests grow the limit, slow ones shrink it
+# --------------------------------------------------
+def test_aimd_adjustment():
+    now = [0.0]
+    limiter = AdaptiveLimiter("test-aimd", initial_limit=10, min_limit=2,
+                              max_limit=20, target_latency=0.05,
+                              clock=lambda: now[0])
+
+    for _ in range(100):
+        limiter.try_acquire()
+        now[0] += 0.01
+        limiter.release(0.01)
+    grown = limiter.limit
+
+    for _ in range(100):
+        limiter.try_acquire()
+        now[0] += 0.5
+        limiter.release(0.5)
+
+    assert 10 < grown <= 20
+    assert limiter.limit == 2
+
+
+def test_backoff_once_per_window():
+    now = [0.0]
+    limiter = AdaptiveLimiter("test-burst", initial_limit=20, min_limit=2,
+                              target_latency=0.05, clock=lambda: now[0])
+
+    # A burst of 20 concurrent slow requests cuts the limit once
+    for _ in range(20):
+        limiter.try_acquire()
+    now[0] += 0.5
+    for _ in range(20):
+        limiter.release(0.5, failed=True)
+    assert limiter.limit == 18
+
+    # The next slow request started after the cut and cuts again
+    limiter.try_acquire()
+    now[0] += 0.5
+    limiter.release(0.5)
+    assert limiter.limit == 18 * 0.9
+
+
+def test_route_kinds_limited_separately():
+    controller = AdmissionController(
+        {"/predict/m": "m:predict", "/predict/m/batch": "m:predict-batch",
+         "/explain/m": "m:explain"},
+        targets={"m:predict-batch": 0.5}, target_latency=0.05,
+    )
+    single = controller.limiter_for("/predict/m")
+    batch = controller.limiter_for("/predict/m/batch")
+
+    assert len(controller.limiters) == 3
+    assert batch.target_latency == 0.5 and single.target_latency == 0.05
+    for _ in range(5):
+        batch.try_acquire()
+        batch.release(1.0)
+    assert single.limit == 20
+
+
+# --------------------------------------------------
+# Test 3: API sheds load with 503 but always serves /health
+# --------------------------------------------------
+def test_api_load_shedding(monkeypatch):
+    import src.serving.app as serving
+
+    controller = AdmissionController(
+        {"/predict/logistic": "test-api",
+         "/predict/logistic/batch": "test-api-batch"}, initial_limit=1
+    )
+    monkeypatch.setattr(serving, "admission", controller)
+    client = TestClient(serving.app)
+
+    limiter = controller.limiter_for("/predict/logistic")
+    assert limiter.try_acquire()  # occupy the only slot
+
+    response = client.post("/predict/logistic", json=SAMPLE)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert client.get("/health").status_code == 200
+    assert client.post("/predict/random-forest", json=SAMPLE) \
+        .status_code == 200
+    assert client.post("/predict/logistic/batch",
+                       json={"instances": [SAMPLE]}).status_code == 200
+
+    limiter.release(0.0)
+    assert client.post("/predict/logistic", json=SAMPLE).status_code == 200
+    assert 'admission_rejected_total{model="test-api"} 1.0' in \
+        client.get("/metrics").text
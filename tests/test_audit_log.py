@@ -0,0 +1,113 @@
+"""
+Unit tests for the asynchronous prediction audit log
+Covers:
+- Batched flush to gzip NDJSON segments
+- Segment rotation
+- Bounded drop policies
+- Audit records written by the API
+- Replay of recorded traffic at the recorded model and threshold
+"""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.serving.audit import AuditSink, iter_records, replay, replay_path
+
+SAMPLE = json.load(open("tests/sample_request.json"))
+
+
+# --------------------------------------------------
+# Test 1: Records are flushed and read back in order
+# --------------------------------------------------
+def test_flush_and_read_back(tmp_path):
+    sink = AuditSink(tmp_path, segment_records=4)
+
+    for i in range(10):
+        sink.record({"i": i})
+    sink.flush()
+    for i in range(10, 12):
+        sink.record({"i": i})
+    sink.close()
+
+    records = list(iter_records(tmp_path))
+
+    assert [r["i"] for r in records] == list(range(12))
+    assert len(list(tmp_path.glob("audit-*.ndjson.gz"))) == 2
+
+
+# --------------------------------------------------
+# Test 2: Full buffer drops newest or oldest records
+# --------------------------------------------------
+@pytest.mark.parametrize("policy,kept", [
+    ("newest", [0, 1, 2]),
+    ("oldest", [2, 3, 4]),
+])
+def test_drop_policy(tmp_path, policy, kept):
+    sink = AuditSink(tmp_path, max_buffer=3, drop_policy=policy)
+
+    results = [sink.record({"i": i}) for i in range(5)]
+    sink.flush()
+
+    assert results == [True, True, True, False, False]
+    assert sink.dropped == 2
+    assert [r["i"] for r in iter_records(tmp_path)] == kept
+
+
+# --------------------------------------------------
+# Test 3: Background thread flushes on close
+# --------------------------------------------------
+def test_background_flush(tmp_path):
+    sink = AuditSink(tmp_path, batch_size=2, flush_interval=60)
+    sink.start()
+
+    for i in range(5):
+        sink.record({"i": i})
+    sink.close()
+
+    assert sink.written == 5
+
+
+# --------------------------------------------------
+# Test 4: API predictions are audited and replayable
+# --------------------------------------------------
+def test_api_audit_and_replay(tmp_path, monkeypatch):
+    import src.serving.app as serving
+
+    monkeypatch.setattr(serving, "audit_sink", AuditSink(tmp_path))
+
+    with TestClient(serving.app) as client:
+        client.post("/predict/logistic", json=SAMPLE)
+        client.post("/predict/random-forest?threshold=0.9", json=SAMPLE)
+        # Canary response on the logistic endpoint, served by the forest
+        monkeypatch.setattr(serving.shadow, "canary_weight", 1.0)
+        client.post("/predict/logistic?threshold=0.2", json=SAMPLE)
+
+    records = list(iter_records(tmp_path))
+
+    assert [r["model"] for r in records] == [
+        "logistic-regression", "random-forest", "random-forest"
+    ]
+    assert [r["canary"] for r in records] == [False, False, True]
+    assert [r["threshold"] for r in records] == [
+        serving.DECISION_THRESHOLD, 0.9, 0.2
+    ]
+    assert records[0]["inputs"] == SAMPLE
+    assert records[0]["model_version"] == serving.MODEL_VERSIONS[
+        "logistic-regression"
+    ]
+    assert records[1]["calibration_version"] == \
+        serving.CALIBRATION_VERSIONS["random-forest"]
+    assert records[2]["endpoint"] == "/predict/logistic"
+    assert replay_path(records[2]) == "/predict/random-forest?threshold=0.2"
+
+    monkeypatch.setattr(serving.shadow, "canary_weight", 0.0)
+    with TestClient(serving.app) as client:
+        report = replay(
+            records, lambda path, payload: client.post(path, json=payload)
+            .json()
+        )
+
+    assert report["requests"] == 3
+    assert report["agreement"] == 1.0
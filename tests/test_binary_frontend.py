@@ -0,0 +1,131 @@
+"""
+Unit tests for the binary inference frontend
+Covers:
+- Parity with the HTTP endpoints
+- Pipelined (streaming) batches answered in order
+- Malformed frames rejected without dropping the connection
+- Startup alongside the HTTP API
+"""
+
+import asyncio
+import json
+import socket
+import threading
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+import src.serving.app as serving
+from src.serving.binary import (
+    REQUEST_HEADER,
+    BinaryClient,
+    BinaryServer,
+)
+
+SAMPLE = json.load(open("tests/sample_request.json"))
+ROW = np.array([[SAMPLE[f] for f in serving.FEATURES]], dtype=float)
+
+
+@pytest.fixture
+def binary_port():
+    server = BinaryServer(serving.MODELS, serving.encoder, max_batch=64,
+                          inline_rows=4, decide=serving.classify)
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    started = asyncio.run_coroutine_threadsafe(
+        server.start("127.0.0.1", 0), loop
+    ).result()
+    yield started.sockets[0].getsockname()[1]
+
+    asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+
+
+def _batch(n):
+    X = np.repeat(ROW, n, axis=0)
+    X[:, 0] = np.linspace(30, 75, n).round()
+    return X
+
+
+# --------------------------------------------------
+# Test 1: Same predictions as the HTTP endpoints
+# --------------------------------------------------
+@pytest.mark.parametrize("model,path", [
+    ("logistic-regression", "/predict/logistic"),
+    ("random-forest", "/predict/random-forest"),
+])
+def test_parity_with_http(binary_port, model, path):
+    client = TestClient(serving.app)
+    X = _batch(16)
+
+    with BinaryClient(port=binary_port) as binary:
+        predictions, probs = binary.predict(model, X)
+
+    for row, prediction, p in zip(X, predictions, probs):
+        body = client.post(
+            path, json=dict(zip(serving.FEATURES, row.tolist()))
+        ).json()
+        assert body["prediction"] == prediction
+        assert body["confidence"] == round(float(p[prediction]), 3)
+
+
+# --------------------------------------------------
+# Test 2: Pipelined batches are answered in order
+# --------------------------------------------------
+def test_streaming_batches(binary_port):
+    batches = [_batch(n) for n in (1, 5, 64, 3, 20)] * 10
+    expected = [serving.classify(
+        "random-forest",
+        serving.rf_model.predict_proba(serving.scaler.transform(X)),
+    ) for X in batches]
+
+    with BinaryClient(port=binary_port) as binary:
+        results = list(binary.stream("random-forest", batches, window=8))
+
+    assert len(results) == len(batches)
+    for (predictions, probs), (want, p) in zip(results, expected):
+        np.testing.assert_allclose(probs[:, 1], p)
+        assert list(predictions) == list(want)
+
+
+# --------------------------------------------------
+# Test 3: Bad frames get an error, connection stays usable
+# --------------------------------------------------
+def test_bad_requests(binary_port):
+    with BinaryClient(port=binary_port) as binary:
+        with pytest.raises(RuntimeError, match="features"):
+            binary.predict("logistic-regression", ROW[:, :5])
+        with pytest.raises(RuntimeError, match="rows"):
+            binary.predict("logistic-regression", _batch(65))
+
+        binary.sock.sendall(REQUEST_HEADER.pack(7, 9, 13, 1) + ROW.tobytes())
+        with pytest.raises(RuntimeError, match="Unknown model"):
+            binary._receive()
+
+        predictions, _ = binary.predict("logistic-regression", ROW)
+        assert len(predictions) == 1
+
+
+# --------------------------------------------------
+# Test 4: API lifespan serves the binary port
+# --------------------------------------------------
+def test_started_with_api(monkeypatch):
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    monkeypatch.setattr(serving, "BINARY_PORT", port)
+    monkeypatch.setattr(serving, "AUDIT_ENABLED", False)
+
+    with TestClient(serving.app):
+        with BinaryClient(port=port) as binary:
+            predictions, _ = binary.predict("random-forest", ROW)
+
+    expected, _ = serving.classify(
+        "random-forest",
+        serving.rf_model.predict_proba(serving.scaler.transform(ROW)),
+    )
+    assert predictions[0] == expected[0]
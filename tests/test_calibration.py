@@ -0,0 +1,140 @@
+"""
+Unit tests for probability calibration and decision thresholds
+Covers:
+- Isotonic and Platt calibration tables from out-of-fold scores
+- Serving-time interpolation matches the fitted calibrator
+- Tables tied to the model version they were fitted for
+- Per-request and per-deployment thresholds on the API
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sklearn.isotonic import IsotonicRegression
+from sklearn.naive_bayes import GaussianNB
+
+from src.models.calibration import calibrate, calibrate_scores, fit_isotonic
+from src.serving.calibration import Calibrator, decide, load_calibrators
+
+SAMPLE = json.load(open("tests/sample_request.json"))
+
+
+def _data(n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 6))
+    # Correlated features make naive Bayes badly overconfident
+    X[:, 1:] += X[:, :1] * 2
+    y = (X[:, 0] + rng.normal(scale=1.0, size=n) > 0).astype(int)
+    return X, y
+
+
+# --------------------------------------------------
+# Test 1: Calibration tables improve Brier score
+# --------------------------------------------------
+@pytest.mark.parametrize("method", ["isotonic", "sigmoid"])
+def test_calibration_table(method):
+    X, y = _data()
+
+    table = calibrate(GaussianNB(), X, y, method=method, cv=5, n_jobs=2,
+                      version="v1")
+
+    assert table["method"] == method
+    assert table["model_version"] == "v1"
+    assert np.all(np.diff(table["x"]) >= 0)
+    assert np.all(np.diff(table["y"]) >= 0)
+    assert table["brier_calibrated"] < table["brier_raw"]
+
+    with pytest.raises(ValueError):
+        calibrate(GaussianNB(), X, y, method="beta")
+
+
+def test_identity_when_brier_does_not_improve():
+    # Scores are already the true probabilities: isotonic can only overfit
+    rng = np.random.default_rng(0)
+    scores = rng.uniform(0.05, 0.95, size=200)
+    y = (rng.uniform(size=200) < scores).astype(int)
+
+    table = calibrate_scores(scores, y, method="isotonic")
+
+    assert table["brier_calibrated"] >= table["brier_raw"]
+    assert table["method"] == "identity"
+    assert (table["x"], table["y"]) == ([0.0, 1.0], [0.0, 1.0])
+
+
+# --------------------------------------------------
+# Test 2: np.interp table reproduces isotonic regression
+# --------------------------------------------------
+def test_interpolation_matches_isotonic():
+    rng = np.random.default_rng(1)
+    scores = rng.uniform(size=500)
+    y = (rng.uniform(size=500) < scores ** 2).astype(int)
+
+    calibrator = Calibrator(*fit_isotonic(scores, y))
+    reference = IsotonicRegression(out_of_bounds="clip").fit(scores, y)
+
+    grid = np.linspace(-0.1, 1.1, 301)
+    assert np.allclose(calibrator(grid), reference.predict(grid))
+
+    probs = np.column_stack([1 - grid, grid])
+    predictions, p = decide(calibrator, probs, threshold=0.3)
+    assert np.array_equal(predictions, (p >= 0.3).astype(int))
+
+
+def test_missing_tables_fall_back_to_identity(tmp_path, caplog):
+    calibrators = load_calibrators(tmp_path / "missing.json", {"a": "v1"})
+    assert calibrators["a"].method == "identity"
+    assert np.array_equal(calibrators["a"](np.array([0.2, 0.7])),
+                          [0.2, 0.7])
+    assert "missing.json not found" in caplog.text
+
+    caplog.clear()
+    assert load_calibrators(None, {"a": "v1"})["a"].method == "identity"
+    assert caplog.text == ""
+
+
+def test_tables_checked_against_model_version(tmp_path):
+    path = tmp_path / "calibration.json"
+    table = {"method": "isotonic", "model_version": "v1",
+             "x": [0.0, 1.0], "y": [0.1, 0.9]}
+    path.write_text(json.dumps({"a": table}))
+
+    assert load_calibrators(path, {"a": "v1"})["a"].method == "isotonic"
+    with pytest.raises(ValueError, match="model version v1"):
+        load_calibrators(path, {"a": "v2"})
+    with pytest.raises(ValueError, match="no calibration table for b"):
+        load_calibrators(path, {"a": "v1", "b": "v1"})
+
+
+# --------------------------------------------------
+# Test 3: Thresholds per request and per deployment
+# --------------------------------------------------
+def test_api_thresholds(monkeypatch):
+    import src.serving.app as serving
+
+    client = TestClient(serving.app)
+    assert Path("models/calibration.json").exists()
+    assert serving.calibrators["logistic-regression"].method == "isotonic"
+
+    body = client.post("/predict/logistic", json=SAMPLE).json()
+    assert body["threshold"] == serving.DECISION_THRESHOLD
+
+    raw = serving.lr_model.predict_proba(serving.prepare_input(
+        serving.HeartDiseaseInput(**SAMPLE)
+    ))[0, 1]
+    expected = serving.calibrators["logistic-regression"](raw)
+    assert body["probability"] == round(float(expected), 4)
+
+    low = client.post("/predict/logistic?threshold=0", json=SAMPLE).json()
+    high = client.post("/predict/logistic?threshold=1", json=SAMPLE).json()
+    assert low["prediction"] == 1 and high["prediction"] == int(expected == 1)
+    assert client.post("/predict/logistic?threshold=1.5",
+                       json=SAMPLE).status_code == 422
+
+    monkeypatch.setattr(serving, "DECISION_THRESHOLD", 0.0)
+    batch = client.post("/predict/random-forest/batch",
+                        json={"instances": [SAMPLE] * 2}).json()
+    assert batch["threshold"] == 0.0
+    assert [r["prediction"] for r in batch["predictions"]] == [1, 1]
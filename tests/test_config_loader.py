@@ -0,0 +1,135 @@
+"""
+Unit tests for the settings loader
+Covers:
+- config.json validates and keeps its dict layout
+- Settings are cached per process
+- Environment overrides for serving and nested keys
+- Invalid values and unknown keys rejected at load time
+- Relative paths resolved against the project root
+"""
+
+import os
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from src.utils.config_loader import (
+    DEFAULT_CONFIG_PATH,
+    PROJECT_ROOT,
+    get_settings,
+    load_config,
+    read_settings,
+)
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    with open(DEFAULT_CONFIG_PATH) as f:
+        raw = json.load(f)
+
+    def write(**serving):
+        raw["serving"].update(serving)
+        path = tmp_path / "config.json"
+        path.write_text(json.dumps(raw))
+        return path
+
+    return write
+
+
+# --------------------------------------------------
+# Test 1: Repository config validates, dict view unchanged
+# --------------------------------------------------
+def test_repository_config_loads():
+    settings = read_settings(environ={})
+    config = load_config()
+
+    assert settings.serving.serving_engine == "numpy"
+    assert settings.schema_.columns[-1] == "target"
+    assert config["schema"]["columns"] == settings.schema_.columns
+    assert config["data"]["processed"]["file_path"] == \
+        settings.data.processed.file_path
+
+
+# --------------------------------------------------
+# Test 2: Loaded once per process
+# --------------------------------------------------
+def test_settings_cached():
+    assert get_settings() is get_settings()
+
+
+# --------------------------------------------------
+# Test 3: Environment overrides
+# --------------------------------------------------
+def test_environment_overrides(config_file):
+    settings = read_settings(config_file(), environ={
+        "MAX_BATCH_SIZE": "512",
+        "SERVING_ENGINE": "sklearn",
+        "LOOKUP_ENABLED": "true",
+        "CALIBRATION__METHOD": "sigmoid",
+        "DATA__RAW__DOWNLOAD__TIMEOUT": "60",
+        "SCHEMA__COLUMNS": '["a", "target"]',
+    })
+
+    assert settings.serving.max_batch_size == 512
+    assert settings.serving.serving_engine == "sklearn"
+    assert settings.serving.lookup_enabled is True
+    assert settings.calibration.method == "sigmoid"
+    assert settings.data.raw.download.timeout == 60
+    assert settings.schema_.columns == ["a", "target"]
+
+
+def test_config_path_from_environment(config_file):
+    path = config_file(binary_port=9001)
+
+    settings = read_settings(environ={"CONFIG_PATH": str(path)})
+
+    assert settings.serving.binary_port == 9001
+
+
+# --------------------------------------------------
+# Test 4: Validation
+# --------------------------------------------------
+@pytest.mark.parametrize("overrides", [
+    {"DECISION_THRESHOLD": "1.5"},
+    {"SERVING_ENGINE": "onnx"},
+    {"MAX_BATCH_SIZE": "0"},
+    {"AUDIT_DROP_POLICY": "random"},
+    {"ADMISSION_MIN_LIMIT": "50", "ADMISSION_INITIAL_LIMIT": "20"},
+    {"PROFILING_ENABLED": "true"},
+])
+def test_invalid_values_rejected(config_file, overrides):
+    with pytest.raises(ValidationError):
+        read_settings(config_file(), environ=overrides)
+
+
+def test_unknown_key_rejected(config_file):
+    with pytest.raises(ValidationError, match="max_bach_size"):
+        read_settings(config_file(max_bach_size=512), environ={})
+
+
+def test_missing_file():
+    with pytest.raises(FileNotFoundError):
+        read_settings("does-not-exist.json", environ={})
+
+
+# --------------------------------------------------
+# Test 5: Paths independent of the working directory
+# --------------------------------------------------
+def test_paths_resolved_against_project_root(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    settings = read_settings(environ={"AUDIT_LOG_DIR": "/var/log/audit",
+                                      "SCALER_PATH": "models/scaler.pkl"})
+
+    assert settings.serving.audit_log_dir == "/var/log/audit"
+    assert settings.serving.scaler_path == str(
+        PROJECT_ROOT / "models" / "scaler.pkl"
+    )
+    for path in (settings.serving.lr_model_path,
+                 settings.serving.calibration_path,
+                 settings.data.processed.file_path):
+        assert os.path.isabs(path) and os.path.exists(path)
+    assert settings.distillation.report_path == str(
+        PROJECT_ROOT / "models" / "distillation.json"
+    )
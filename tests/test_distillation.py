@@ -0,0 +1,111 @@
+"""
+Unit tests for random forest distillation
+Covers:
+- Distilled regression trees evaluated by the NumPy forest engine
+- Report structure and tolerance gate on calibrated decisions
+- Artifact, student calibration table and quantized copy written only
+  when accepted, stale artifacts removed otherwise
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import StandardScaler
+
+from src.models.distillation import distill, fit_student, run_distillation
+from src.serving.calibration import artifact_version, load_calibrators
+from src.serving.engines import forest_arrays, forest_engine, load_forest
+
+
+@pytest.fixture(scope="module")
+def data():
+    df = pd.read_csv("data/processed/heart_disease_processed.csv")
+    scaler = StandardScaler().fit(df.drop("target", axis=1))
+    X = scaler.transform(df.drop("target", axis=1))
+    teacher = RandomForestClassifier(n_estimators=30, max_depth=5,
+                                     random_state=42).fit(X, df["target"])
+    return df, scaler, X, teacher
+
+
+# --------------------------------------------------
+# Test 1: Student parity on the NumPy engine
+# --------------------------------------------------
+@pytest.mark.parametrize("kind", ["tree", "forest"])
+def test_student_engine_parity(data, kind):
+    _, _, X, teacher = data
+    student = fit_student(teacher, X, kind=kind, n_estimators=5,
+                          max_depth=4)
+
+    engine = forest_engine(forest_arrays(student, classes=teacher.classes_))
+
+    np.testing.assert_allclose(
+        engine.predict_proba(X)[:, 1], np.clip(student.predict(X), 0, 1),
+        atol=1e-12,
+    )
+
+
+# --------------------------------------------------
+# Test 2: Report and tolerance gate
+# --------------------------------------------------
+def test_distill_report(data):
+    df, _, X, teacher = data
+
+    _, report = distill(teacher, X, df["target"], n_estimators=5, cv=3,
+                        max_accuracy_drop=1.0, max_auc_drop=1.0)
+
+    assert report["accepted"]
+    assert set(report["metrics"]) == {"teacher", "student"}
+    assert report["threshold"] == 0.5
+    calibration = report["calibration"]
+    improved = calibration["brier_calibrated"] < calibration["brier_raw"]
+    assert calibration["method"] == ("isotonic" if improved else "identity")
+    assert np.all(np.diff(report["calibration"]["y"]) >= 0)
+    cost = report["serving_cost"]
+    assert cost["student"]["nodes"] < cost["teacher"]["nodes"]
+    assert cost["student"]["engine_bytes"] < cost["teacher"]["engine_bytes"]
+
+    _, report = distill(teacher, X, df["target"], n_estimators=5, cv=3,
+                        max_accuracy_drop=-1.0, max_auc_drop=1.0)
+    assert not report["accepted"]
+
+
+# --------------------------------------------------
+# Test 3: Artifact emitted only when accepted
+# --------------------------------------------------
+def test_artifact_only_when_accepted(data, tmp_path, monkeypatch):
+    df, scaler, X, teacher = data
+    artifact = tmp_path / "distilled_forest.npz"
+    calibration = tmp_path / "distilled_calibration.json"
+    quantized = tmp_path / "distilled_forest_quantized.npz"
+    report_path = tmp_path / "distillation.json"
+    paths = {"artifact_path": artifact, "calibration_path": calibration,
+             "quantized_path": quantized, "report_path": report_path}
+
+    report = run_distillation(teacher, scaler, df, **paths)
+    assert report["accepted"] == artifact.exists() == calibration.exists()
+    assert json.loads(report_path.read_text())["drop"] == report["drop"]
+    if artifact.exists():
+        engine = load_forest(artifact)
+        assert engine.predict_proba(X).shape == (len(X), 2)
+        calibrators = load_calibrators(
+            calibration, {"random-forest": artifact_version(artifact)}
+        )
+        assert calibrators["random-forest"].method \
+            == report["calibration"]["method"]
+        assert report["quantized"]["identical"] == quantized.exists()
+
+    import src.models.distillation as distillation
+
+    monkeypatch.setattr(
+        distillation, "distill",
+        lambda *a, **k: (None, {**report, "accepted": False}),
+    )
+    artifact.write_bytes(b"stale")
+    calibration.write_text("{}")
+    quantized.write_bytes(b"stale")
+    run_distillation(teacher, scaler, df, **paths)
+    assert not artifact.exists() and not calibration.exists()
+    assert not quantized.exists()
@@ -1,4 +1,5 @@
 import os
+import ssl
 import pytest
 from unittest import mock
 
@@ -39,28 +40,29 @@ def test_dataset_already_exists(temp_raw_dir, capsys):
     assert "Dataset already exists" in captured.out
 
 
-@mock.patch("urllib.request.urlretrieve")
-def test_successful_download(mock_urlretrieve, temp_raw_dir):
+@mock.patch("src.data.data_acquisition.download_file")
+def test_successful_download(mock_download_file, temp_raw_dir):
     """
     Dataset should be downloaded if not present.
     """
     raw_dir, output_path = temp_raw_dir
 
-    def fake_download(url, filename):
+    def fake_download(url, filename, **kwargs):
         # Simulate file creation
         with open(filename, "w") as f:
             f.write("dummy data")
+        return "downloaded"
 
-    mock_urlretrieve.side_effect = fake_download
+    mock_download_file.side_effect = fake_download
 
     download_data()
 
-    mock_urlretrieve.assert_called_once()
+    mock_download_file.assert_called_once()
     assert os.path.exists(output_path)
 
 
-@mock.patch("urllib.request.urlretrieve")
-def test_cleanup_old_csv_files(mock_urlretrieve, temp_raw_dir):
+@mock.patch("src.data.data_acquisition.download_file")
+def test_cleanup_old_csv_files(mock_download_file, temp_raw_dir):
     """
     Old CSV files (except expected file) should be deleted.
     """
@@ -78,26 +80,42 @@ def test_cleanup_old_csv_files(mock_urlretrieve, temp_raw_dir):
     assert not old_file_2.exists()
 
 
-@mock.patch("urllib.request.urlretrieve")
-def test_download_failure(mock_urlretrieve, temp_raw_dir):
+@mock.patch("src.data.data_acquisition.download_file")
+def test_download_failure(mock_download_file, temp_raw_dir):
     """
     Exception should be raised if download fails.
     """
-    mock_urlretrieve.side_effect = Exception("Network error")
+    mock_download_file.side_effect = Exception("Network error")
 
     with pytest.raises(Exception):
         download_data()
 
 
-@mock.patch("urllib.request.urlretrieve")
-def test_correct_url_used(mock_urlretrieve, temp_raw_dir):
+@mock.patch("src.data.data_acquisition.download_file")
+def test_correct_url_used(mock_download_file, temp_raw_dir):
     """
     Ensure correct URL and output path are used.
     """
     download_data()
 
-    args, _ = mock_urlretrieve.call_args
+    args, _ = mock_download_file.call_args
     url, output_path = args
 
     assert isinstance(url, str)
     assert OUTPUT_FILENAME in output_path
+
+
+@mock.patch("src.data.data_acquisition.download_file")
+def test_ssl_verification_not_disabled_globally(mock_download_file,
+                                                temp_raw_dir):
+    """
+    Certificate checks are passed to download_file, never switched off
+    for the whole process.
+    """
+    default_context = ssl._create_default_https_context
+
+    download_data()
+
+    _, kwargs = mock_download_file.call_args
+    assert kwargs["verify_ssl"] is True
+    assert ssl._create_default_https_context is default_context
@@ -0,0 +1,144 @@
+"""
+Tests for the multi-source downloader against a local HTTP stand-in.
+Covers:
+- Concurrent download of several sources
+- Checksum-based cache skip
+- HTTP Range resume of partial downloads
+- Checksum mismatch failure
+"""
+
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.data.data_acquisition import download_file, download_sources
+
+PAYLOADS = {
+    "/a.data": b"63,1,1,145,233,1,2,150,0,2.3,3,0,6,0\n" * 200,
+    "/b.data": b"67,1,4,160,286,0,2,108,1,1.5,2,3,3,2\n" * 300,
+}
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_GET(self):
+        body = PAYLOADS.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+
+        range_header = self.headers.get("Range")
+        self.requests.append((self.path, range_header))
+
+        if range_header:
+            start = int(range_header.split("=")[1].rstrip("-"))
+            if start >= len(body):
+                self.send_error(416)
+                return
+            chunk = body[start:]
+            self.send_response(206)
+            self.send_header(
+                "Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}"
+            )
+        else:
+            chunk = body
+            self.send_response(200)
+
+        self.send_header("Content-Length", str(len(chunk)))
+        self.end_headers()
+        self.wfile.write(chunk)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def http_server():
+    _Handler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", _Handler.requests
+    server.shutdown()
+    server.server_close()
+
+
+def _sources(base_url):
+    return [
+        {
+            "name": name.strip("/").split(".")[0],
+            "url": base_url + name,
+            "file_name": name.strip("/"),
+            "sha256": _sha256(body),
+        }
+        for name, body in PAYLOADS.items()
+    ]
+
+
+# --------------------------------------------------
+# Test 1: All sources are downloaded concurrently
+# --------------------------------------------------
+def test_download_sources(http_server, tmp_path):
+    base_url, _ = http_server
+
+    results = download_sources(_sources(base_url), tmp_path, max_workers=2)
+
+    assert results == {"a": "downloaded", "b": "downloaded"}
+    assert (tmp_path / "a.data").read_bytes() == PAYLOADS["/a.data"]
+    assert (tmp_path / "b.data").read_bytes() == PAYLOADS["/b.data"]
+
+
+# --------------------------------------------------
+# Test 2: Sources with matching cached checksum are skipped
+# --------------------------------------------------
+def test_cached_sources_skipped(http_server, tmp_path):
+    base_url, requests = http_server
+
+    download_sources(_sources(base_url), tmp_path)
+    requests.clear()
+
+    results = download_sources(_sources(base_url), tmp_path)
+
+    assert results == {"a": "cached", "b": "cached"}
+    assert requests == []
+
+
+# --------------------------------------------------
+# Test 3: Partial downloads resume with HTTP Range
+# --------------------------------------------------
+def test_partial_download_resumed(http_server, tmp_path):
+    base_url, requests = http_server
+    body = PAYLOADS["/a.data"]
+    dest = tmp_path / "a.data"
+
+    (tmp_path / "a.data.part").write_bytes(body[:1000])
+
+    status = download_file(base_url + "/a.data", dest, sha256=_sha256(body))
+
+    assert status == "downloaded"
+    assert dest.read_bytes() == body
+    assert requests == [("/a.data", "bytes=1000-")]
+
+
+# --------------------------------------------------
+# Test 4: Checksum mismatch raises after retries
+# --------------------------------------------------
+def test_checksum_mismatch(http_server, tmp_path):
+    base_url, _ = http_server
+    dest = tmp_path / "a.data"
+
+    with pytest.raises(ValueError):
+        download_file(
+            base_url + "/a.data", dest, sha256="0" * 64,
+            retries=2, backoff=0,
+        )
+
+    assert not dest.exists()
+    assert not (tmp_path / "a.data.part").exists()
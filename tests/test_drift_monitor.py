@@ -0,0 +1,128 @@
+"""
+Unit tests for serving-time drift monitoring
+Covers:
+- Reference sketch construction
+- PSI / KS on identical and shifted traffic
+- Out-of-domain category codes; rejected requests are not binned
+- Rolling window memory bound
+- Prometheus export through the API
+"""
+
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from src.serving.drift import DriftMonitor, build_reference, psi, ks
+
+FEATURES = ["age", "cp"]
+
+
+def _reference_df(n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "age": rng.normal(55, 9, n).round(),
+        "cp": rng.choice([1.0, 2.0, 3.0, 4.0], n),
+    })
+
+
+# --------------------------------------------------
+# Test 1: Reference sketches have fixed-size bins
+# --------------------------------------------------
+def test_build_reference():
+    reference = build_reference(_reference_df(), FEATURES, n_bins=10)
+
+    age = reference["features"]["age"]
+    cp = reference["features"]["cp"]
+
+    assert age["type"] == "numerical"
+    assert len(age["counts"]) == len(age["edges"]) + 1 <= 10
+    assert cp["values"] == [1.0, 2.0, 3.0, 4.0]
+    assert sum(cp["counts"]) == 500
+
+
+# --------------------------------------------------
+# Test 2: Same distribution scores low, shifted scores high
+# --------------------------------------------------
+def test_drift_scores_detect_shift():
+    df = _reference_df()
+    monitor = DriftMonitor(build_reference(df, FEATURES), window=10_000)
+
+    for row in _reference_df(seed=1).to_dict("records"):
+        monitor.observe(row)
+    stable = monitor.scores()["age"]
+
+    monitor.reset()
+    for row in _reference_df(seed=1).assign(age=lambda d: d.age + 15) \
+            .to_dict("records"):
+        monitor.observe(row)
+    shifted = monitor.scores()["age"]
+
+    assert stable["psi"] < 0.1 and stable["ks"] < 0.1
+    assert shifted["psi"] > 0.5 and shifted["ks"] > 0.3
+    assert psi([1, 2, 3], [1, 2, 3]) == 0.0
+    assert ks([1, 2, 3], [3, 2, 1]) > 0
+
+
+# --------------------------------------------------
+# Test 3: Unknown category codes are counted, not binned
+# --------------------------------------------------
+def test_out_of_domain_codes():
+    monitor = DriftMonitor(build_reference(_reference_df(), FEATURES))
+
+    invalid = monitor.observe({"age": 60, "cp": 9})
+
+    assert invalid == ["cp"]
+    assert monitor.out_of_domain["cp"] == 1
+    assert sum(monitor.live_counts("cp")) == 0
+
+
+def test_rejected_rows_not_counted():
+    monitor = DriftMonitor(build_reference(_reference_df(), FEATURES))
+
+    # One bad row rejects the whole request: nothing is binned
+    invalid = monitor.observe_batch(
+        [{"age": 60, "cp": 2}, {"age": 61, "cp": 9}], reject_invalid=True
+    )
+
+    assert invalid == ["cp"]
+    assert monitor.out_of_domain["cp"] == 1
+    assert monitor.observations == 0
+    assert sum(monitor.live_counts("age")) == 0
+
+    assert monitor.observe({"age": 60, "cp": 2}, reject_invalid=True) == []
+    assert monitor.observations == 1
+    assert sum(monitor.live_counts("age")) == 1
+
+
+# --------------------------------------------------
+# Test 4: Live histograms cover at most two windows
+# --------------------------------------------------
+def test_rolling_window_bound():
+    monitor = DriftMonitor(build_reference(_reference_df(), FEATURES),
+                           window=50)
+
+    for _ in range(1000):
+        monitor.observe({"age": 60, "cp": 2})
+
+    assert sum(monitor.live_counts("age")) <= 100
+    assert monitor.observations == 1000
+
+
+# --------------------------------------------------
+# Test 5: Drift gauges are exported on /metrics
+# --------------------------------------------------
+def test_drift_metrics_exported():
+    from src.serving.app import app
+
+    client = TestClient(app)
+    payload = {
+        "age": 63, "sex": 1, "cp": 3, "trestbps": 145, "chol": 233,
+        "fbs": 1, "restecg": 0, "thalach": 150, "exang": 0,
+        "oldpeak": 2.3, "slope": 0, "ca": 0, "thal": 1,
+    }
+
+    assert client.post("/predict/logistic", json=payload).status_code == 200
+
+    metrics = client.get("/metrics").text
+    assert 'feature_drift_psi{feature="age"}' in metrics
+    assert 'feature_out_of_domain_total{feature="thal"}' in metrics
@@ -0,0 +1,84 @@
+"""
+Unit tests for the NumPy serving engines
+Covers:
+- Scaler, logistic regression and random forest parity with
+  scikit-learn on the processed training data
+- Export / load round trip and recorded source model versions
+"""
+
+import pickle
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+from src.serving.calibration import artifact_version
+from src.serving.engines import (
+    engine_source_versions,
+    export_engine_params,
+    load_engines,
+)
+
+
+def _fit_models():
+    df = pd.read_csv("data/processed/heart_disease_processed.csv")
+    X = df.drop("target", axis=1).to_numpy()
+    y = df["target"].to_numpy()
+
+    scaler = StandardScaler().fit(X)
+    X_scaled = scaler.transform(X)
+    lr = LogisticRegression(max_iter=1000).fit(X_scaled, y)
+    rf = RandomForestClassifier(n_estimators=50, max_depth=5,
+                                random_state=42).fit(X_scaled, y)
+    return X, scaler, lr, rf
+
+
+# --------------------------------------------------
+# Test 1: Engines reproduce scikit-learn predictions
+# --------------------------------------------------
+def test_engine_parity(tmp_path):
+    X, scaler, lr, rf = _fit_models()
+    path = tmp_path / "engine_params.npz"
+
+    export_engine_params(path, scaler, lr, rf,
+                         source_versions={"logistic-regression": "a",
+                                          "random-forest": "b"})
+    e_scaler, e_lr, e_rf = load_engines(path)
+    assert engine_source_versions(path) == {"logistic-regression": "a",
+                                            "random-forest": "b"}
+
+    X_scaled = scaler.transform(X)
+    assert np.array_equal(e_scaler.transform(X), X_scaled)
+
+    assert np.array_equal(e_lr.predict(X_scaled), lr.predict(X_scaled))
+    assert np.allclose(e_lr.predict_proba(X_scaled),
+                       lr.predict_proba(X_scaled))
+
+    assert np.array_equal(e_rf.predict(X_scaled), rf.predict(X_scaled))
+    assert np.allclose(e_rf.predict_proba(X_scaled),
+                       rf.predict_proba(X_scaled))
+
+
+# --------------------------------------------------
+# Test 2: Shipped engine params match the shipped pickles
+# --------------------------------------------------
+def test_shipped_engine_params_match_pickles():
+    with open("models/random_forest_model.pkl", "rb") as f:
+        rf = pickle.load(f)
+    with open("models/logistic_regression_model.pkl", "rb") as f:
+        lr = pickle.load(f)
+
+    e_scaler, e_lr, e_rf = load_engines("models/engine_params.npz")
+    assert engine_source_versions("models/engine_params.npz") == {
+        "logistic-regression": artifact_version(
+            "models/logistic_regression_model.pkl"
+        ),
+        "random-forest": artifact_version("models/random_forest_model.pkl"),
+    }
+    df = pd.read_csv("data/processed/heart_disease_processed.csv")
+    X_scaled = e_scaler.transform(df.drop("target", axis=1).to_numpy())
+
+    assert np.array_equal(e_lr.predict(X_scaled), lr.predict(X_scaled))
+    assert np.array_equal(e_rf.predict(X_scaled), rf.predict(X_scaled))
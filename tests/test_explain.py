@@ -0,0 +1,129 @@
+"""
+Unit tests for per-feature explanations
+Covers:
+- Logistic regression contributions reproduce the decision function
+- Tree-path decomposition reproduces forest probabilities
+- scikit-learn forests are explained like the NumPy engine
+- Single and batch /explain endpoints
+- Same input checks and decision threshold as /predict
+"""
+
+import json
+import pickle
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from src.serving.engines import load_engines
+from src.serving.explain import (
+    as_forest_engine,
+    forest_contributions,
+    logistic_contributions,
+)
+
+SAMPLE = json.load(open("tests/sample_request.json"))
+
+
+def _scaled_rows(n=64):
+    scaler, lr, rf = load_engines("models/engine_params.npz")
+    rng = np.random.default_rng(0)
+    return rng.normal(size=(n, scaler.mean_.size)), lr, rf
+
+
+# --------------------------------------------------
+# Test 1: Contributions add up to the model output
+# --------------------------------------------------
+def test_contributions_are_additive():
+    X, lr, rf = _scaled_rows()
+
+    base, contributions = logistic_contributions(lr, X)
+    assert np.allclose(base + contributions.sum(axis=1),
+                       lr.decision_function(X))
+
+    base, contributions = forest_contributions(rf, X)
+    assert contributions.shape == X.shape
+    assert np.allclose(base + contributions.sum(axis=1),
+                       rf.predict_proba(X)[:, 1])
+
+
+# --------------------------------------------------
+# Test 2: Unused features get zero credit
+# --------------------------------------------------
+def test_unused_features_have_no_contribution():
+    X, _, rf = _scaled_rows()
+    used = np.unique(rf.feature[rf.left != np.arange(rf.left.size)])
+
+    _, contributions = forest_contributions(rf, X)
+    unused = np.setdiff1d(np.arange(X.shape[1]), used)
+    assert np.all(contributions[:, unused] == 0)
+
+
+# --------------------------------------------------
+# Test 3: scikit-learn forest is flattened and explained
+# --------------------------------------------------
+def test_sklearn_forest():
+    X, _, _ = _scaled_rows(8)
+    with open("models/random_forest_model.pkl", "rb") as f:
+        rf = pickle.load(f)
+
+    base, contributions = forest_contributions(as_forest_engine(rf), X)
+    assert np.allclose(base + contributions.sum(axis=1),
+                       rf.predict_proba(X)[:, 1])
+
+
+# --------------------------------------------------
+# Test 4: Explanation endpoints
+# --------------------------------------------------
+@pytest.mark.parametrize("model,units", [
+    ("logistic", "log-odds"),
+    ("random-forest", "probability"),
+])
+def test_explain_endpoints(model, units):
+    from src.serving.app import app, FEATURES
+
+    client = TestClient(app)
+
+    single = client.post(f"/explain/{model}", json=SAMPLE)
+    assert single.status_code == 200
+    body = single.json()
+    assert body["units"] == units
+    assert list(body["contributions"]) == FEATURES
+
+    prediction = client.post(f"/predict/{model}", json=SAMPLE).json()
+    assert body["prediction"] == prediction["prediction"]
+
+    batch = client.post(f"/explain/{model}/batch",
+                        json={"instances": [SAMPLE] * 3}).json()
+    assert len(batch["explanations"]) == 3
+    assert batch["explanations"][0]["contributions"] == body["contributions"]
+
+    assert client.post("/explain/svm", json=SAMPLE).status_code == 404
+
+
+# --------------------------------------------------
+# Test 5: Explanations gated and thresholded like predictions
+# --------------------------------------------------
+def test_explain_matches_predict_gating(monkeypatch):
+    import src.serving.app as serving
+
+    client = TestClient(serving.app)
+    monkeypatch.setattr(serving, "AUDIT_ENABLED", False)
+
+    for threshold in (0.01, 0.99):
+        query = f"?threshold={threshold}"
+        body = client.post(f"/explain/logistic{query}", json=SAMPLE).json()
+        prediction = client.post(f"/predict/logistic{query}",
+                                 json=SAMPLE).json()
+        assert body["threshold"] == threshold
+        assert body["prediction"] == prediction["prediction"]
+    assert client.post("/explain/logistic?threshold=2",
+                       json=SAMPLE).status_code == 422
+
+    monkeypatch.setattr(serving, "REJECT_OUT_OF_DOMAIN", True)
+    out_of_domain = {**SAMPLE, "cp": 99}
+    for path in ("/predict/logistic", "/explain/logistic"):
+        assert client.post(path, json=out_of_domain).status_code == 422
+    assert client.post("/explain/logistic/batch",
+                       json={"instances": [out_of_domain]}).status_code \
+        == 422
@@ -0,0 +1,124 @@
+"""
+Unit tests for allocation-free feature encoding
+Covers:
+- Parity with StandardScaler.transform (single and batch)
+- No steady-state allocations (tracemalloc)
+- Per-thread buffers
+- Batch prediction endpoints
+"""
+
+import json
+import threading
+import tracemalloc
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from src.serving.engines import load_engines
+from src.serving.features import FeatureEncoder
+
+SAMPLE = json.load(open("tests/sample_request.json"))
+FEATURES = list(SAMPLE)
+
+
+def _payload(**overrides):
+    from src.serving.app import HeartDiseaseInput
+
+    return HeartDiseaseInput(**{**SAMPLE, **overrides})
+
+
+def _encoder(max_batch=64):
+    scaler, _, _ = load_engines("models/engine_params.npz")
+    return scaler, FeatureEncoder.from_scaler(FEATURES, scaler,
+                                              max_batch=max_batch)
+
+
+def _peak_bytes(fn, n=1000):
+    fn()  # allocate per-thread buffers
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        for _ in range(n):
+            fn()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return current - base, peak - base
+
+
+# --------------------------------------------------
+# Test 1: Encoded features match the scaler exactly
+# --------------------------------------------------
+def test_encoding_parity():
+    scaler, encoder = _encoder()
+    batch = [_payload(age=40 + i, oldpeak=i / 10) for i in range(20)]
+    raw = np.array([[getattr(d, f) for f in FEATURES] for d in batch])
+
+    assert np.array_equal(encoder.encode(batch[0]), scaler.transform(raw[:1]))
+    assert np.array_equal(encoder.encode_batch(batch), scaler.transform(raw))
+
+    with pytest.raises(ValueError):
+        encoder.encode_batch(batch * 4)
+
+
+# --------------------------------------------------
+# Test 2: Steady-state encoding allocates nothing
+# --------------------------------------------------
+def test_no_allocations_in_hot_loop():
+    _, encoder = _encoder()
+    data = _payload()
+    batch = [data] * 32
+
+    baseline = _peak_bytes(lambda: None)
+    single = _peak_bytes(lambda: encoder.encode(data))
+    batched = _peak_bytes(lambda: encoder.encode_batch(batch))
+
+    # No growth, and transient peak within one small Python object of
+    # an empty loop (a single 1x13 float64 array alone is > 200 bytes)
+    assert single[0] <= baseline[0] and batched[0] <= baseline[0]
+    assert single[1] - baseline[1] < 100
+    assert batched[1] - baseline[1] < 100
+
+
+# --------------------------------------------------
+# Test 3: Each thread encodes into its own buffer
+# --------------------------------------------------
+def test_thread_local_buffers():
+    _, encoder = _encoder()
+    results = {}
+
+    def run(age):
+        results[age] = encoder.encode(_payload(age=age))
+
+    threads = [threading.Thread(target=run, args=(a,)) for a in (30, 70)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results[30][0, 0] < results[70][0, 0]
+
+
+# --------------------------------------------------
+# Test 4: Batch endpoints agree with single predictions
+# --------------------------------------------------
+@pytest.mark.parametrize("path", ["/predict/logistic",
+                                  "/predict/random-forest"])
+def test_batch_endpoint(path):
+    from src.serving.app import app
+
+    client = TestClient(app)
+    instances = [{**SAMPLE, "age": 35 + 5 * i} for i in range(8)]
+
+    batch = client.post(f"{path}/batch", json={"instances": instances})
+    singles = [client.post(path, json=p).json() for p in instances]
+
+    assert batch.status_code == 200
+    assert batch.json()["predictions"] == [
+        {k: s[k] for k in ("prediction", "confidence", "probability")}
+        for s in singles
+    ]
+    assert client.post(f"{path}/batch", json={"instances": []}) \
+        .status_code == 422
@@ -0,0 +1,56 @@
+"""
+Cold-start import budget for the serving app
+Covers:
+- -X importtime output parsing
+- Serving app does not import scikit-learn / SciPy / pandas
+- Budget violations are reported
+"""
+
+from src.serving.importtime import check_budget, parse_importtime, \
+    profile_import
+
+HEAVY_MODULES = ["sklearn", "scipy", "pandas"]
+
+
+# --------------------------------------------------
+# Test 1: importtime lines are parsed with nesting depth
+# --------------------------------------------------
+def test_parse_importtime():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       100 |        100 |     numpy.core\n"
+        "import time:       250 |        350 |   numpy\n"
+        "something unrelated\n"
+    )
+
+    assert parse_importtime(stderr) == [
+        ("numpy.core", 100, 100, 2),
+        ("numpy", 250, 350, 1),
+    ]
+
+
+# --------------------------------------------------
+# Test 2: NumPy engine keeps heavy libraries out of cold start
+# --------------------------------------------------
+def test_serving_app_import_budget():
+    profile = profile_import(
+        "src.serving.app", env={"SERVING_ENGINE": "numpy"}
+    )
+
+    assert check_budget(profile, budget_ms=10_000,
+                        forbid=HEAVY_MODULES) == []
+
+
+# --------------------------------------------------
+# Test 3: Exceeded budgets and forbidden imports are reported
+# --------------------------------------------------
+def test_budget_violation_reported():
+    profile = {
+        "module": "m",
+        "import_ms": 900.0,
+        "modules": {"m": 900000, "sklearn": 800000},
+    }
+
+    violations = check_budget(profile, budget_ms=500, forbid=["sklearn"])
+
+    assert len(violations) == 2
@@ -0,0 +1,181 @@
+"""
+Unit tests for the multi-worker serving launcher
+Covers:
+- cgroup v1 / v2 CPU quota detection
+- Worker count honouring the CPU quota
+- BLAS/OpenMP thread limits
+- Restart backoff and crash budget
+- End-to-end launch of forked workers on a shared socket, with metrics
+  aggregated over workers
+- Crash-looping workers stop the launcher with a non-zero status
+- Benchmark summary when every request failed
+"""
+
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import urllib.request
+
+import pytest
+
+from src.serving.benchmark import summarise, wait_ready
+from src.serving.launcher import (
+    THREAD_ENV_VARS,
+    CrashBudget,
+    available_cpus,
+    cgroup_cpu_limit,
+    limit_threads,
+    restart_delay,
+)
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _metric(text, name, **labels):
+    total = 0.0
+    for line in text.splitlines():
+        if line.startswith(name + "{") or line.startswith(name + " "):
+            if all(f'{k}="{v}"' in line for k, v in labels.items()):
+                total += float(line.rsplit(" ", 1)[1])
+    return total
+
+
+# --------------------------------------------------
+# Test 1: cgroup CPU quota parsing
+# --------------------------------------------------
+def test_cgroup_v2_quota(tmp_path):
+    (tmp_path / "cpu.max").write_text("250000 100000\n")
+    assert cgroup_cpu_limit(tmp_path) == 2.5
+
+    (tmp_path / "cpu.max").write_text("max 100000\n")
+    assert cgroup_cpu_limit(tmp_path) is None
+
+
+def test_cgroup_v1_quota(tmp_path):
+    cpu = tmp_path / "cpu"
+    cpu.mkdir()
+    (cpu / "cpu.cfs_quota_us").write_text("100000\n")
+    (cpu / "cpu.cfs_period_us").write_text("100000\n")
+
+    assert cgroup_cpu_limit(tmp_path) == 1.0
+    assert available_cpus(tmp_path) == 1
+
+
+def test_no_cgroup_limit(tmp_path):
+    assert cgroup_cpu_limit(tmp_path) is None
+    assert available_cpus(tmp_path) >= 1
+
+
+# --------------------------------------------------
+# Test 2: Native thread pools limited per worker
+# --------------------------------------------------
+def test_limit_threads(monkeypatch):
+    for var in THREAD_ENV_VARS:
+        monkeypatch.delenv(var, raising=False)
+
+    limit_threads(1)
+
+    assert all(os.environ[var] == "1" for var in THREAD_ENV_VARS)
+
+
+# --------------------------------------------------
+# Test 3: Restart backoff and crash budget
+# --------------------------------------------------
+def test_restart_delay():
+    assert [restart_delay(n, base=0.5, cap=4) for n in range(1, 6)] == \
+        [0.5, 1.0, 2.0, 4.0, 4.0]
+
+
+def test_crash_budget():
+    now = [0.0]
+    budget = CrashBudget(max_crashes=2, window=10, clock=lambda: now[0])
+
+    assert budget.record() and budget.record()
+    assert not budget.record()
+    now[0] = 15.0
+    assert budget.record()
+
+
+# --------------------------------------------------
+# Test 4: Forked workers serve predictions, metrics cover all workers
+# --------------------------------------------------
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+def test_launcher_serves_requests(tmp_path):
+    port = _free_port()
+
+    process = subprocess.Popen(
+        [sys.executable, "-m", "src.serving.launcher", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", "2", "--log-level", "warning"],
+        env={**os.environ, "AUDIT_ENABLED": "false",
+             "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_ready(port, timeout=60)
+
+        for _ in range(8):
+            request = urllib.request.Request(
+                f"http://127.0.0.1:{port}/predict/logistic",
+                data=open("tests/sample_request.json", "rb").read(),
+                headers={"Content-Type": "application/json"},
+            )
+            with urllib.request.urlopen(request) as response:
+                body = json.loads(response.read())
+            assert body["model"] == "Logistic Regression"
+
+        # Every scrape sees all 8 requests, whichever worker answers
+        for _ in range(4):
+            with urllib.request.urlopen(
+                f"http://127.0.0.1:{port}/metrics"
+            ) as response:
+                text = response.read().decode()
+            assert _metric(text, "http_requests_total",
+                           handler="/predict/logistic") == 8
+            assert _metric(text, "feature_drift_observations") == 8
+        assert list(tmp_path.glob("*.db"))
+    finally:
+        process.send_signal(signal.SIGTERM)
+        assert process.wait(timeout=30) == 0
+
+
+# --------------------------------------------------
+# Test 5: Crash-looping workers stop the launcher
+# --------------------------------------------------
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+def test_launcher_gives_up_on_crash_loop(tmp_path):
+    code = (
+        "import sys, src.serving.launcher as launcher\n"
+        "def crash(*args):\n"
+        "    raise SystemExit(3)\n"
+        "launcher._run_worker = crash\n"
+        f"launcher.serve('127.0.0.1', {_free_port()}, workers=1, "
+        "max_crashes=3, backoff=0.01)\n"
+    )
+    process = subprocess.run(
+        [sys.executable, "-c", code],
+        env={**os.environ, "AUDIT_ENABLED": "false",
+             "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)},
+        capture_output=True, text=True, timeout=60,
+    )
+
+    assert process.returncode == 1
+    assert process.stdout.count("restarting in") == 3
+    assert "shutting down" in process.stdout
+
+
+# --------------------------------------------------
+# Test 6: Benchmark summary when every request failed
+# --------------------------------------------------
+def test_benchmark_summary_without_successes():
+    stats = summarise([([], 3), ([], 2)], duration=1.0)
+
+    assert stats["requests"] == 0 and stats["errors"] == 5
+    assert stats["p50_ms"] is None and stats["p99_ms"] is None
@@ -0,0 +1,153 @@
+"""
+Unit tests for the precomputed prediction lookup table
+Covers:
+- Frequent vector selection
+- Hits match model outputs, misses fall through
+- Rebuild on model version change, including models reloaded by the API
+- API served from the table with hit ratio exported
+- Lookup hits still sampled for shadow evaluation
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from src.serving.engines import load_engines
+from src.serving.lookup import LookupIndex, most_frequent, training_rows
+from src.serving.shadow import ShadowEvaluator
+
+FEATURES = [
+    "age", "sex", "cp", "trestbps", "chol", "fbs", "restecg",
+    "thalach", "exang", "oldpeak", "slope", "ca", "thal",
+]
+CSV = "data/processed/heart_disease_processed.csv"
+
+
+def _payload(row):
+    return SimpleNamespace(**dict(zip(FEATURES, row)))
+
+
+# --------------------------------------------------
+# Test 1: Most frequent vectors are kept first
+# --------------------------------------------------
+def test_most_frequent():
+    rows = [(1,), (2,), (2,), (3,), (3,), (3,)]
+
+    assert most_frequent(rows, 2) == [(3,), (2,)]
+
+
+# --------------------------------------------------
+# Test 2: Hits reproduce the model, misses return None
+# --------------------------------------------------
+def test_lookup_hits_match_model():
+    scaler, lr, _ = load_engines("models/engine_params.npz")
+    rows = training_rows(CSV, FEATURES)
+    index = LookupIndex(FEATURES, max_entries=50)
+    index.ensure("lr", lr, scaler, "v1", rows)
+
+    row = most_frequent(rows, 1)[0]
+    prediction, probs = index.get("lr", _payload(row), "v1")
+    X_scaled = scaler.transform(np.array([row]))
+
+    assert prediction == lr.predict(X_scaled)[0]
+    assert np.array_equal(probs, lr.predict_proba(X_scaled)[0])
+    assert index.get("lr", _payload((0,) * 13), "v1") is None
+    assert index.hits["lr"] == 1 and index.misses["lr"] == 1
+
+
+# --------------------------------------------------
+# Test 3: Tables are rebuilt only when the version changes
+# --------------------------------------------------
+def test_rebuild_on_version_change():
+    scaler, lr, _ = load_engines("models/engine_params.npz")
+    rows = training_rows(CSV, FEATURES)
+    index = LookupIndex(FEATURES)
+
+    assert index.ensure("lr", lr, scaler, "v1", rows)
+    assert not index.ensure("lr", lr, scaler, "v1", rows)
+    assert index.get("lr", _payload(rows[0]), "v2") is None
+    assert index.ensure("lr", lr, scaler, "v2", rows)
+
+
+# --------------------------------------------------
+# Test 4: API answers from the table and exports hit ratio
+# --------------------------------------------------
+def test_api_lookup(monkeypatch):
+    import src.serving.app as serving
+
+    monkeypatch.setattr(serving, "LOOKUP_ENABLED", True)
+    monkeypatch.setattr(serving, "AUDIT_ENABLED", False)
+    monkeypatch.setattr(serving, "lookup", LookupIndex(FEATURES))
+    serving.build_lookup_tables()
+
+    row = pd.read_csv(CSV)[FEATURES].iloc[0].to_dict()
+    payload = {k: (v if k == "oldpeak" else int(v)) for k, v in row.items()}
+    client = TestClient(serving.app)
+
+    lookup_body = client.post("/predict/random-forest", json=payload).json()
+    monkeypatch.setattr(serving, "LOOKUP_ENABLED", False)
+    model_body = client.post("/predict/random-forest", json=payload).json()
+
+    assert lookup_body == model_body
+    assert serving.lookup.hits["random-forest"] == 1
+    assert 'lookup_hit_ratio{model="random-forest"} 1.0' in \
+        client.get("/metrics").text
+
+
+# --------------------------------------------------
+# Test 5: Lookup hits are shadowed like model calls
+# --------------------------------------------------
+def test_lookup_hits_shadowed(monkeypatch):
+    import src.serving.app as serving
+
+    monkeypatch.setattr(serving, "LOOKUP_ENABLED", True)
+    monkeypatch.setattr(serving, "AUDIT_ENABLED", False)
+    monkeypatch.setattr(serving, "lookup", LookupIndex(FEATURES))
+    serving.build_lookup_tables()
+    shadow = ShadowEvaluator(serving.rf_model, "logistic-regression",
+                             "random-forest", shadow_fraction=1.0,
+                             decide=serving.classify)
+    monkeypatch.setattr(serving, "shadow", shadow)
+
+    row = pd.read_csv(CSV)[FEATURES].iloc[0].to_dict()
+    payload = {k: (v if k == "oldpeak" else int(v)) for k, v in row.items()}
+    response = TestClient(serving.app).post("/predict/logistic",
+                                            json=payload)
+    shadow.shutdown()
+
+    assert response.status_code == 200
+    assert serving.lookup.hits["logistic-regression"] == 1
+    assert shadow.requests == 1
+
+
+# --------------------------------------------------
+# Test 6: Reloading a model rebuilds its table
+# --------------------------------------------------
+def test_reload_model_rebuilds_table(monkeypatch):
+    import src.serving.app as serving
+
+    monkeypatch.setattr(serving, "LOOKUP_ENABLED", True)
+    monkeypatch.setattr(serving, "AUDIT_ENABLED", False)
+    monkeypatch.setattr(serving, "lookup", LookupIndex(FEATURES))
+    serving.build_lookup_tables()
+    old_version = serving.MODEL_VERSIONS["logistic-regression"]
+
+    # A table fitted for another version is refused before the swap
+    with pytest.raises(ValueError, match="re-run the calibration"):
+        serving.reload_model("logistic-regression", serving.lr_model, "v2")
+    assert serving.MODEL_VERSIONS["logistic-regression"] == old_version
+
+    monkeypatch.setattr(serving, "CALIBRATION_ENABLED", False)
+    for name in ("MODEL_VERSIONS", "calibrators", "CALIBRATION_VERSIONS"):
+        monkeypatch.setitem(getattr(serving, name), "logistic-regression",
+                            getattr(serving, name)["logistic-regression"])
+    monkeypatch.setattr(serving, "lr_model", serving.lr_model)
+
+    serving.reload_model("logistic-regression", serving.lr_model, "v2")
+
+    assert serving.MODEL_VERSIONS["logistic-regression"] == "v2"
+    assert serving.lookup.tables["logistic-regression"].version == "v2"
+    assert serving.CALIBRATION_VERSIONS["logistic-regression"] == "identity"
@@ -0,0 +1,99 @@
+"""
+Unit tests for the pipeline orchestrator
+Covers:
+- Dependency order and in-memory passing of stage results
+- Independent pool stages running concurrently
+- Unknown dependencies and cycles rejected before anything runs
+- Default stage graph wiring
+"""
+
+import time
+
+import pytest
+
+from src.orchestrator import Stage, default_stages, report, run_pipeline
+
+
+# Module-level so they pickle into the process pool
+def _source():
+    return [1, 2, 3]
+
+
+def _double(source):
+    return [2 * v for v in source]
+
+
+def _total(source):
+    return sum(source)
+
+
+def _sleep(source):
+    time.sleep(0.5)
+    return len(source)
+
+
+def _combine(double, total):
+    return {"double": double, "total": total}
+
+
+# --------------------------------------------------
+# Test 1: Results flow along the DAG
+# --------------------------------------------------
+def test_results_passed_to_dependents():
+    stages = [
+        Stage("source", _source),
+        Stage("double", _double, ["source"], in_process=False),
+        Stage("total", _total, ["source"], in_process=False),
+        Stage("combine", _combine, ["double", "total"]),
+    ]
+    results, timings = run_pipeline(stages, max_workers=2)
+
+    assert results["combine"] == {"double": [2, 4, 6], "total": 6}
+    assert timings["combine"]["start"] >= timings["double"]["end"]
+    assert timings["double"]["where"] == "pool"
+    assert timings["source"]["where"] == "main"
+    assert "total" in report(timings)
+
+
+# --------------------------------------------------
+# Test 2: Independent pool stages overlap
+# --------------------------------------------------
+def test_independent_stages_run_concurrently():
+    stages = [Stage("source", _source)] + [
+        Stage(f"sleep_{i}", _sleep, ["source"], in_process=False)
+        for i in range(2)
+    ]
+    _, timings = run_pipeline(stages, max_workers=2)
+
+    a, b = timings["sleep_0"], timings["sleep_1"]
+    assert a["start"] < b["end"] and b["start"] < a["end"]
+
+
+# --------------------------------------------------
+# Test 3: Invalid graphs
+# --------------------------------------------------
+def test_unknown_dependency_rejected():
+    with pytest.raises(ValueError, match="unknown"):
+        run_pipeline([Stage("double", _double, ["source"])])
+
+
+def test_cycle_rejected():
+    stages = [
+        Stage("a", _double, ["b"]),
+        Stage("b", _double, ["a"]),
+    ]
+    with pytest.raises(ValueError, match="cycle"):
+        run_pipeline(stages)
+
+
+# --------------------------------------------------
+# Test 4: Default pipeline wiring
+# --------------------------------------------------
+def test_default_stages_train_in_parallel():
+    stages = {s.name: s for s in default_stages(download=False)}
+
+    assert stages["train_lr"].deps == ("preprocess",)
+    assert stages["train_rf"].deps == ("preprocess",)
+    assert not stages["train_lr"].in_process
+    assert not stages["train_rf"].in_process
+    assert set(stages["save"].deps) == {"preprocess", "train_lr", "train_rf"}
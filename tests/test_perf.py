@@ -0,0 +1,79 @@
+"""
+Unit tests for the performance baseline tools
+Covers:
+- Sample statistics
+- Fixed-round and time-budgeted measurement
+- Baseline comparison statuses and JSON round trip
+"""
+
+import pytest
+
+from src.utils.perf import (
+    compare,
+    load_results,
+    measure,
+    regressions,
+    save_results,
+    summarise,
+)
+
+
+# --------------------------------------------------
+# Test 1: Statistics over samples
+# --------------------------------------------------
+def test_summarise():
+    stats = summarise([0.004, 0.001, 0.002, 0.003])
+
+    assert stats["rounds"] == 4
+    assert stats["min"] == 0.001 and stats["max"] == 0.004
+    assert stats["median"] == pytest.approx(0.0025)
+    assert stats["p95"] == 0.004
+
+
+# --------------------------------------------------
+# Test 2: Measurement rounds
+# --------------------------------------------------
+def test_measure_fixed_rounds():
+    calls = []
+
+    result, stats = measure(calls.append, 1, rounds=7, warmup=2)
+
+    assert result is None
+    assert len(calls) == 9
+    assert stats["rounds"] == 7
+
+
+def test_measure_time_budget():
+    _, stats = measure(lambda: None, min_rounds=3, max_time=0.0)
+
+    assert stats["rounds"] == 3
+
+
+# --------------------------------------------------
+# Test 3: Comparison against a baseline
+# --------------------------------------------------
+def _results(**medians):
+    return {"benchmarks": {k: {"median": v} for k, v in medians.items()}}
+
+
+def test_compare_statuses():
+    baseline = _results(same=1.0, slower=1.0, faster=1.0, dropped=1.0)
+    current = _results(same=1.1, slower=1.5, faster=0.5, added=1.0)
+
+    rows = {row[0]: row[-1] for row in compare(baseline, current, 0.25)}
+
+    assert rows == {"same": "ok", "slower": "regression",
+                    "faster": "improved", "dropped": "missing",
+                    "added": "new"}
+    assert [row[0] for row in regressions(compare(baseline, current))] \
+        == ["slower"]
+
+
+def test_results_round_trip(tmp_path):
+    path = tmp_path / "perf.json"
+    save_results({"bench": summarise([0.001, 0.002])}, path)
+
+    results = load_results(path)
+
+    assert results["benchmarks"]["bench"]["rounds"] == 2
+    assert "python" in results["machine"]
@@ -0,0 +1,116 @@
+"""
+Unit tests for the live-service profiler
+Covers:
+- Stack sampling of other threads in collapsed format
+- Idle threads left out unless requested
+- Sampled per-call cProfile traces loadable by pstats
+- Admin endpoints: disabled, token check, profile and trace download
+"""
+
+import json
+import pstats
+import threading
+
+from fastapi.testclient import TestClient
+
+from src.serving.profiler import RequestProfiler, StackSampler
+
+SAMPLE = json.load(open("tests/sample_request.json"))
+
+
+def busy_loop(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+# --------------------------------------------------
+# Test 1: Sampler sees busy threads, skips idle ones
+# --------------------------------------------------
+def test_stack_sampler_collapsed():
+    stop, idle = threading.Event(), threading.Event()
+    busy = threading.Thread(target=busy_loop, args=(stop,), name="busy")
+    waiting = threading.Thread(target=idle.wait, name="waiting")
+    busy.start()
+    waiting.start()
+    try:
+        sampler = StackSampler(interval=0.001).run(0.2)
+        with_idle = StackSampler(interval=0.001, idle=True).run(0.05)
+    finally:
+        stop.set()
+        idle.set()
+        busy.join()
+        waiting.join()
+
+    lines = sampler.collapsed().splitlines()
+    assert sampler.samples > 0
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert any(line.startswith("busy;") and "busy_loop" in line
+               for line in lines)
+    assert not any(line.startswith("waiting;") for line in lines)
+    assert any(s.startswith("waiting;") for s in with_idle.stacks)
+
+
+# --------------------------------------------------
+# Test 2: Sampled calls are traced with cProfile
+# --------------------------------------------------
+def test_request_profiler(tmp_path):
+    profiler = RequestProfiler(fraction=1.0, max_traces=2)
+
+    @profiler.wrap
+    def endpoint(n: int):
+        return sum(range(n))
+
+    assert endpoint.__name__ == "endpoint"
+    for _ in range(3):
+        assert endpoint(10_000) == sum(range(10_000))
+
+    assert [t.trace_id for t in profiler.traces] == [2, 3]
+    trace = profiler.get(3)
+    assert trace.summary()["endpoint"] == "endpoint"
+    path = tmp_path / "trace.prof"
+    path.write_bytes(trace.dump())
+    assert pstats.Stats(str(path)).total_calls > 0
+
+    profiler.fraction = 0.0
+    endpoint(10)
+    assert len(profiler.traces) == 2 and profiler.get(1) is None
+
+
+# --------------------------------------------------
+# Test 3: Admin endpoints
+# --------------------------------------------------
+def test_admin_profile_endpoints(monkeypatch):
+    import src.serving.app as serving
+
+    client = TestClient(serving.app)
+    assert client.get("/admin/profile").status_code == 404
+
+    monkeypatch.setattr(serving, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(serving, "ADMIN_TOKEN", "secret")
+    monkeypatch.setattr(serving.request_profiler, "fraction", 1.0)
+    assert client.get("/admin/profile").status_code == 403
+    assert client.get("/admin/profile",
+                      headers={"X-Admin-Token": "wrong"}).status_code == 403
+
+    admin = {"X-Admin-Token": "secret"}
+    response = client.get("/admin/profile?seconds=0.1&idle=true",
+                          headers=admin)
+    assert response.status_code == 200
+    assert int(response.headers["X-Profile-Samples"]) > 0
+    assert response.text.strip()
+    assert client.get("/admin/profile?seconds=1000",
+                      headers=admin).status_code == 422
+
+    assert client.post("/predict/random-forest", json=SAMPLE).status_code \
+        == 200
+    traces = client.get("/admin/profile/requests", headers=admin).json()
+    latest = traces["traces"][0]
+    assert latest["endpoint"] == "predict_random_forest"
+    assert latest["top_cumulative"]
+
+    download = client.get(f"/admin/profile/requests/{latest['id']}",
+                          headers=admin)
+    assert download.status_code == 200
+    assert download.headers["content-type"] == "application/octet-stream"
+    assert client.get("/admin/profile/requests/0",
+                      headers=admin).status_code == 404
@@ -0,0 +1,286 @@
+"""
+Unit tests for the quantized engine export
+Covers:
+- float32 threshold snapping and split-grid midpoints
+- Complete-tree forest parity with the float64 forest engine
+- Validated export: identical classes and calibrated decisions, smaller
+  engines
+- Explanations on the quantized forest
+- Validated quantized student served for the distilled variant
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+import src.models.quantization as quantization
+from src.models.calibration import calibration_table
+from src.models.quantization import (
+    compare_predictions,
+    quantize_artifacts,
+    quantize_student,
+)
+from src.serving.calibration import Calibrator, artifact_version
+from src.serving.engines import (
+    QUANTIZED_MAX_DEPTH,
+    engine_nbytes,
+    export_engine_params,
+    export_forest_params,
+    load_engines,
+    load_quantized_engines,
+    load_quantized_forest,
+    quantize_forest,
+    snap_down,
+    snap_to_grid,
+    source_version,
+    split_grid,
+)
+from src.serving.explain import forest_contributions
+
+
+@pytest.fixture(scope="module")
+def data():
+    df = pd.read_csv("data/processed/heart_disease_processed.csv")
+    X = df.drop("target", axis=1).to_numpy()
+    y = df["target"].to_numpy()
+
+    scaler = StandardScaler().fit(X)
+    X_scaled = scaler.transform(X)
+    lr = LogisticRegression(max_iter=1000).fit(X_scaled, y)
+    rf = RandomForestClassifier(n_estimators=30, max_depth=6,
+                                random_state=42).fit(X_scaled, y)
+    return X, scaler, lr, rf
+
+
+@pytest.fixture(scope="module")
+def calibrators(data):
+    X, scaler, lr, rf = data
+    y = pd.read_csv("data/processed/heart_disease_processed.csv")["target"]
+    return {
+        key: Calibrator(*calibration_table(
+            model.predict_proba(scaler.transform(X))[:, 1], y, "sigmoid"
+        ), "sigmoid")
+        for key, model in (("logistic-regression", lr),
+                           ("random-forest", rf))
+    }
+
+
+@pytest.fixture()
+def engine_params(data, tmp_path):
+    _, scaler, lr, rf = data
+    path = tmp_path / "engine_params.npz"
+    export_engine_params(path, scaler, lr, rf)
+    return path
+
+
+# --------------------------------------------------
+# Test 1: Threshold snapping
+# --------------------------------------------------
+def test_snap_down_keeps_float32_decisions():
+    rng = np.random.default_rng(0)
+    threshold = rng.normal(size=1000)
+    x = np.concatenate([threshold.astype(np.float32),
+                        rng.normal(size=1000).astype(np.float32)])
+
+    snapped = snap_down(threshold)
+
+    assert snapped.dtype == np.float32
+    assert (snapped.astype(np.float64) <= threshold).all()
+    np.testing.assert_array_equal(x[:, None] <= snapped,
+                                  x[:, None] <= threshold)
+
+
+def test_snap_to_grid_midpoints():
+    grid = [np.array([0.0, 1.0, 3.0], dtype=np.float32)]
+    feature = np.array([0, 0, 0, 0])
+    threshold = np.array([0.2, 2.9, -5.0, np.inf])
+
+    np.testing.assert_array_equal(
+        snap_to_grid(feature, threshold, grid), [0.5, 2.0, -5.0, np.inf]
+    )
+
+
+# --------------------------------------------------
+# Test 2: Complete-tree forest parity
+# --------------------------------------------------
+def test_quantized_forest_parity(data, engine_params):
+    X, *_ = data
+    scaler, _, rf = load_engines(engine_params)
+    X_scaled = scaler.transform(X)
+
+    quantized = quantize_forest(rf, split_grid(X_scaled))
+
+    np.testing.assert_array_equal(quantized.predict(X_scaled),
+                                  rf.predict(X_scaled))
+    np.testing.assert_allclose(quantized.predict_proba(X_scaled),
+                               rf.predict_proba(X_scaled), atol=1e-6)
+    assert quantized.feature.dtype == np.uint8
+    assert quantized.threshold.dtype == np.float32
+
+
+def test_quantize_rejects_deep_forest(data, engine_params):
+    _, _, rf = load_engines(engine_params)
+    rf.max_depth = QUANTIZED_MAX_DEPTH + 1
+
+    with pytest.raises(ValueError, match="max_depth"):
+        quantize_forest(rf)
+
+
+# --------------------------------------------------
+# Test 3: Validated export
+# --------------------------------------------------
+def test_compare_predictions_uses_served_decision(data, engine_params):
+    X, *_ = data
+    scaler, _, rf = load_engines(engine_params)
+    engines = (scaler, {"random-forest": rf})
+    p = rf.predict_proba(scaler.transform(X))[:, 1]
+    # A step just above one raw probability: the raw p >= 0.5 decision is
+    # unchanged by a tiny shift, the calibrated decision is not
+    edge = np.sort(p)[len(p) // 2]
+    step = Calibrator([0.0, edge - 1e-9, edge, 1.0], [0.0, 0.0, 1.0, 1.0])
+
+    class Shifted:
+        def predict(self, X):
+            return rf.predict(X)
+
+        def predict_proba(self, X):
+            probs = rf.predict_proba(X).copy()
+            probs[:, 1] -= 1e-6
+            return probs
+
+    result = compare_predictions(
+        engines, (scaler, {"random-forest": Shifted()}), X,
+        {"random-forest": step},
+    )["random-forest"]
+
+    assert result["class_mismatches"] == 0
+    assert result["decision_mismatches"] > 0
+    assert result["max_calibrated_diff"] == pytest.approx(1.0)
+
+
+def test_quantize_artifacts(data, engine_params, calibrators, tmp_path,
+                            monkeypatch):
+    X, *_ = data
+    monkeypatch.setattr(quantization, "serving_cost",
+                        lambda engines, X_raw: {
+                            "logistic-regression": {}, "random-forest": {}
+                        })
+    quantized_path = tmp_path / "engine_params_quantized.npz"
+    report_path = tmp_path / "quantization.json"
+
+    report = quantize_artifacts(X, engine_params_path=engine_params,
+                                quantized_path=quantized_path,
+                                report_path=report_path,
+                                calibrators=calibrators)
+
+    assert report["identical"]
+    assert report["validation"]["random-forest"]["max_calibrated_diff"] \
+        < 1e-4
+    assert source_version(quantized_path) == artifact_version(engine_params)
+    assert json.loads(report_path.read_text())["identical"]
+    assert report["file_bytes"]["quantized"] \
+        < report["file_bytes"]["engine_params"]
+
+    reference = load_engines(engine_params)
+    quantized = load_quantized_engines(quantized_path)
+    for ref_engine, q_engine in zip(reference, quantized):
+        assert engine_nbytes(q_engine) < engine_nbytes(ref_engine)
+
+    # Scaled features feed the quantized forest's explanation directly
+    X_scaled = quantized[0].transform(X)
+    base, contributions = forest_contributions(quantized[2], X_scaled)
+    np.testing.assert_allclose(
+        base + contributions.sum(axis=1),
+        quantized[2].predict_proba(X_scaled)[:, 1], atol=1e-5,
+    )
+
+
+def test_quantize_artifacts_skips_export_on_mismatch(data, engine_params,
+                                                     tmp_path, monkeypatch):
+    X, *_ = data
+    monkeypatch.setattr(quantization, "serving_cost",
+                        lambda engines, X_raw: {})
+    monkeypatch.setattr(
+        quantization, "compare_predictions",
+        lambda *a: {"random-forest": {"class_mismatches": 0,
+                                      "decision_mismatches": 1}},
+    )
+    monkeypatch.setattr(quantization, "print_report", lambda report: None)
+    quantized_path = tmp_path / "engine_params_quantized.npz"
+    quantized_path.write_bytes(b"stale")
+
+    report = quantize_artifacts(X, engine_params_path=engine_params,
+                                quantized_path=quantized_path,
+                                report_path=tmp_path / "quantization.json")
+
+    assert not report["identical"]
+    assert not json.loads(
+        (tmp_path / "quantization.json").read_text()
+    )["identical"]
+    assert not quantized_path.exists()
+    assert not (tmp_path / ".engine_params_quantized.npz").exists()
+
+
+# --------------------------------------------------
+# Test 4: Quantized distilled student
+# --------------------------------------------------
+def test_quantize_student(data, calibrators, tmp_path, monkeypatch):
+    X, scaler, _, rf = data
+    forest_path = tmp_path / "distilled_forest.npz"
+    export_forest_params(forest_path, rf)
+    calibration_path = tmp_path / "distilled_calibration.json"
+    table = calibrators["random-forest"]
+    calibration_path.write_text(json.dumps({"random-forest": {
+        "method": "sigmoid", "model_version": artifact_version(forest_path),
+        "x": table.x.tolist(), "y": table.y.tolist(),
+    }}))
+    quantized_path = tmp_path / "distilled_forest_quantized.npz"
+    paths = {"forest_path": forest_path, "calibration_path": calibration_path,
+             "quantized_path": quantized_path}
+
+    result = quantize_student(X, scaler, **paths)
+
+    assert result["identical"]
+    assert source_version(quantized_path) == artifact_version(forest_path)
+    quantized = load_quantized_forest(quantized_path)
+    X32 = ((X - scaler.mean_.astype(np.float32))
+           / scaler.scale_.astype(np.float32)).astype(np.float32)
+    np.testing.assert_array_equal(quantized.predict(X32),
+                                  rf.predict(scaler.transform(X)))
+
+    monkeypatch.setattr(
+        quantization, "compare_predictions",
+        lambda *a: {"random-forest": {"class_mismatches": 0,
+                                      "decision_mismatches": 1}},
+    )
+    assert not quantize_student(X, scaler, **paths)["identical"]
+    assert not quantized_path.exists()
+
+
+def test_served_quantized_student():
+    """
+    The quantized engine serves the validated quantized student, not a
+    forest quantized at startup.
+    """
+    code = (
+        "import src.serving.app as app; "
+        "print(app.RF_VARIANT, type(app.rf_model).__name__, "
+        "app.rf_model.value.size)"
+    )
+    env = {**os.environ, "SERVING_ENGINE": "quantized",
+           "RANDOM_FOREST_VARIANT": "distilled"}
+    out = subprocess.run([sys.executable, "-c", code], env=env,
+                         capture_output=True, text=True, check=True)
+
+    variant, engine, size = out.stdout.splitlines()[-1].split()
+    expected = load_quantized_forest("models/distilled_forest_quantized.npz")
+    assert (variant, engine) == ("distilled", "QuantizedForestEngine")
+    assert int(size) == expected.value.size
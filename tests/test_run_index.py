@@ -0,0 +1,94 @@
+"""
+Unit tests for the local MLflow run index
+Covers:
+- Indexing params, tags and latest metrics from the file store
+- Incremental refresh (only changed runs are re-read)
+- Deleted runs dropped from query results
+- Best-run queries filtered by model param
+"""
+
+import shutil
+
+import mlflow
+import pytest
+
+from src.models.run_index import best_runs, connect, latest_metric, refresh
+
+
+@pytest.fixture
+def mlruns(tmp_path, monkeypatch):
+    monkeypatch.setenv("MLFLOW_ALLOW_FILE_STORE", "true")
+    store = tmp_path / "mlruns"
+    mlflow.set_tracking_uri(f"file://{store}")
+    mlflow.set_experiment("Heart_Disease_Classification")
+    yield store
+    mlflow.set_tracking_uri(None)
+
+
+def _log_run(name, model, roc_auc, **params):
+    with mlflow.start_run(run_name=name) as run:
+        mlflow.log_params({"model": model, **params})
+        mlflow.log_metric("roc_auc", roc_auc - 0.1, step=0)
+        mlflow.log_metric("roc_auc", roc_auc, step=1)
+        mlflow.set_tag("stage", "test")
+    return run.info.run_id
+
+
+# --------------------------------------------------
+# Test 1: Latest metric point by step, then timestamp
+# --------------------------------------------------
+def test_latest_metric():
+    text = "100 0.5 0\n300 0.7 2\n200 0.9 1\n400 0.8 2\n"
+    assert latest_metric(text) == (0.8, 2, 400)
+    assert latest_metric("") is None
+
+
+# --------------------------------------------------
+# Test 2: Index and query best runs per model
+# --------------------------------------------------
+def test_best_run_by_model(mlruns, tmp_path):
+    _log_run("lr-a", "LogisticRegression", 0.88, C=1.0)
+    best_lr = _log_run("lr-b", "LogisticRegression", 0.91, C=0.1)
+    best_rf = _log_run("rf-a", "RandomForest", 0.93, max_depth=5)
+    _log_run("rf-b", "RandomForest", 0.90, max_depth=3)
+
+    conn = connect(tmp_path / "index.db")
+    assert refresh(conn, mlruns) == {"scanned": 4, "indexed": 4,
+                                     "removed": 0}
+
+    [row] = best_runs(conn, "roc_auc", model="LogisticRegression")
+    assert row["run_id"] == best_lr and row["roc_auc"] == 0.91
+    assert row["experiment"] == "Heart_Disease_Classification"
+    assert row["status"] == "FINISHED"
+
+    assert best_runs(conn, model="RandomForest")[0]["run_id"] == best_rf
+    worst = best_runs(conn, model="RandomForest", minimize=True)
+    assert worst[0]["run_name"] == "rf-b"
+    assert best_runs(conn, params={"max_depth": "3"})[0]["run_name"] == \
+        "rf-b"
+    assert len(best_runs(conn, top=10)) == 4
+
+
+# --------------------------------------------------
+# Test 3: Only changed runs are re-read
+# --------------------------------------------------
+def test_incremental_refresh(mlruns, tmp_path):
+    first = _log_run("lr", "LogisticRegression", 0.80)
+    second = _log_run("rf", "RandomForest", 0.85)
+
+    conn = connect(tmp_path / "index.db")
+    refresh(conn, mlruns)
+    assert refresh(conn, mlruns)["indexed"] == 0
+
+    with mlflow.start_run(run_id=first):
+        mlflow.log_metric("roc_auc", 0.95, step=2)
+    assert refresh(conn, mlruns)["indexed"] == 1
+    assert best_runs(conn)[0]["run_id"] == first
+
+    mlflow.delete_run(first)
+    assert refresh(conn, mlruns)["indexed"] == 1
+    assert best_runs(conn)[0]["run_id"] == second
+
+    shutil.rmtree(next(mlruns.glob(f"*/{second}")))
+    assert refresh(conn, mlruns)["removed"] == 1
+    assert best_runs(conn) == []
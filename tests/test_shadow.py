@@ -0,0 +1,160 @@
+"""
+Unit tests for shadow and canary model evaluation
+Covers:
+- Shadow scoring and agreement tracking
+- Agreement on calibrated decisions at the request threshold
+- Executor restarts after shutdown
+- Bounded in-flight shadow work, slots freed on failed submissions
+- Canary routing
+- API endpoint with shadow and canary enabled
+"""
+
+import json
+import random
+import threading
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from src.serving.calibration import Calibrator, decide
+from src.serving.shadow import ShadowEvaluator
+
+SAMPLE = json.load(open("tests/sample_request.json"))
+X = np.zeros((1, 13))
+
+
+class _FixedModel:
+    def __init__(self, probs, gate=None):
+        self.probs = np.array([probs])
+        self.gate = gate
+
+    def predict_proba(self, X):
+        if self.gate is not None:
+            self.gate.wait()
+        return self.probs
+
+
+# --------------------------------------------------
+# Test 1: Shadow results update agreement statistics
+# --------------------------------------------------
+def test_shadow_agreement():
+    shadow = ShadowEvaluator(_FixedModel([0.3, 0.7]), "a", "b",
+                             shadow_fraction=1.0)
+
+    shadow.maybe_submit(X, np.array([0.2, 0.8]))
+    shadow.maybe_submit(X, np.array([0.9, 0.1]))
+    shadow.shutdown()
+
+    assert shadow.requests == 2
+    assert shadow.agreement_rate() == 0.5
+
+
+def test_shadow_agreement_on_served_decisions():
+    # Raw 0.7 vs 0.6 agree at 0.5; the candidate's calibrator maps 0.7 to
+    # 0.4, so the served decisions differ
+    calibrators = {"a": Calibrator.identity(),
+                   "b": Calibrator([0.0, 0.7, 1.0], [0.0, 0.4, 1.0])}
+    shadow = ShadowEvaluator(
+        _FixedModel([0.3, 0.7]), "a", "b", shadow_fraction=1.0,
+        decide=lambda key, probs, threshold: decide(calibrators[key], probs,
+                                                    threshold),
+    )
+
+    shadow.maybe_submit(X, np.array([0.4, 0.6]), 0.5)
+    shadow.maybe_submit(X, np.array([0.4, 0.6]), 0.7)
+    shadow.shutdown()
+
+    assert shadow.requests == 2
+    assert shadow.agreements == 1
+
+
+def test_shadow_restarts_after_shutdown():
+    shadow = ShadowEvaluator(_FixedModel([0.3, 0.7]), "a", "b",
+                             shadow_fraction=1.0)
+
+    shadow.maybe_submit(X, np.array([0.2, 0.8]))
+    shadow.shutdown()
+    shadow.shutdown()
+    shadow.maybe_submit(lambda: X, np.array([0.2, 0.8]))
+    shadow.shutdown()
+
+    assert shadow.requests == 2
+
+
+# --------------------------------------------------
+# Test 2: Busy shadow pool skips instead of queueing
+# --------------------------------------------------
+def test_shadow_never_blocks():
+    gate = threading.Event()
+    shadow = ShadowEvaluator(_FixedModel([0.3, 0.7], gate), "a", "b",
+                             shadow_fraction=1.0, max_in_flight=2)
+
+    submitted = [shadow.maybe_submit(X, np.array([0.5, 0.5]))
+                 for _ in range(5)]
+    gate.set()
+    shadow.shutdown()
+
+    assert submitted == [True, True, False, False, False]
+    assert shadow.skipped == 3
+
+
+def test_failed_encoding_releases_slot():
+    shadow = ShadowEvaluator(_FixedModel([0.3, 0.7]), "a", "b",
+                             shadow_fraction=1.0, max_in_flight=1)
+
+    def broken():
+        raise ValueError("encoding failed")
+
+    assert not shadow.maybe_submit(broken, np.array([0.5, 0.5]))
+    assert shadow.maybe_submit(X, np.array([0.5, 0.5]))
+    shadow.shutdown()
+
+    assert shadow.requests == 1 and shadow.skipped == 0
+
+
+# --------------------------------------------------
+# Test 3: Canary weight routes the expected share
+# --------------------------------------------------
+def test_canary_routing():
+    shadow = ShadowEvaluator(None, "a", "b", canary_weight=0.2,
+                             rng=random.Random(0))
+
+    routed = sum(shadow.route_to_candidate() for _ in range(5000))
+
+    assert 900 < routed < 1100
+    assert not ShadowEvaluator(None, "a", "b").route_to_candidate()
+
+
+# --------------------------------------------------
+# Test 4: API serves canary responses and shadows the rest
+# --------------------------------------------------
+def test_api_shadow_and_canary(monkeypatch):
+    import src.serving.app as serving
+
+    client = TestClient(serving.app)
+
+    canary = ShadowEvaluator(serving.rf_model, "logistic-regression",
+                             "random-forest", canary_weight=1.0)
+    monkeypatch.setattr(serving, "shadow", canary)
+    body = client.post("/predict/logistic", json=SAMPLE).json()
+    assert body["model"] == "Random Forest"
+
+    shadow = ShadowEvaluator(serving.rf_model, "logistic-regression",
+                             "random-forest", shadow_fraction=1.0,
+                             decide=serving.classify)
+    monkeypatch.setattr(serving, "shadow", shadow)
+    body = client.post("/predict/logistic", json=SAMPLE).json()
+    shadow.shutdown()
+
+    assert body["model"] == "Logistic Regression"
+    assert shadow.requests == 1
+    probs = serving.rf_model.predict_proba(serving.prepare_input(
+        serving.HeartDiseaseInput(**SAMPLE)
+    ))
+    candidate = int(serving.classify("random-forest", probs)[0][0])
+    assert shadow.agreements == int(candidate == body["prediction"])
+
+    # The app lifespan shuts the shadow pool down on exit
+    with TestClient(serving.app):
+        shadow.maybe_submit(X, np.array([0.5, 0.5]))
+    assert shadow._executor is None
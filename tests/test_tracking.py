@@ -0,0 +1,121 @@
+"""
+Unit tests for batched, asynchronous MLflow logging
+Covers:
+- Params, tags, metrics and per-fold CV arrays reach the run
+- Models are logged in the background as LoggedModels and loadable
+- Logging calls do not wait for the tracking store
+- Failed training marks the run FAILED
+"""
+
+import time
+
+import mlflow
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from src.models.tracking import TrackedRun
+
+
+@pytest.fixture(autouse=True)
+def tracking_store(tmp_path, monkeypatch):
+    # Same local file store layout as experiment_tracking.py (mlruns/)
+    monkeypatch.setenv("MLFLOW_ALLOW_FILE_STORE", "true")
+    mlflow.set_tracking_uri(f"file://{tmp_path / 'mlruns'}")
+    mlflow.set_experiment("tracking-test")
+    yield
+    mlflow.set_tracking_uri(None)
+
+
+def _cv_scores():
+    return {
+        "fit_time": np.array([0.1] * 5),
+        "test_roc_auc": np.array([0.8, 0.85, 0.9, 0.88, 0.87]),
+        "test_accuracy": np.array([0.7, 0.75, 0.8, 0.78, 0.77]),
+    }
+
+
+# --------------------------------------------------
+# Test 1: Everything accumulated is flushed to the run
+# --------------------------------------------------
+def test_params_metrics_and_folds():
+    with TrackedRun("unit", flush_interval=0.05) as run:
+        run.log_params({"model": "LR", "C": 1.0})
+        run.log_param("cv_folds", 5)
+        run.set_tag("stage", "test")
+        run.log_metric("loss", 0.3, step=2)
+        run.log_cv_scores(_cv_scores())
+
+    client = mlflow.MlflowClient()
+    data = client.get_run(run.run_id).data
+
+    assert data.params == {"model": "LR", "C": "1.0", "cv_folds": "5"}
+    assert data.tags["stage"] == "test"
+    assert data.metrics["roc_auc"] == pytest.approx(0.86)
+    assert "fit_time" not in data.metrics
+
+    folds = client.get_metric_history(run.run_id, "roc_auc_fold")
+    assert [m.step for m in sorted(folds, key=lambda m: m.step)] == \
+        [0, 1, 2, 3, 4]
+    assert client.get_run(run.run_id).info.status == "FINISHED"
+    assert run.timings["batches"] >= 1
+
+
+# --------------------------------------------------
+# Test 2: Models are saved in the background and loadable
+# --------------------------------------------------
+def test_model_artifact():
+    X = np.random.default_rng(0).normal(size=(50, 3))
+    y = (X[:, 0] > 0).astype(int)
+    model = LogisticRegression().fit(X, y)
+
+    with TrackedRun("unit") as run:
+        run.log_model(model, "lr_model")
+
+    loaded = mlflow.sklearn.load_model(f"runs:/{run.run_id}/lr_model")
+    assert np.array_equal(loaded.predict(X), model.predict(X))
+
+    # Logged as an MLflow LoggedModel linked to the run
+    client = mlflow.MlflowClient()
+    outputs = client.get_run(run.run_id).outputs.model_outputs
+    assert len(outputs) == 1
+    logged = client.get_logged_model(outputs[0].model_id)
+    assert logged.name == "lr_model"
+    assert logged.source_run_id == run.run_id
+    assert run.timings["artifact_seconds"] > 0
+
+
+# --------------------------------------------------
+# Test 3: Logging never waits for the store
+# --------------------------------------------------
+def test_logging_does_not_block(monkeypatch):
+    with TrackedRun("unit", flush_interval=0.01) as run:
+        real_log_batch = run.client.log_batch
+
+        def slow_log_batch(*args, **kwargs):
+            time.sleep(0.2)
+            return real_log_batch(*args, **kwargs)
+
+        monkeypatch.setattr(run.client, "log_batch", slow_log_batch)
+
+        start = time.perf_counter()
+        for step in range(200):
+            run.log_metric("loss", 1.0 / (step + 1), step=step)
+        assert time.perf_counter() - start < 0.1
+
+    history = mlflow.MlflowClient().get_metric_history(run.run_id, "loss")
+    assert len(history) == 200
+
+
+# --------------------------------------------------
+# Test 4: Exceptions end the run as FAILED
+# --------------------------------------------------
+def test_failed_run():
+    with pytest.raises(RuntimeError):
+        with TrackedRun("unit") as run:
+            run.log_metric("loss", 1.0)
+            raise RuntimeError("training failed")
+
+    info = mlflow.MlflowClient().get_run(run.run_id)
+    assert info.info.status == "FAILED"
+    assert info.data.metrics["loss"] == 1.0